@@ -4,6 +4,8 @@ from datetime import datetime
 from dotenv import load_dotenv
 import os
 from utils.config_helper import config
+from utils.publish import publish_text, README_VOLATILE
+from utils import models
 
 
 SHOW_RECENT_COMMITS = config.getboolean("Readme", "show_recent_commits")
@@ -11,6 +13,7 @@ GENERATE_MERGED_PRS = config.getboolean("Readme", "generate_merged_prs")
 SHOW_TOTAL_LINES_OF_CODE = config.getboolean(
     "Readme", "show_total_lines_of_code")
 SHOW_TOTAL_LIBS = config.getboolean("Readme", "show_total_libs_used")
+VISUALS = config.get("Readme", "visuals", fallback="gif").strip().lower()
 
 
 # Function to load environment variables and configuration
@@ -29,8 +32,7 @@ def load_environment():
 
 
 def load_repo_data():
-    with open("repo_data.json", "r") as json_file:
-        return json.load(json_file)
+    return models.load_repo_data()
 
 
 def calculate_library_metrics(repo_data, excluded_libraries):
@@ -89,6 +91,17 @@ def format_pr_info(prs):
     return "\n".join(formatted_info)
 
 
+def format_visuals():
+    if VISUALS == "svg":
+        frame_order = json.loads(config.get("GifOrder", "frame_order"))
+        svgs = [f"DataVisuals/{os.path.splitext(frame)[0]}.svg" for frame in frame_order]
+        svgs = [path for path in svgs if os.path.exists(path)]
+        if svgs:
+            return "".join(f"![]({path})\n\n" for path in svgs)
+        print("No SVG charts found; embedding the GIF instead.")
+    return "![](DataVisuals/data.gif)\n\n"
+
+
 def update_readme():
     excluded_libraries = load_environment()
     repo_data = load_repo_data()
@@ -106,9 +119,9 @@ def update_readme():
 
     if GENERATE_MERGED_PRS:
         # Sort PRs by stars for popular section
-        sorted_by_stars = sorted(repo_data['merged_prs'], key=lambda x: x["stars"], reverse=True)
+        sorted_by_stars = sorted(repo_data['merged_prs'] or [], key=lambda x: x["stars"], reverse=True)
         # Sort PRs by date for recent section
-        sorted_by_date = sorted(repo_data['merged_prs'], key=lambda x: x["closed_at"], reverse=True)
+        sorted_by_date = sorted(repo_data['merged_prs'] or [], key=lambda x: x["closed_at"], reverse=True)
         
         popular_prs_section = f"## 🔀 Popular Pull Requests\n\n{format_pr_info(sorted_by_stars[:1])}\n\n"
         recent_prs_section = f"## 🔀 Recent Pull Requests\n\n{format_pr_info(sorted_by_date[:3])}\n"
@@ -137,7 +150,7 @@ def update_readme():
         f"{total_lines_of_code}",
         f"{total_libraries_used}",
         f"{total_python_files_section}",
-        f"![](DataVisuals/data.gif)\n\n",
+        format_visuals(),
     ]
 
     with open(readme_file, "r", encoding="utf-8") as f:
@@ -153,8 +166,9 @@ def update_readme():
     updated_lines = lines[: split_index + 1]  # Include the '---' line
     updated_lines += new_metrics_section
 
-    with open(readme_file, "w", encoding="utf-8") as f:
-        f.writelines(updated_lines)
+    # Only the timestamp changed? Keep the README as it is so there's nothing to commit
+    if not publish_text(readme_file, "".join(updated_lines), volatile=README_VOLATILE):
+        print("README unchanged apart from the timestamp; left as is.")
 
 
 # Main execution
@@ -0,0 +1,101 @@
+import json
+import os
+import sqlite3
+import time
+import zlib
+from analyzers import analyzer_version
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    sha TEXT NOT NULL,
+    analyzer TEXT NOT NULL,
+    version TEXT NOT NULL,
+    result TEXT NOT NULL,
+    used_at INTEGER NOT NULL,
+    PRIMARY KEY (sha, analyzer, version)
+);
+CREATE TABLE IF NOT EXISTS content (
+    sha TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    used_at INTEGER NOT NULL
+);
+"""
+
+# Stand-in analyzer name for blobs that were skipped (binary); kept so they aren't fetched again
+SKIP = "__skip__"
+
+
+class AnalysisMemo:
+    """On-disk analyzer results keyed by (blob sha, analyzer name, analyzer version).
+
+    Blob shas are content hashes, so a stored result stays valid for as long as
+    the analyzer's version (analyzers.analyzer_version, which follows its source)
+    does. Raw blob contents (zlib-compressed) are kept next to the results, so
+    changing an analyzer recomputes from disk instead of downloading again. Rows not used for max_age_days are pruned.
+    """
+
+    def __init__(self, path, store_content=True, max_age_days=30):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.store_content = store_content
+        self.max_age = max_age_days * 86400
+        self.now = int(time.time())
+        # Shards and batch accounts may share the file; WAL lets readers and one writer overlap
+        self.db = sqlite3.connect(path, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    def get(self, sha, classes):
+        """{analyzer name: result} for every class already stored for sha, or the skip reason."""
+        rows = self.db.execute("SELECT analyzer, version, result FROM results WHERE sha = ?", (sha,)).fetchall()
+        # str(): files created when version was an INTEGER column hold numbers
+        stored = {(name, str(version)): result for name, version, result in rows}
+        if (SKIP, "0") in stored:
+            return None, json.loads(stored[(SKIP, "0")])["reason"]
+        versions = {cls: analyzer_version(cls) for cls in classes}
+        found = {cls.name: json.loads(stored[(cls.name, versions[cls])])
+                 for cls in classes if (cls.name, versions[cls]) in stored}
+        if found:
+            self.db.execute("UPDATE results SET used_at = ? WHERE sha = ?", (self.now, sha))
+        return found, None
+
+    def has(self, sha, classes):
+        """True when sha can be analyzed by classes without downloading it."""
+        found, skip_reason = self.get(sha, classes)
+        return skip_reason is not None or len(found) == len(classes) or self.content(sha) is not None
+
+    def put(self, sha, classes, results):
+        self.db.executemany(
+            "INSERT OR REPLACE INTO results (sha, analyzer, version, result, used_at) VALUES (?, ?, ?, ?, ?)",
+            [(sha, cls.name, analyzer_version(cls), json.dumps(results[cls.name]), self.now) for cls in classes],
+        )
+
+    def put_skip(self, sha, reason):
+        self.db.execute("INSERT OR REPLACE INTO results (sha, analyzer, version, result, used_at) VALUES (?, ?, 0, ?, ?)",
+                        (sha, SKIP, json.dumps({"reason": reason}), self.now))
+
+    def content(self, sha):
+        row = self.db.execute("SELECT data FROM content WHERE sha = ?", (sha,)).fetchone()
+        if row is None:
+            return None
+        self.db.execute("UPDATE content SET used_at = ? WHERE sha = ?", (self.now, sha))
+        return zlib.decompress(row[0])
+
+    def put_content(self, sha, data):
+        if self.store_content:
+            self.db.execute("INSERT OR REPLACE INTO content (sha, data, used_at) VALUES (?, ?, ?)",
+                            (sha, zlib.compress(data, 6), self.now))
+
+    def commit(self):
+        self.db.commit()
+
+    def prune(self):
+        cutoff = self.now - self.max_age
+        removed = self.db.execute("DELETE FROM results WHERE used_at < ?", (cutoff,)).rowcount
+        removed += self.db.execute("DELETE FROM content WHERE used_at < ?", (cutoff,)).rowcount
+        self.db.commit()
+        return removed
+
+    def close(self):
+        self.prune()
+        self.db.close()
@@ -0,0 +1,326 @@
+import fnmatch
+import functools
+import hashlib
+import inspect
+import json
+import re
+import types
+
+# Registered analyzer classes, in registration order
+ANALYZERS = []
+
+
+def register(cls):
+    """Class decorator adding an analyzer to the registry."""
+    ANALYZERS.append(cls)
+    return cls
+
+
+class Analyzer:
+    """Per-file analyzer. A fresh instance is made for every file.
+
+    feed() receives the file's lines (without line endings) in one or more
+    batches, finish() returns a JSON-able dict. Streaming analyzers can work
+    on any number of batches with bounded memory; the others keep what they
+    are fed until finish(), so callers skip them for very large files.
+    Cached results follow the source of the class and the module-level
+    helpers it uses (see analyzer_version); bump version for changes that
+    live elsewhere, such as in a library it calls.
+    """
+
+    name = None
+    version = 1
+    patterns = ()
+    streaming = True
+
+    @classmethod
+    def matches(cls, path):
+        filename = path.rsplit("/", 1)[-1]
+        return any(fnmatch.fnmatch(filename, pattern) for pattern in cls.patterns)
+
+    def feed(self, lines):
+        raise NotImplementedError
+
+    def finish(self):
+        raise NotImplementedError
+
+
+def analyzers_for(path):
+    return [cls for cls in ANALYZERS if cls.matches(path)]
+
+
+def _code_names(code):
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _code_names(const)
+    return names
+
+
+def _implementation(obj, seen):
+    """Source of a class or function plus, recursively, the module-level names it refers to."""
+    if id(obj) in seen:
+        return ""
+    seen.add(id(obj))
+    parts = [inspect.getsource(obj)]
+    if isinstance(obj, type):
+        functions = [f for f in vars(obj).values() if isinstance(f, (types.FunctionType, classmethod, staticmethod))]
+        codes = [getattr(f, "__func__", f).__code__ for f in functions]
+        parts += [_implementation(base, seen) for base in obj.__bases__ if base is not object]
+    else:
+        codes = [obj.__code__]
+    module_globals = vars(inspect.getmodule(obj))
+    for name in sorted(set().union(*map(_code_names, codes))):
+        value = module_globals.get(name)
+        if isinstance(value, (type, types.FunctionType)) and value.__module__ == obj.__module__:
+            parts.append(_implementation(value, seen))
+        elif isinstance(value, re.Pattern):
+            parts.append(f"{name} = {value.pattern!r} {value.flags}")
+        elif isinstance(value, (list, tuple)) and any(isinstance(v, re.Pattern) for v in value):
+            parts.append(f"{name} = {[(v.pattern, v.flags) for v in value]!r}")
+        elif isinstance(value, (str, int, float, tuple, frozenset)):
+            parts.append(f"{name} = {value!r}")
+    return "\n".join(parts)
+
+
+@functools.cache
+def analyzer_version(cls):
+    """cls.version plus a hash of its implementation, so stored results go stale when the code changes."""
+    try:
+        source = _implementation(cls, set())
+    except (OSError, TypeError):  # no source available (frozen build); only the manual version counts
+        return str(cls.version)
+    return f"{cls.version}.{hashlib.sha256(source.encode('utf-8')).hexdigest()[:12]}"
+
+
+def analyzer_key(classes):
+    """Identifies a set of analyzers and their versions, for caching results."""
+    return ",".join(f"{cls.name}@{analyzer_version(cls)}" for cls in classes)
+
+
+def run_analyzers(classes, line_batches):
+    """Hand every batch of lines to every analyzer once; return {analyzer name: result}."""
+    instances = [cls() for cls in classes]
+    for lines in line_batches:
+        for analyzer in instances:
+            analyzer.feed(lines)
+    return {analyzer.name: analyzer.finish() for analyzer in instances}
+
+
+def merge_results(total, result):
+    """Fold one result into a running total: numbers add, lists union, dicts merge recursively."""
+    for key, value in result.items():
+        if isinstance(value, bool) or value is None:
+            total[key] = value
+        elif isinstance(value, (int, float)):
+            total[key] = total.get(key, 0) + value
+        elif isinstance(value, list):
+            total[key] = sorted(set(total.get(key, [])) | set(value))
+        elif isinstance(value, dict):
+            merge_results(total.setdefault(key, {}), value)
+        else:
+            total[key] = value
+    return total
+
+
+# ===== Python =====
+
+IMPORT_PATTERNS = [re.compile(r"^import\s+(\w+)"), re.compile(r"^from\s+(\w+)\s+import")]
+IF_PATTERN = re.compile(r"\bif\b")
+WHILE_PATTERN = re.compile(r"\bwhile\b")
+FOR_PATTERN = re.compile(r"\bfor\b")
+ASYNC_FUNCTION_PATTERN = re.compile(r"(?<!\w)async\s+def\s+\w+\b")
+FUNCTION_PATTERN = re.compile(r"(?<!\w)def\s+\w+\b")
+CLASS_PATTERN = re.compile(r"(?<!\w)class\b")
+
+
+@register
+class LineCounter(Analyzer):
+    name = "lines"
+    patterns = ("*.py",)
+
+    def __init__(self):
+        self.lines = 0
+
+    def feed(self, lines):
+        self.lines += len(lines)
+
+    def finish(self):
+        return {"lines": self.lines}
+
+
+@register
+class ImportCollector(Analyzer):
+    """Top-level module names from the file's import block (stops after 10 lines without an import)."""
+
+    name = "imports"
+    patterns = ("*.py",)
+
+    def __init__(self):
+        self.libraries = set()
+        self.importless_streak = 0
+        self.done = False
+
+    def feed(self, lines):
+        for line in lines:
+            if self.done:
+                return
+            for pattern in IMPORT_PATTERNS:
+                m = pattern.match(line)
+                if m:
+                    self.libraries.add(m.group(1))
+                    self.importless_streak = 0
+                    break
+            else:
+                self.importless_streak += 1
+                if self.importless_streak > 10:
+                    self.done = True
+
+    def finish(self):
+        return {"libraries": sorted(self.libraries)}
+
+
+@register
+class ConstructCounter(Analyzer):
+    name = "constructs"
+    patterns = ("*.py",)
+
+    def __init__(self):
+        self.counts = {
+            "if statements": 0,
+            "while loops": 0,
+            "for loops": 0,
+            "regular functions created": 0,
+            "async functions created": 0,
+            "classes created": 0,
+        }
+
+    def feed(self, lines):
+        counts = self.counts
+        for line in lines:
+            counts["if statements"] += len(IF_PATTERN.findall(line))
+            counts["while loops"] += len(WHILE_PATTERN.findall(line))
+            counts["for loops"] += len(FOR_PATTERN.findall(line))
+            async_functions = len(ASYNC_FUNCTION_PATTERN.findall(line))
+            all_functions = len(FUNCTION_PATTERN.findall(line))
+            counts["async functions created"] += async_functions
+            counts["regular functions created"] += max(0, all_functions - async_functions)
+            counts["classes created"] += len(CLASS_PATTERN.findall(line))
+
+    def finish(self):
+        return {"construct_counts": self.counts}
+
+
+DEFINITION_PATTERN = re.compile(r"^\s*(async\s+def|def|class)\s+\w+")
+DOCSTRING_START = re.compile(r"^\s*[rRuU]?[\"']")
+
+
+@register
+class DocstringCoverage(Analyzer):
+    """How many functions and classes open with a docstring."""
+
+    name = "docstrings"
+    patterns = ("*.py",)
+
+    def __init__(self):
+        self.definitions = 0
+        self.documented = 0
+        self.in_signature = False  # inside a def/class header that hasn't reached its ':' yet
+        self.awaiting_body = False  # header done, looking at the first statement of the body
+
+    def feed(self, lines):
+        for line in lines:
+            stripped = line.strip()
+            if self.awaiting_body:
+                if not stripped or stripped.startswith("#"):
+                    continue
+                self.awaiting_body = False
+                if DOCSTRING_START.match(line):
+                    self.documented += 1
+            if DEFINITION_PATTERN.match(line):
+                self.definitions += 1
+                self.in_signature = True
+            if self.in_signature and stripped.split("#", 1)[0].rstrip().endswith(":"):
+                self.in_signature = False
+                self.awaiting_body = True
+
+    def finish(self):
+        return {"definitions": self.definitions, "documented": self.documented}
+
+
+FUNCTION_START = re.compile(r"^\s*(async\s+)?def\s+\w+\s*\(")
+PARAM_ANNOTATION = re.compile(r"\w\s*:\s*[\w\"'\[]")
+TYPING_IMPORT = re.compile(r"^\s*(from\s+typing(_extensions)?\s+import|import\s+typing(_extensions)?\b)")
+
+
+@register
+class TypingUsage(Analyzer):
+    """Functions with parameter or return annotations, and whether typing is imported."""
+
+    name = "typing"
+    patterns = ("*.py",)
+
+    def __init__(self):
+        self.functions = 0
+        self.annotated_functions = 0
+        self.typing_imports = 0
+        self.signature = None  # accumulated text of a def header spanning several lines
+
+    def feed(self, lines):
+        for line in lines:
+            if TYPING_IMPORT.match(line):
+                self.typing_imports += 1
+            if self.signature is None and FUNCTION_START.match(line):
+                self.functions += 1
+                self.signature = ""
+            if self.signature is not None:
+                self.signature += line.split("#", 1)[0]
+                if self.signature.rstrip().endswith(":"):
+                    params = self.signature[self.signature.find("(") + 1:]
+                    if "->" in self.signature or PARAM_ANNOTATION.search(params.rstrip(":")):
+                        self.annotated_functions += 1
+                    self.signature = None
+
+    def finish(self):
+        return {"functions": self.functions, "annotated_functions": self.annotated_functions,
+                "files_importing_typing": 1 if self.typing_imports else 0}
+
+
+# ===== Notebooks =====
+
+@register
+class NotebookCells(Analyzer):
+    """Code cells of a Jupyter notebook: cell and line counts plus their imports."""
+
+    name = "notebook"
+    patterns = ("*.ipynb",)
+    streaming = False  # the notebook is one JSON document
+
+    def __init__(self):
+        self.lines = []
+
+    def feed(self, lines):
+        self.lines.extend(lines)
+
+    def finish(self):
+        try:
+            notebook = json.loads("\n".join(self.lines))
+        except json.JSONDecodeError:
+            return {"invalid_notebooks": 1}
+        code_cells = 0
+        code = []
+        for cell in notebook.get("cells", []):
+            if cell.get("cell_type") != "code":
+                continue
+            code_cells += 1
+            source = cell.get("source", [])
+            code.extend(("".join(source) if isinstance(source, list) else source).splitlines())
+        imports = ImportCollector()
+        imports.feed([line for line in code if line.startswith(("import ", "from "))])
+        return {"code_cells": code_cells, "code_lines": len(code), "libraries": imports.finish()["libraries"]}
+
+
+def count_python_constructs(content: str):
+    """(libraries, construct counts) for Python source, as the scraper has always reported them."""
+    results = run_analyzers([ImportCollector, ConstructCounter], [content.splitlines()])
+    return set(results["imports"]["libraries"]), results["constructs"]["construct_counts"]
@@ -0,0 +1,131 @@
+"""Generate profiles for several users and organizations in one run.
+
+    python Generator/utils/batch.py                          # accounts from [Batch] accounts
+    python Generator/utils/batch.py --accounts alice,bob,my-org --output-dir profiles
+
+Every account is scraped through one GitHub client, so the rate limit is
+shared, and blobs already analyzed for one account (the analysis memo is
+keyed by blob sha) are not downloaded again for the next. Repositories
+themselves don't overlap: an account only counts repositories it owns, and
+skips forks of other owners' work. Each account gets its own folder with config.ini,
+repo_data.json and DataVisuals/; its charts and GIF are rendered in
+separate processes while the next account is being scraped.
+"""
+import argparse
+import configparser
+import glob
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from github import Github
+from github.GithubException import GithubException
+
+sys.path.append(os.path.dirname(__file__))
+from config_helper import config
+import data_scrape
+import metrics
+import publish
+
+UTILS = os.path.dirname(os.path.abspath(__file__))
+GENERATOR = os.path.dirname(UTILS)
+GRAPH_SCRIPTS = sorted(glob.glob(os.path.join(UTILS, "graphing", "*.py")))
+
+ACCOUNTS = json.loads(config.get("Batch", "accounts", fallback="[]"))
+OUTPUT_DIR = config.get("Batch", "output_dir", fallback="profiles")
+RENDER_WORKERS = config.getint("Batch", "render_workers", fallback=2)
+
+
+def resolve_account(github_client, name):
+    """NamedUser for people, Organization for orgs (so org repos of every type are listed)."""
+    account = data_scrape.safe_github_call(github_client.get_user, name)
+    if account.type == "Organization":
+        account = data_scrape.safe_github_call(github_client.get_organization, name)
+    return account
+
+
+def write_account_config(account_dir, login):
+    """Copy of the batch config pointed at one account; the per-account scripts read it via CONFIG_PATH."""
+    account_config = configparser.ConfigParser()
+    account_config.read_dict(config)
+    account_config.set("Settings", "github_user_name", login)
+    path = os.path.join(account_dir, "config.ini")
+    with open(path, "w", encoding="utf-8") as f:
+        account_config.write(f)
+    return path
+
+
+def render_account(login, account_dir, config_path, is_org):
+    """Merged PRs, charts, GIF and (if present) README for one account, each in its own process."""
+    env = dict(os.environ, CONFIG_PATH=os.path.abspath(config_path))
+    steps = []
+    if not is_org:  # organizations don't author pull requests
+        steps.append(os.path.join(UTILS, "mergedprs.py"))
+    steps += GRAPH_SCRIPTS
+    steps.append(os.path.join(UTILS, "gifmaker.py"))
+    if os.path.exists(os.path.join(account_dir, "README.md")):
+        steps.append(os.path.join(GENERATOR, "readme.py"))
+
+    failed = []
+    for script in steps:
+        result = subprocess.run([sys.executable, script], cwd=account_dir, env=env,
+                                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        if result.returncode != 0:
+            failed.append(os.path.basename(script))
+            print(f"❌ {login}: {os.path.basename(script)} failed\n{result.stdout}")
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--accounts", help="comma-separated users/organizations (overrides [Batch] accounts)")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR, help="folder that receives one subfolder per account")
+    parser.add_argument("--skip-render", action="store_true", help="only scrape; don't render charts")
+    args = parser.parse_args()
+
+    accounts = [a.strip() for a in args.accounts.split(",")] if args.accounts else ACCOUNTS
+    accounts = list(dict.fromkeys(a for a in accounts if a))
+    if not accounts:
+        raise SystemExit("No accounts given; set [Batch] accounts or pass --accounts")
+    if not data_scrape.ACCESS_TOKEN:
+        raise RuntimeError("TOKEN env var is empty. Authenticated requests are required to avoid 60/hr limit.")
+
+    metrics.begin("batch")
+    data_scrape.g = Github(data_scrape.ACCESS_TOKEN, base_url=data_scrape.API_URL, per_page=100)
+    data_scrape.wait_for_rate_limit(data_scrape.g)
+
+    renders = {}
+    with ThreadPoolExecutor(max_workers=max(1, RENDER_WORKERS)) as pool:
+        for name in accounts:
+            print(f"\n👥 {name}")
+            try:
+                account = resolve_account(data_scrape.g, name)
+            except GithubException as e:
+                print(f"❌ Could not load account {name}: {e}")
+                continue
+
+            account_dir = os.path.join(args.output_dir, account.login)
+            os.makedirs(os.path.join(account_dir, "DataVisuals"), exist_ok=True)
+            config_path = write_account_config(account_dir, account.login)
+
+            # The account's renders run inside account_dir; the scrape's repo_data.json and
+            # history.json changes belong in the same publish report
+            with metrics.stage("account", account=account.login), publish.reporting_to(account_dir):
+                data_scrape.scrape_account(account, os.path.join(account_dir, data_scrape.OUTPUT_PATH))
+
+            if not args.skip_render:
+                is_org = getattr(account, "type", "User") == "Organization"
+                renders[account.login] = pool.submit(render_account, account.login, account_dir, config_path, is_org)
+
+        failures = {login: future.result() for login, future in renders.items()}
+
+    print(f"\n📦 Batch done: {len(accounts)} accounts")
+    for login, failed in failures.items():
+        status = "✅" if not failed else f"⚠️ failed: {', '.join(failed)}"
+        print(f"   {login:<30} {status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import json
+import math
+import os
+import time
+from config_helper import config
+
+PER_PAGE = 100
+# PyGithub waits 0.25s between requests by default, plus network latency
+DEFAULT_SECONDS_PER_CALL = config.getfloat("Budget", "seconds_per_call", fallback=0.35)
+METRICS_PATH = config.get("Metrics", "metrics_file", fallback="run_metrics.json")
+
+
+def observed_seconds_per_call(metrics_path=METRICS_PATH):
+    """Seconds per API call measured by the last scrape, if its metrics file is around."""
+    if not os.path.exists(metrics_path):
+        return None
+    try:
+        with open(metrics_path, "r", encoding="utf-8") as f:
+            scrape = json.load(f)["scripts"]["data_scrape"]
+    except (json.JSONDecodeError, KeyError, OSError):
+        return None
+    if not scrape.get("api_calls"):
+        return None
+    return scrape["seconds"] / scrape["api_calls"]
+
+
+def estimate_repo(total_commits, recent_commits, blob_sizes, punch_card=False, tree_calls=1):
+    """API calls and bytes one repo will cost: commit pages, recent commit details, the tree, one call per blob.
+
+    blob_sizes are the sizes of the blobs that will be downloaded; they arrive raw, so bytes are their sum.
+    With punch_card (commit_activity = stats) only recent commits are paged, plus the punch card itself.
+    tree_calls is more than one for repositories whose truncated tree had to be walked.
+    """
+    if punch_card:
+        commit_pages = max(1, math.ceil(recent_commits / PER_PAGE)) + 1
+    else:
+        commit_pages = max(1, math.ceil(total_commits / PER_PAGE))
+    calls = commit_pages + recent_commits + tree_calls + len(blob_sizes)
+    return {
+        "calls": calls,
+        "commit_pages": commit_pages,
+        "commit_details": recent_commits,
+        "blobs": len(blob_sizes),
+        "bytes": sum(size or 0 for size in blob_sizes),
+    }
+
+
+class BudgetReport:
+    """Accumulates per-repo estimates and compares the total with the rate-limit budget."""
+
+    def __init__(self, seconds_per_call=None):
+        self.seconds_per_call = seconds_per_call or observed_seconds_per_call() or DEFAULT_SECONDS_PER_CALL
+        self.repos = {}
+        self.skipped = {}
+        self.overhead_calls = 0
+
+    def add(self, name, estimate):
+        self.repos[name] = estimate
+
+    def skip(self, name, reason):
+        self.skipped[name] = reason
+
+    def totals(self):
+        calls = self.overhead_calls + sum(e["calls"] for e in self.repos.values())
+        return {
+            "repos": len(self.repos),
+            "skipped": len(self.skipped),
+            "calls": calls,
+            "bytes": sum(e["bytes"] for e in self.repos.values()),
+            "minutes": round(calls * self.seconds_per_call / 60, 1),
+        }
+
+    def compare(self, remaining, limit, reset_epoch):
+        """How the estimate fits into the current hourly window."""
+        totals = self.totals()
+        shortfall = max(0, totals["calls"] - remaining)
+        resets = math.ceil(shortfall / limit) if limit else 0
+        wait_minutes = 0.0
+        if resets:
+            wait_minutes = max(0.0, (reset_epoch - time.time()) / 60) + (resets - 1) * 60
+        return {
+            "remaining": remaining,
+            "limit": limit,
+            "fits": shortfall == 0,
+            "shortfall": shortfall,
+            "rate_limit_resets_needed": resets,
+            "estimated_wait_minutes": round(wait_minutes, 1),
+        }
+
+    def print(self, remaining, limit, reset_epoch, dry_run_calls=None):
+        totals = self.totals()
+        fit = self.compare(remaining, limit, reset_epoch)
+        print("\n🧮 DRY RUN ESTIMATE:")
+        for name, e in sorted(self.repos.items(), key=lambda item: -item[1]["calls"]):
+            print(f"   {name:<40} {e['calls']:>6} calls  {e['bytes'] / 1e6:>7.2f} MB"
+                  f"  ({e['commit_pages']} commit pages, {e['commit_details']} commit details, {e['blobs']} blobs)")
+        print(f"   Repositories to scrape: {totals['repos']} (skipping {totals['skipped']})")
+        print(f"   API calls: ~{totals['calls']}   Download: ~{totals['bytes'] / 1e6:.1f} MB   "
+              f"Time: ~{totals['minutes']} min at {self.seconds_per_call:.2f}s/call")
+        print(f"   Rate limit: {remaining}/{limit} remaining, resets at {time.strftime('%H:%M:%S', time.localtime(reset_epoch))}")
+        if fit["fits"]:
+            print("   ✅ Fits in the remaining budget")
+        else:
+            print(f"   ⚠️ Short by {fit['shortfall']} calls: needs {fit['rate_limit_resets_needed']} reset(s), "
+                  f"~{fit['estimated_wait_minutes']} min of waiting")
+        if dry_run_calls is not None:
+            print(f"   (this dry run used {dry_run_calls} API calls)")
+        return {"totals": totals, "budget": fit, "repos": self.repos, "skipped": self.skipped}
@@ -0,0 +1,103 @@
+"""Progress inside repositories, saved while they are scraped so a restarted run resumes mid-repo.
+
+repo_data.json only changes once a repository is complete. While one is being
+scraped, its position (the next commit page, or the next file to analyze)
+and everything collected so far are kept in <output>.checkpoint.json, written
+at most every [Resume] checkpoint_seconds. A restarted run picks each
+unfinished repository up from there, unless something was pushed to it in
+the meantime, in which case that repository starts over. Repositories the
+interrupted run already finished are listed too, with their pushed_at, so
+the restarted run skips them instead of scraping them again; the list is
+cleared once a run gets to the end.
+"""
+import json
+import os
+import time
+from config_helper import config
+
+ENABLED = config.getboolean("Resume", "enabled", fallback=True)
+CHECKPOINT_SECONDS = config.getfloat("Resume", "checkpoint_seconds", fallback=30)
+
+
+def checkpoint_path(output_path):
+    return os.path.splitext(output_path)[0] + ".checkpoint.json"
+
+
+class Checkpoint:
+    """Unfinished repositories by name: {"pushed_at", "stage", ...what that stage needs to continue}.
+
+    The commits stage is resumed at (page, position in page), the files stage
+    at the index of the next file in the repository's listing.
+    """
+
+    def __init__(self, path, interval=CHECKPOINT_SECONDS):
+        self.path = path
+        self.interval = interval
+        self.saved_at = time.time()
+        self.repos = {}
+        self.completed = {}  # name -> pushed_at of repositories this (unfinished) run already saved
+        if ENABLED and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    saved = json.load(f)
+                self.repos = saved["repos"]
+                self.completed = saved.get("completed", {})
+            except (json.JSONDecodeError, KeyError, OSError):
+                print(f"⚠️ Ignoring unreadable checkpoint {path}")
+
+    def in_progress(self):
+        return set(self.repos)
+
+    def completed_unchanged(self, name, pushed_at):
+        """True when the interrupted run already saved name and nothing was pushed to it since."""
+        return name in self.completed and self.completed[name] == pushed_at
+
+    def resume(self, name, pushed_at):
+        """Saved progress for name, or None when there is none or the repository was pushed to since."""
+        entry = self.repos.get(name)
+        if entry is None:
+            return None
+        if entry["pushed_at"] != pushed_at:
+            print(f"🔁 {name} changed since it was checkpointed, starting it over")
+            del self.repos[name]
+            return None
+        if entry["stage"] == "commits":
+            where = f"commit {entry['position'] + 1} of page {entry['page'] + 1}"
+        else:
+            where = f"file {entry['files_done'] + 1} of {entry['files_total']}"
+        print(f"⏯️  Resuming {name} at {where}")
+        return entry
+
+    def due(self):
+        return ENABLED and time.time() - self.saved_at >= self.interval
+
+    def save(self, name, entry):
+        self.repos[name] = entry
+        self._write()
+
+    def finish(self, name, pushed_at=None, completed=False):
+        """Forget name's progress; with completed, remember that its results are in repo_data.json."""
+        had_progress = self.repos.pop(name, None) is not None
+        if completed:
+            self.completed[name] = pushed_at
+        if had_progress or completed:
+            self._write()
+
+    def close(self):
+        """The run got to the end: the next one starts from scratch."""
+        self.repos.clear()
+        self.completed.clear()
+        self._write()
+
+    def _write(self):
+        self.saved_at = time.time()
+        if not ENABLED:
+            return
+        if not self.repos and not self.completed:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            return
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "repos": self.repos, "completed": self.completed}, f)
+        os.replace(tmp, self.path)
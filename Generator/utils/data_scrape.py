@@ -1,18 +1,35 @@
 from github import Github
 from github.GithubException import GithubException
 from dotenv import load_dotenv
-import os, json, re
+import os, json
+import argparse
+import itertools
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import configparser
 from datetime import datetime, timedelta, timezone
 from pytz import timezone as tz
 import time
-import base64, binascii
+import atexit
+import zlib
+import codecs
+import requests
 import sys
 import os
 sys.path.append(os.path.dirname(__file__))
 from config_helper import config
+from word_index import WordIndexUpdate, expire_window
+import metrics
+from metrics import verbose
+from budget import BudgetReport, estimate_repo, PER_PAGE
+from analyzers import analyzers_for, analyzer_key, run_analyzers, merge_results, count_python_constructs
+from analysis_memo import AnalysisMemo
+from path_filter import PathMatcher, gitattributes_patterns
+import history
+import models
+from scheduler import Scheduler, pushed_order, scrape_cost
+from checkpoint import Checkpoint, checkpoint_path
 
 
 
@@ -23,27 +40,45 @@ load_dotenv()
 DEBUG = config.getboolean("Debug", "debug", fallback=False)
 STEP_COUNT = config.getint("Debug", "step_count", fallback=10)
 ACCESS_TOKEN = os.getenv("TOKEN")
+API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")  # point at a local stand-in for offline tests
 USER = config.get("Settings", "github_user_name")
 TIMEZONE = config.get("Settings", "target_tz", fallback="America/New_York")
 target_tz = tz(TIMEZONE)
+# "commits" pages every commit for the heatmap; "stats" reads GitHub's precomputed punch card instead
+COMMIT_ACTIVITY = config.get("Settings", "commit_activity", fallback="commits").strip().lower()
+STATS_POLL_ATTEMPTS = 4
 IGNORED = {
     r.strip()
     for r in config.get("Settings", "ignored_repos", fallback="").split(",")
     if r.strip()
 }
 
+CACHE_DIR = config.get("Cache", "cache_dir", fallback=".cache")
+ANALYSIS_MEMO = config.getboolean("Cache", "analysis_memo", fallback=True)
+MEMO_MAX_AGE_DAYS = config.getint("Cache", "memo_max_age_days", fallback=30)
+
 # Resume behavior
 OUTPUT_PATH = "repo_data.json"
 OVERWRITE_EXISTING = config.getboolean("Debug", "overwrite_existing", fallback=True)  # set True to reprocess repos even if they exist in the JSON
 
-# Directories to exclude from processing (common build/cache dirs)
-EXCLUDE_DIRS = {
+# gitignore-style patterns for paths that are never listed, downloaded or counted (see path_filter.py);
+# [Exclude] paths replaces this list
+DEFAULT_EXCLUDES = [
     ".venv/", "venv/", "env/", "__pycache__/", ".mypy_cache/", ".pytest_cache/",
     ".github/", ".git/", "build/", "dist/", "site-packages/", "node_modules/",
-    ".idea/", ".vscode/", ".ruff_cache/", ".tox/", ".eggs/"
-}
+    ".idea/", ".vscode/", ".ruff_cache/", ".tox/", ".eggs/",
+    "*_pb2.py", "*_pb2_grpc.py", "migrations/", "*.min.js",
+]
+EXCLUDE = PathMatcher(json.loads(config.get("Exclude", "paths", fallback=json.dumps(DEFAULT_EXCLUDES))))
+# Also skip what a repository's .gitattributes marks linguist-vendored / linguist-generated
+HONOR_GITATTRIBUTES = config.getboolean("Exclude", "gitattributes", fallback=True)
 
-print(USER)
+# Trees GitHub truncates are walked directory by directory, this many requests at a time, up to max_entries files
+TREE_WORKERS = config.getint("Trees", "workers", fallback=8)
+TREE_MAX_ENTRIES = config.getint("Trees", "max_entries", fallback=200_000)
+
+# GitHub client, created in main() (or shared by batch.py across accounts)
+g = None
 
 # ===== Helpers =====
 
@@ -58,7 +93,10 @@ def wait_for_rate_limit(github_client):
         reset_epoch = github_client.rate_limiting_resettime  # unix seconds
         sleep_sec = max(5, int(reset_epoch - time.time()) + 1)
         print(f"⏳ Waiting for GitHub rate limit reset in ~{sleep_sec}s…")
+        metrics.rate_limit_wait(sleep_sec)
         time.sleep(sleep_sec)
+        # rate_limiting only changes when PyGithub makes a request; /rate_limit itself is free
+        github_client.get_rate_limit()
 
 def preflight(github_client, floor=5):
     remaining, _limit = github_client.rate_limiting
@@ -69,11 +107,11 @@ def preflight(github_client, floor=5):
 def norm(path: str) -> str:
     return path.replace("\\", "/")
 
-def path_is_excluded(path: str) -> bool:
-    p = norm(path)
-    # Exclude if any first path segment matches an excluded dir
-    parts = p.split("/")
-    return any(part in EXCLUDE_DIRS for part in parts[:-1])  # ignore filename
+def path_is_excluded(path: str, matcher=None) -> bool:
+    return (matcher or EXCLUDE).excluded(norm(path))
+
+def dir_is_excluded(path: str, matcher=None) -> bool:
+    return (matcher or EXCLUDE).dir_excluded(norm(path))
 
 def safe_github_call(fn, *args, **kwargs):
     while True:
@@ -89,13 +127,33 @@ def safe_github_call(fn, *args, **kwargs):
 
 
 
-MAX_BYTES = 1_000_000  # skip monsters; tweak as you like
+MAX_BYTES = 1_000_000  # larger files only go to streaming analyzers
+STREAM_CHUNK = 256 * 1024
+# Everything except the control characters the binary heuristic counts
+TEXT_BYTES = bytes(c for c in range(256) if not (c < 9 or 13 < c < 32))
+LINE_BREAKS = "\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
 
-def decode_utf8_lossy(b: bytes) -> str:
-    try:
-        return b.decode("utf-8", errors="strict")
-    except UnicodeDecodeError:
-        return b.decode("utf-8", errors="replace")
+# Raw blob downloads bypass PyGithub (it only returns whole base64 blobs); one pooled session
+blob_session = requests.Session()
+
+# Analyzer results by (blob sha, analyzers) for the whole run (shared across accounts in batch mode).
+# Blob shas are content hashes, so vendored or copied files are fetched and parsed once.
+blob_index = {}
+
+# On-disk analyzer results and blob contents across runs, opened on first use
+_memo = None
+
+def get_memo():
+    global _memo
+    if _memo is None and ANALYSIS_MEMO:
+        _memo = AnalysisMemo(os.path.join(CACHE_DIR, "analysis.sqlite"), max_age_days=MEMO_MAX_AGE_DAYS)
+        atexit.register(_memo.close)
+    return _memo
+
+# Recursive trees by (full name, branch, pushed_at), so a repository listed twice is walked once
+tree_cache = {}
+# API calls each repository's listing took (more than one when a truncated tree had to be walked)
+tree_calls = {}
 
 def list_repo_py_files_via_tree(repo):
     """Return list[(path, sha, size)] for .py files, with excludes and no duplicates."""
@@ -118,141 +176,272 @@ def list_repo_py_files_via_tree(repo):
         out.append((item.path, item.sha, getattr(item, "size", None)))
     return out
 
+# Matchers extended with a repository's .gitattributes, by the attributes blob's sha
+attribute_matchers = {}
+
+def repo_matcher(repo, root_blobs):
+    """EXCLUDE plus the vendored/generated paths from the repository's root .gitattributes.
+
+    Returns (matcher, API calls made); the file is read from the analysis memo when it was seen before.
+    """
+    attributes = next((sha for path, sha, _ in root_blobs if path == ".gitattributes"), None)
+    if not HONOR_GITATTRIBUTES or attributes is None:
+        return EXCLUDE, 0
+    if attributes in attribute_matchers:
+        return attribute_matchers[attributes], 0
+    memo = get_memo()
+    data = memo.content(attributes) if memo else None
+    calls = 0
+    if data is None:
+        try:
+            with open_blob_stream(repo, attributes) as response:
+                data = response.content
+        except GithubException as e:
+            print(f"⚠️ Could not read .gitattributes of {repo.name}: {e}")
+            return EXCLUDE, 1
+        # With the memo on, a dry run leaves the file behind for the real run, so only count it without one
+        calls = 0 if memo else 1
+        if memo:
+            memo.put_content(attributes, data)
+    patterns = gitattributes_patterns(data.decode("utf-8", errors="replace"))
+    attribute_matchers[attributes] = EXCLUDE.extend(patterns) if patterns else EXCLUDE
+    if patterns:
+        verbose(f"  🏷️ {repo.name}: {len(patterns)} vendored/generated pattern(s) from .gitattributes")
+    return attribute_matchers[attributes], calls
+
+def fetch_subtree(repo, prefix, sha, recursive=True):
+    """(blobs, subdirectories left to walk, calls made) for one directory.
+
+    The whole subtree comes back in one call unless GitHub truncates it; then
+    it is listed one level deep and its subdirectories are walked in turn.
+    """
+    preflight(g)
+    tree = safe_github_call(repo.get_git_tree, sha, recursive=recursive)
+    calls = 1
+    if recursive and tree.raw_data.get("truncated"):
+        preflight(g)
+        tree = safe_github_call(repo.get_git_tree, sha)
+        calls += 1
+        recursive = False
+    blobs, subdirs = [], []
+    for item in tree.raw_data["tree"]:
+        path = prefix + item["path"]
+        if item["type"] == "blob":
+            blobs.append((path, item["sha"], item.get("size")))
+        elif item["type"] == "tree" and not recursive:
+            subdirs.append((path + "/", item["sha"]))
+    return blobs, subdirs, calls
+
+def walk_tree(repo, root_sha):
+    """All blobs under root_sha, fetched level by level and concurrently, never descending into excluded directories.
+
+    Returns (blobs, calls, capped, matcher) where capped means TREE_MAX_ENTRIES was reached.
+    """
+    blobs, level, calls = fetch_subtree(repo, "", root_sha, recursive=False)
+    # The root listing has the .gitattributes, so vendored directories it names are pruned too
+    matcher, attribute_calls = repo_matcher(repo, blobs)
+    calls += attribute_calls
+    with ThreadPoolExecutor(max_workers=max(1, TREE_WORKERS)) as pool:
+        while level and len(blobs) < TREE_MAX_ENTRIES:
+            level = [d for d in level if not dir_is_excluded(d[0], matcher)]
+            results = pool.map(lambda d: fetch_subtree(repo, d[0], d[1]), level)
+            level = []
+            for found, subdirs, n in results:
+                blobs.extend(found)
+                level.extend(subdirs)
+                calls += n
+    capped = len(blobs) >= TREE_MAX_ENTRIES
+    return blobs[:TREE_MAX_ENTRIES], calls, capped, matcher
+
 def list_repo_all_files_via_tree(repo):
     """Return list[(path, sha, size, extension)] for all files, with excludes and no duplicates."""
-    preflight(g)
     default_branch = repo.default_branch
+    key = (repo.full_name, default_branch, repo.pushed_at)
+    if key in tree_cache:
+        metrics.cache("trees", True)
+        return tree_cache[key]
+    metrics.cache("trees", False)
+    preflight(g)
     tree = safe_github_call(repo.get_git_tree, default_branch, recursive=True)
 
+    if tree.raw_data.get("truncated"):
+        # GitHub cuts recursive listings of very large repositories short; walk it instead of trusting a partial list
+        print(f"🌳 {repo.name}: tree is too large for one listing, walking it directory by directory")
+        entries, calls, capped, matcher = walk_tree(repo, tree.sha)
+        tree_calls[repo.full_name] = 1 + calls
+        if capped:
+            print(f"⚠️ {repo.name}: stopped listing at {TREE_MAX_ENTRIES} files ([Trees] max_entries)")
+    else:
+        entries = [(item.path, item.sha, getattr(item, "size", None)) for item in tree.tree if item.type == "blob"]
+        matcher, attribute_calls = repo_matcher(repo, entries)
+        tree_calls[repo.full_name] = 1 + attribute_calls
+
     out = []
     seen = set()
-    for item in tree.tree:
-        if item.type != "blob":
+    for path, sha, size in entries:
+        if path_is_excluded(path, matcher):
             continue
-        if path_is_excluded(item.path):
-            continue
-        if item.path in seen:
+        if path in seen:
             continue
         
         # Get file extension
-        split_path = item.path.rsplit('.', 1)
-        extension = '.' + split_path[-1] if len(split_path) > 1 and split_path[-1] else item.path
+        split_path = path.rsplit('.', 1)
+        extension = '.' + split_path[-1] if len(split_path) > 1 and split_path[-1] else path
         
-        seen.add(item.path)
-        out.append((item.path, item.sha, getattr(item, "size", None), extension))
+        seen.add(path)
+        out.append((path, sha, size, extension))
+    tree_cache[key] = out
     return out
 
-def fetch_blob_text(repo, sha, size_hint=None):
-    """Fetch blob by sha and return decoded text (or None if skipped)."""
+def open_blob_stream(repo, sha):
+    """GET a blob as raw bytes (no base64/JSON wrapping) with the body left unread."""
+    url = f"{API_URL}/repos/{repo.full_name}/git/blobs/{sha}"
+    headers = {"Accept": "application/vnd.github.raw", "Authorization": f"Bearer {ACCESS_TOKEN}"}
+    while True:
+        preflight(g)
+        response = blob_session.get(url, headers=headers, stream=True, timeout=60)
+        if response.status_code in (403, 429) and response.headers.get("X-RateLimit-Remaining") == "0":
+            response.close()
+            reset_epoch = int(response.headers.get("X-RateLimit-Reset", time.time() + 60))
+            sleep_sec = max(5, int(reset_epoch - time.time()) + 1)
+            print(f"⏰ Rate limit hit. Waiting ~{sleep_sec}s for reset...")
+            metrics.rate_limit_wait(sleep_sec)
+            time.sleep(sleep_sec)
+            continue
+        if response.status_code != 200:
+            message = response.text
+            response.close()
+            raise GithubException(response.status_code, {"message": message}, dict(response.headers))
+        return response
+
+def iter_line_batches(chunks):
+    """Decode byte chunks incrementally and yield lists of lines, cut exactly as str.splitlines() would."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    tail = ""
+    streamed = 0
+    for chunk in chunks:
+        streamed += len(chunk)
+        text = tail + decoder.decode(chunk)
+        lines = text.splitlines()
+        tail = ""
+        if lines and (text.endswith("\r") or text[-1] not in LINE_BREAKS):
+            # The last line may continue in the next chunk (and "\r" may be half of "\r\n")
+            tail = lines.pop() + ("\r" if text.endswith("\r") else "")
+        if lines:
+            yield lines
+    tail += decoder.decode(b"", final=True)
+    if tail:
+        yield tail.splitlines()
+    metrics.count("blob_bytes_streamed", streamed)
+
+def stream_and_analyze(repo, sha, classes, keep_content):
+    """Download sha once and run classes over it. Returns (results, skip_reason, raw bytes if kept)."""
+    kept = [] if keep_content else None
+    with open_blob_stream(repo, sha) as response:
+        chunks = response.iter_content(STREAM_CHUNK)
+        first = next(chunks, b"")
+        # Cheap binary-ish heuristic: too many control chars in the first 4 KB
+        if len(first[:4096].translate(None, TEXT_BYTES)) > 100:
+            return None, "[skipped: binary-ish]", None
+
+        def tee(stream):
+            for chunk in stream:
+                if kept is not None:
+                    kept.append(chunk)
+                yield chunk
+
+        results = run_analyzers(classes, iter_line_batches(tee(itertools.chain([first], chunks))))
+    return results, None, b"".join(kept) if kept is not None else None
+
+def analyze_blob(repo, path, sha, size_hint=None):
+    """Return ({analyzer name: result}, skip_reason) for a file.
+
+    Results come from, in order: this run's index, the on-disk memo, the
+    memo's stored copy of the blob, and finally one download shared by every
+    analyzer registered for the path.
+    """
+    classes = analyzers_for(path)
     if size_hint is not None and size_hint > MAX_BYTES:
-        return None, f"[skipped: {size_hint} bytes]"
-    preflight(g)
-    blob = safe_github_call(repo.get_git_blob, sha)
-    try:
-        raw = base64.b64decode(blob.content, validate=False)
-    except binascii.Error:
-        raw = base64.b64decode(blob.content)
-    # Cheap binary-ish heuristic: too many control chars
-    if raw and (sum(c < 9 or (13 < c < 32) for c in raw[:4096]) > 100):
-        return None, "[skipped: binary-ish]"
-    return decode_utf8_lossy(raw), None
-
-
-def count_lines(content: str) -> int:
-    return len(content.splitlines())
-
-def count_python_constructs(content: str):
-    counts = {
-        "if statements": 0,
-        "while loops": 0,
-        "for loops": 0,
-        "regular functions created": 0,
-        "async functions created": 0,
-        "classes created": 0,
-    }
-    check_imports = True
-    importless_streak = 0
-    libraries = set()
-    import_patterns = [r"^import\s+(\w+)", r"^from\s+(\w+)\s+import"]
-    async_function_pattern = r"(?<!\w)async\s+def\s+\w+\b"
-    function_pattern = r"(?<!\w)def\s+\w+\b"
-
-    for line in content.splitlines():
-        if check_imports:
-            matched = False
-            for pattern in import_patterns:
-                m = re.match(pattern, line)
-                if m:
-                    libraries.add(m.group(1))
-                    matched = True
-                    break
-            if matched:
-                importless_streak = 0
-            else:
-                importless_streak += 1
-                if importless_streak > 10:
-                    check_imports = False
+        # Streaming analyzers read big files chunk by chunk; the rest would hold them in memory
+        classes = [cls for cls in classes if cls.streaming]
+        if not classes:
+            return None, f"[skipped: {size_hint} bytes]"
+        metrics.count("large_files_streamed")
+    key = (sha, analyzer_key(classes))
+    if key in blob_index:
+        metrics.cache("blob_analysis", True)
+        return blob_index[key]
+    metrics.cache("blob_analysis", False)
+
+    memo = get_memo()
+    results, skip_reason = memo.get(sha, classes) if memo else ({}, None)
+    results = results or {}
+    missing = [cls for cls in classes if cls.name not in results]
+    if memo:
+        metrics.cache("analysis_memo", skip_reason is not None or not missing)
+
+    if skip_reason is None and missing:
+        stored = memo.content(sha) if memo else None
+        if stored is not None:
+            # Analyzer changed since this blob was stored: recompute without downloading
+            fresh = run_analyzers(missing, [stored.decode("utf-8", errors="replace").splitlines()])
+            metrics.count("files_reanalyzed_from_memo")
+        else:
+            keep = memo is not None and (size_hint is None or size_hint <= MAX_BYTES)
+            fresh, skip_reason, content = stream_and_analyze(repo, sha, missing, keep)
+            if memo and skip_reason:
+                memo.put_skip(sha, skip_reason)
+            if memo and content is not None:
+                memo.put_content(sha, content)
+        if fresh is not None:
+            results.update(fresh)
+            if memo:
+                memo.put(sha, missing, fresh)
+
+    result = (None, skip_reason) if skip_reason else ({cls.name: results[cls.name] for cls in classes}, None)
+    blob_index[key] = result
+    return result
+
 
-        counts["if statements"] += len(re.findall(r"\bif\b", line))
-        counts["while loops"] += len(re.findall(r"\bwhile\b", line))
-        counts["for loops"] += len(re.findall(r"\bfor\b", line))
-        async_functions = len(re.findall(async_function_pattern, line))
-        all_functions = len(re.findall(function_pattern, line))
-        counts["async functions created"] += async_functions
-        counts["regular functions created"] += max(0, all_functions - async_functions)
-        counts["classes created"] += len(re.findall(r"(?<!\w)class\b", line))
+RECENT_DAYS = 90
 
-    return libraries, counts
+def recent_cutoff():
+    return datetime.now(timezone.utc) - timedelta(days=RECENT_DAYS)
 
 def is_recent_commit(commit_date):
-    return commit_date >= datetime.now(timezone.utc) - timedelta(days=90)
+    return commit_date >= recent_cutoff()
 
 def load_existing(path):
     if not os.path.exists(path):
-        return {
-            "repo_stats": [],
-            "commit_counts": {},
-            "construct_counts": [],
-            "recent_commits": []
-        }
-    with open(path, "r", encoding="utf-8") as f:
-        try:
-            data = json.load(f)
-        except json.JSONDecodeError:
-            # Corrupted? Start fresh but keep a backup
-            os.replace(path, path + ".corrupt_backup")
-            return {
-                "repo_stats": [],
-                "commit_counts": {},
-                "construct_counts": [],
-                "recent_commits": []
-            }
-    # Normalize fields expected by this version
-    data.setdefault("repo_stats", [])
-    data.setdefault("commit_counts", {})
-    data.setdefault("construct_counts", [])
-    data.setdefault("recent_commits", [])
-    return data
+        return models.RepoData().to_dict()
+    try:
+        return models.load_repo_data(path)
+    except (json.JSONDecodeError, models.SchemaError) as e:
+        # Corrupted, or not migratable to the current schema? Start fresh but keep a backup
+        print(f"⚠️ {path} could not be loaded ({e}); starting over, the old file is kept as {path}.corrupt_backup")
+        os.replace(path, path + ".corrupt_backup")
+        return models.RepoData().to_dict()
 
 def atomic_save(path, data):
-    tmp = path + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4)
-    os.replace(tmp, path)
+    models.save_repo_data(path, data)
 
 def rebuild_commit_counts_from_repo_stats(repo_stats):
-    # Aggregate all per-repo commit_times into a dataframe and rebuild the heatmap
+    # Aggregate all per-repo commit_times (one row per commit) and commit_time_counts
+    # (punch card rows with a count) into a dataframe and rebuild the heatmap
     rows = []
     for r in repo_stats:
         for d, h in r.get("commit_times", []):
-            rows.append((d, h))
+            rows.append((d, h, 1))
+        for d, h, c in r.get("commit_time_counts", []):
+            rows.append((d, h, c))
     if not rows:
         return {}
-    df = pd.DataFrame(rows, columns=["DayOfWeek", "HourOfDay"])
+    df = pd.DataFrame(rows, columns=["DayOfWeek", "HourOfDay", "Count"])
     weekday_map = {0: "Monday", 1: "Tuesday", 2: "Wednesday",
                    3: "Thursday", 4: "Friday", 5: "Saturday", 6: "Sunday"}
     df["DayOfWeek"] = df["DayOfWeek"].map(weekday_map)
-    commit_counts = df.groupby(["DayOfWeek", "HourOfDay"]).size().reset_index(name="Count")
+    commit_counts = df.groupby(["DayOfWeek", "HourOfDay"])["Count"].sum().reset_index()
+    commit_counts = commit_counts[commit_counts["Count"] > 0]
     out = {}
     for _, row in commit_counts.iterrows():
         day = row["DayOfWeek"]
@@ -261,42 +450,125 @@ def rebuild_commit_counts_from_repo_stats(repo_stats):
         out.setdefault(day, {})[hour] = count
     return out
 
-# ===== Init GitHub =====
-if not ACCESS_TOKEN:
-    raise RuntimeError("TOKEN env var is empty. Authenticated requests are required to avoid 60/hr limit.")
+# ===== Sharding =====
 
-g = Github(ACCESS_TOKEN, per_page=100)
-wait_for_rate_limit(g)
-user = safe_github_call(g.get_user, USER)
-
-# ===== Load prior progress (resume-safe) =====
-repo_data = load_existing(OUTPUT_PATH)
+def parse_shard(spec):
+    """'3/8' -> (3, 8): this process handles shard 3 of 8 (1-based)."""
+    try:
+        index, count = (int(part) for part in spec.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"shard must look like K/N, got {spec!r}")
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard index must be between 1 and {count}, got {index}")
+    return index, count
+
+def shard_of(repo_name, count):
+    # crc32 rather than hash(): it must agree across processes and machines
+    return zlib.crc32(repo_name.encode("utf-8")) % count + 1
+
+def in_shard(repo_name, shard):
+    return shard is None or shard_of(repo_name, shard[1]) == shard[0]
+
+def shard_output_path(shard):
+    base, ext = os.path.splitext(OUTPUT_PATH)
+    return f"{base}.shard-{shard[0]}-of-{shard[1]}{ext}"
+
+def shard_state(repo_data, shard):
+    """The part of repo_data that belongs to shard, used as that shard's starting point."""
+    state = dict(repo_data)
+    state["repo_stats"] = [r for r in repo_data["repo_stats"] if in_shard(r.get("repo_name", ""), shard)]
+    state["recent_commits"] = [c for c in repo_data["recent_commits"] if in_shard(c.get("repo_name", ""), shard)]
+    state["commit_counts"] = rebuild_commit_counts_from_repo_stats(state["repo_stats"])
+    return state
+
+def merge_states(base, parts):
+    """Fold shard states into base. A repository in several inputs keeps its most recent scrape.
+
+    recent_commits and commit_counts are rebuilt from the chosen repositories,
+    so the result is the same whatever order the shards finished in.
+    """
+    chosen = {r["repo_name"]: (r, [c for c in base["recent_commits"] if c.get("repo_name") == r["repo_name"]])
+              for r in base["repo_stats"]}
+    for part in parts:
+        for r in part["repo_stats"]:
+            current = chosen.get(r["repo_name"])
+            if current and current[0].get("scraped_at", "") > r.get("scraped_at", ""):
+                continue
+            chosen[r["repo_name"]] = (r, [c for c in part["recent_commits"] if c.get("repo_name") == r["repo_name"]])
+
+    merged = dict(base)
+    merged["repo_stats"] = [chosen[name][0] for name in sorted(chosen)]
+    commits = {}
+    for name in sorted(chosen):
+        for c in chosen[name][1]:
+            commits.setdefault(c["sha"], c)
+    merged["recent_commits"] = sorted(commits.values(), key=lambda c: (c["date"], c["sha"]), reverse=True)
+    merged["commit_counts"] = rebuild_commit_counts_from_repo_stats(merged["repo_stats"])
+    return merged
+
+def merge_shard_files(paths, output_path=OUTPUT_PATH):
+    base = load_existing(output_path)
+    parts = []
+    for path in paths:
+        parts.append(models.load_repo_data(path))
+    merged = merge_states(base, parts)
+    atomic_save(output_path, merged)
+    history.record_snapshot(merged, os.path.join(os.path.dirname(output_path), history.HISTORY_PATH))
+    print(f"🧩 Merged {len(paths)} shard file(s) into {output_path}: "
+          f"{len(merged['repo_stats'])} repositories, {len(merged['recent_commits'])} recent commits")
+    return merged
+
+# ===== Commit activity from the statistics API =====
+
+def punch_card_time_counts(repo):
+    """[[weekday, hour, count], ...] from /stats/punch_card, or None to fall back to paging commits.
+
+    GitHub computes repository statistics in the background and answers 202
+    (which PyGithub returns as None) until they are ready, so poll a few times.
+    Some repositories never get statistics (10,000 or more commits answer 422).
+    """
+    delay = 1
+    for attempt in range(STATS_POLL_ATTEMPTS):
+        preflight(g)
+        try:
+            card = safe_github_call(repo.get_stats_punch_card)
+        except GithubException as e:
+            print(f"⚠️ No punch card for {repo.name} ({e.status}), paging commits instead")
+            return None
+        if card is not None:
+            break
+        if attempt < STATS_POLL_ATTEMPTS - 1:
+            verbose(f"  ⏳ Punch card for {repo.name} is being computed, retrying in {delay}s")
+            time.sleep(delay)
+            delay *= 2
+    else:
+        return None
 
-# Map of repo_name -> index in repo_stats (for fast replace if overwriting)
-name_to_index = {r.get("repo_name"): idx for idx, r in enumerate(repo_data["repo_stats"])}
+    # Punch card days are 0 = Sunday; hours are already in each commit's own timezone
+    return sorted([(day - 1) % 7, hour, card.get(day, hour)]
+                  for day in range(7) for hour in range(24) if card.get(day, hour))
 
-processed_count = 0
+# ===== Per-repo processing =====
 
-# ===== Iterate repos =====
-repo_iter = safe_github_call(user.get_repos)
-for i, repo in enumerate(repo_iter):
-    if DEBUG and i >= STEP_COUNT:
-        print(f"🔍 Debug mode: stopping after {STEP_COUNT} repositories")
-        break
+def should_skip_repo(repo, user, name_to_index, resuming=()):
+    """Return a reason string when repo should not be processed this run, else None.
 
+    resuming names repositories an interrupted run left unfinished; they are
+    continued even when overwrite_existing is off.
+    """
     if repo.archived:
-        continue
+        return "archived"
     if not config.getboolean("Settings", "include_profile_repo", fallback=False) and repo.name == user.login:
-        continue
+        return "profile repo"
     if repo.name in IGNORED:
-        continue
+        return "ignored"
     if repo.owner.login != user.login:
-        continue
+        return "not owned"
 
     # Skip if already processed (unless overwrite)
-    if not OVERWRITE_EXISTING and repo.name in name_to_index:
+    if not OVERWRITE_EXISTING and repo.name in name_to_index and repo.name not in resuming:
         print(f"↩️  Skipping already-processed repo: {repo.name}")
-        continue
+        return "already processed"
 
     # Fork provenance check
     if repo.fork:
@@ -304,71 +576,27 @@ for i, repo in enumerate(repo_iter):
             source_repo = repo.source
             if source_repo and source_repo.owner.login != user.login:
                 print(f"⏭️ Skipping fork of {source_repo.owner.login}/{source_repo.name}")
-                continue
+                return "fork"
         except GithubException as e:
             print(f"⚠️ Could not determine source of fork {repo.name}: {e}")
-            continue
-
-    print(f"Processing {repo.name}...")
-    total_commits = 0
-    recent_commits = []
-    per_repo_commit_times = []  # (weekday_int, hour_int)
-
-    # ===== Commits (ALL history) =====
-    try:
-        preflight(g)
-        commits = safe_github_call(repo.get_commits)  # <-- no 'since': all time
-        for commit in commits:
-            author = getattr(commit.commit, "author", None)
-            if not author or not author.date:
-                continue
-            commit_date = author.date.replace(tzinfo=timezone.utc).astimezone(target_tz)
-            per_repo_commit_times.append([commit_date.weekday(), commit_date.hour])
-            total_commits += 1
-
-            if is_recent_commit(commit_date):
-                try:
-                    details = {
-                        "repo_name": repo.name,
-                        "repo_url": f"https://github.com/{user.login}/{repo.name}",
-                        "sha": commit.sha,
-                        "message": commit.commit.message or "",
-                        "author": author.name if author else None,
-                        "date": commit_date.isoformat()
-                    }
-                    preflight(g)
-                    commit_data = safe_github_call(repo.get_commit, commit.sha)
-                    stats = getattr(commit_data, "stats", None)
-                    if stats:
-                        details["additions"] = stats.additions
-                        details["deletions"] = stats.deletions
-                        details["total_changes"] = stats.total
-                    recent_commits.append(details)
-                except GithubException as e:
-                    print(f"⚠️ Error getting commit details for {commit.sha}: {e}")
-                    continue
-    except GithubException as e:
-        if e.status == 409 and "Git Repository is empty" in str(e):
-            print(f"⚠️ Skipping empty repository: {repo.name}")
-            continue
-        elif e.status == 404:
-            print(f"⚠️ Repository not found or inaccessible: {repo.name}")
-            continue
-        else:
-            print(f"❌ Error processing commits for {repo.name}: {e}")
-            continue
+            return "fork"
+    return None
 
-    # ===== Repo info & contents =====
-    repo_info = {
+def new_repo_info(repo, total_commits, commit_times, time_counts, word_index):
+    """repo_info with the commit fields filled in and the per-file ones still empty."""
+    return {
         "repo_name": repo.name,
         "python_files": [],
-        "libraries": set(),
+        "libraries": [],
         "total_python_files": 0,
         "total_python_lines": 0,
         "file_extensions": {},
         "total_commits": total_commits,
-        "commit_messages": [],  # optional to keep; you can fill similarly to earlier if needed
-        "commit_times": per_repo_commit_times,  # <-- stored for resume heatmap
+        "scraped_at": datetime.now(timezone.utc).isoformat(),
+        "commit_times": commit_times,  # <-- stored for resume heatmap
+        "commit_time_counts": time_counts or [],  # [weekday, hour, count] from the punch card in stats mode
+        "word_index": word_index,  # commit-message word counts for the word cloud
+        "analysis": {},  # analyzer name -> results summed over the repo's files (see analyzers.py)
         "construct_counts": {
             "if statements": 0,
             "while loops": 0,
@@ -379,95 +607,405 @@ for i, repo in enumerate(repo_iter):
         },
     }
 
-    # OPTIONAL: collect commit messages too (commented to save calls/time)
-    # If you want them, uncomment the msg append above when iterating commits.
+def pushed_stamp(repo):
+    """repo.pushed_at as stored in the checkpoint."""
+    return repo.pushed_at.isoformat() if repo.pushed_at else None
+
+def process_repo(repo, user, previous_info=None, checkpoint=None):
+    """Scrape one repository. Returns (repo_info, recent_commits), or None if it was skipped.
+
+    With a checkpoint, progress is saved as commit pages and files complete,
+    and a repository left unfinished by an earlier run continues from there.
+    """
+    previous_info = previous_info or {}
+    print(f"Processing {repo.name}...")
+    started, calls_before = time.time(), metrics.current.api_calls()
+    pushed_at = pushed_stamp(repo)
+    saved = checkpoint.resume(repo.name, pushed_at) if checkpoint else None
+    spent = saved["scrape_cost"] if saved else None  # what the interrupted runs already spent on it
+
+    if saved and saved["stage"] == "files":
+        repo_info, recent_commits = saved["repo_info"], saved["recent_commits"]
+    else:
+        repo_info = None
+        page, position = (saved["page"], saved["position"]) if saved else (0, 0)
+        total_commits = saved["total_commits"] if saved else 0
+        recent_commits = saved["recent_commits"] if saved else []
+        per_repo_commit_times = saved["commit_times"] if saved else []  # (weekday_int, hour_int)
+
+    def progress(stage, **state):
+        return dict(state, pushed_at=pushed_at, stage=stage, recent_commits=recent_commits,
+                    scrape_cost=scrape_cost(started, calls_before, spent))
+
+    # ===== Commits (ALL history, or only the recent window when the punch card covers the heatmap) =====
+    if repo_info is None:
+        with metrics.stage("commits", repo=repo.name):
+            try:
+                if saved:
+                    time_counts = saved["time_counts"]
+                    word_update = WordIndexUpdate.restore(previous_info.get("word_index"), saved["word_update"])
+                    if time_counts is not None and word_update.since is None:
+                        word_update.since = recent_cutoff()  # checkpoint from before since was saved
+                else:
+                    time_counts = punch_card_time_counts(repo) if COMMIT_ACTIVITY == "stats" else None
+                    if time_counts is not None:
+                        total_commits = sum(c for _d, _h, c in time_counts)
+                    # In stats mode only the recent window is listed, reaching back to the previous
+                    # head when it is older so the commits in between still reach the all-time words
+                    since = None
+                    if time_counts is not None:
+                        since = recent_cutoff()
+                        head_date = (previous_info.get("word_index") or {}).get("head_date")
+                        if head_date:
+                            since = min(since, datetime.fromisoformat(head_date))
+                    word_update = WordIndexUpdate(previous_info.get("word_index"), since)
+                preflight(g)
+                if word_update.since is not None:
+                    commits = safe_github_call(repo.get_commits, since=word_update.since)
+                else:
+                    commits = safe_github_call(repo.get_commits)  # <-- no 'since': all time
+                # Paged by hand so a checkpoint can name the page and commit to continue from
+                while True:
+                    batch = safe_github_call(commits.get_page, page)
+                    for position in range(position, len(batch)):
+                        if checkpoint and checkpoint.due():
+                            checkpoint.save(repo.name, progress(
+                                "commits", page=page, position=position, total_commits=total_commits,
+                                commit_times=per_repo_commit_times, time_counts=time_counts,
+                                word_update=word_update.state()))
+                        commit = batch[position]
+                        author = getattr(commit.commit, "author", None)
+                        if not author or not author.date:
+                            continue
+                        commit_date = author.date.replace(tzinfo=timezone.utc).astimezone(target_tz)
+                        if time_counts is None:
+                            per_repo_commit_times.append([commit_date.weekday(), commit_date.hour])
+                            total_commits += 1
+                        recent = is_recent_commit(commit_date)
+                        word_update.add(commit.sha, commit_date, commit.commit.message, recent)
+
+                        if recent:
+                            try:
+                                details = {
+                                    "repo_name": repo.name,
+                                    "repo_url": f"https://github.com/{user.login}/{repo.name}",
+                                    "sha": commit.sha,
+                                    "message": commit.commit.message or "",
+                                    "author": author.name if author else None,
+                                    "date": commit_date.isoformat()
+                                }
+                                preflight(g)
+                                commit_data = safe_github_call(repo.get_commit, commit.sha)
+                                stats = getattr(commit_data, "stats", None)
+                                if stats:
+                                    details["additions"] = stats.additions
+                                    details["deletions"] = stats.deletions
+                                    details["total_changes"] = stats.total
+                                recent_commits.append(details)
+                            except GithubException as e:
+                                print(f"⚠️ Error getting commit details for {commit.sha}: {e}")
+                                continue
+                    page, position = page + 1, 0
+                    if len(batch) < PER_PAGE:
+                        break
+            except GithubException as e:
+                if e.status == 409 and "Git Repository is empty" in str(e):
+                    print(f"⚠️ Skipping empty repository: {repo.name}")
+                    return None
+                elif e.status == 404:
+                    print(f"⚠️ Repository not found or inaccessible: {repo.name}")
+                    return None
+                else:
+                    print(f"❌ Error processing commits for {repo.name}: {e}")
+                    return None
+
+        repo_info = new_repo_info(repo, total_commits, per_repo_commit_times, time_counts,
+                                  word_update.finish(recent_cutoff()))
+
+    # ===== Repo info & contents =====
+    libraries = set(saved["libraries"]) if saved and saved["stage"] == "files" else set()
+    files_done = saved["files_done"] if saved and saved["stage"] == "files" else 0
 
     # Process all files to collect file extensions and Python files for analysis
     try:
-        all_files = list_repo_all_files_via_tree(repo)
-        
+        with metrics.stage("tree", repo=repo.name):
+            all_files = list_repo_all_files_via_tree(repo)
+
         # First pass: collect all file extensions and count them
+        repo_info["file_extensions"] = {}
         for path, sha, size, extension in all_files:
             repo_info["file_extensions"][extension] = repo_info["file_extensions"].get(extension, 0) + 1
-        
-        # Second pass: process Python files for detailed analysis
-        py_files = [f for f in all_files if f[3] == '.py']  # Filter Python files by extension
-        
-        for path, sha, size, extension in py_files:
-            text, skip_reason = fetch_blob_text(repo, sha, size)
-            if text is None:
-                print(f"  ⚠️ {path} {skip_reason}")
-                continue
 
-            repo_info["python_files"].append(path)
-            line_count = count_lines(text)
-            repo_info["total_python_files"] += 1
-            repo_info["total_python_lines"] += line_count
-
-            if DEBUG:
-                print(f"  📄 {path}: {line_count} lines (running total: {repo_info['total_python_lines']})")
-
-            libs, construct_counts = count_python_constructs(text)
-            repo_info["libraries"].update(libs)
-            for k, v in construct_counts.items():
-                repo_info["construct_counts"][k] += v
-                
-        if DEBUG:
-            print(f"  📁 Total files found: {len(all_files)}")
-            print(f"  📊 File extensions: {dict(repo_info['file_extensions'])}")
-            
+        # Second pass: run the registered analyzers over every file that has any
+        analyzed_files = [f for f in all_files if analyzers_for(f[0])]
+        if files_done and saved["files_total"] != len(analyzed_files):
+            print(f"🔁 {repo.name}: file list changed since the checkpoint, analyzing all files again")
+            fresh = new_repo_info(repo, repo_info["total_commits"], repo_info["commit_times"],
+                                  repo_info["commit_time_counts"], repo_info["word_index"])
+            repo_info = dict(fresh, file_extensions=repo_info["file_extensions"])
+            libraries, files_done = set(), 0
+
+        with metrics.stage("files", repo=repo.name, count=len(analyzed_files) - files_done):
+            for index in range(files_done, len(analyzed_files)):
+                if checkpoint and checkpoint.due():
+                    if get_memo():
+                        get_memo().commit()
+                    checkpoint.save(repo.name, progress("files", repo_info=repo_info, libraries=sorted(libraries),
+                                                        files_done=index, files_total=len(analyzed_files)))
+                path, sha, size, extension = analyzed_files[index]
+                results, skip_reason = analyze_blob(repo, path, sha, size)
+                if results is None:
+                    metrics.count("files_skipped")
+                    verbose(f"  ⚠️ {path} {skip_reason}")
+                    continue
+                metrics.count("files_analyzed")
+
+                for name, result in results.items():
+                    merge_results(repo_info["analysis"].setdefault(name, {}), dict(result, files=1))
+
+                if extension != ".py":
+                    verbose(f"  📓 {path}: {', '.join(results)}")
+                    continue
+
+                # Legacy per-repo fields the charts and README read
+                repo_info["python_files"].append(path)
+                line_count = results["lines"]["lines"]
+                repo_info["total_python_files"] += 1
+                repo_info["total_python_lines"] += line_count
+
+                verbose(f"  📄 {path}: {line_count} lines (running total: {repo_info['total_python_lines']})")
+
+                libraries.update(results["imports"]["libraries"])
+                for k, v in results["constructs"]["construct_counts"].items():
+                    repo_info["construct_counts"][k] += v
+
+        verbose(f"  📁 Total files found: {len(all_files)}")
+        verbose(f"  📊 File extensions: {dict(repo_info['file_extensions'])}")
+
     except GithubException as e:
         print(f"❌ Error processing repository {repo.name} with Trees API: {e}")
-        continue
+        return None
 
-    repo_info["libraries"] = list(repo_info["libraries"])
+    repo_info["libraries"] = sorted(libraries)
+    repo_info["scrape_cost"] = scrape_cost(started, calls_before, spent)
+    return repo_info, recent_commits
 
-    # Merge into repo_data (replace or append)
-    if repo.name in name_to_index and OVERWRITE_EXISTING:
-        repo_data["repo_stats"][name_to_index[repo.name]] = repo_info
-    elif repo.name in name_to_index and not OVERWRITE_EXISTING:
-        # Skip because we already processed in a previous run
-        pass
+def merge_repo_result(repo_data, name_to_index, repo_info, recent_commits):
+    """Replace or append repo_info and fold its recent commits and heatmap into repo_data."""
+    name = repo_info["repo_name"]
+    if name in name_to_index:
+        repo_data["repo_stats"][name_to_index[name]] = repo_info
     else:
         repo_data["repo_stats"].append(repo_info)
-        name_to_index[repo.name] = len(repo_data["repo_stats"]) - 1
+        name_to_index[name] = len(repo_data["repo_stats"]) - 1
 
-    # Merge recent commits
+    # Replace this repo's recent commits, so re-scraping a repo never duplicates them
+    repo_data["recent_commits"] = [c for c in repo_data["recent_commits"] if c.get("repo_name") != name]
     repo_data["recent_commits"].extend(recent_commits)
 
     # Rebuild heatmap from ALL per-repo commit_times so far (cheap)
     repo_data["commit_counts"] = rebuild_commit_counts_from_repo_stats(repo_data["repo_stats"])
 
-    # Checkpoint after each repo (atomic)
-    atomic_save(OUTPUT_PATH, repo_data)
-    processed_count += 1
-    print(f"💾 Saved progress after {repo.name} ({processed_count} repos this run)")
+def print_repo_summary(repo_info):
     print(f"  📊 FINAL REPO SUMMARY:")
     print(f"     Python files: {repo_info['total_python_files']}")
     print(f"     Total lines: {repo_info['total_python_lines']}")
     if repo_info['total_python_files'] > 0:
         print(f"     Average lines per file: {repo_info['total_python_lines'] / repo_info['total_python_files']:.1f}")
     print(f"     All file types: {dict(repo_info['file_extensions'])}")
-    print(f"     Python files processed:")
+    verbose(f"     Python files processed:")
     for py_file in repo_info['python_files']:
-        print(f"       - {py_file}")
+        verbose(f"       - {py_file}")
     print()
 
-print("✅ Done. Final data saved to repo_data.json")
+def print_final_summary(repo_data):
+    total_python_files = sum(repo.get("total_python_files", 0) for repo in repo_data["repo_stats"])
+    total_python_lines = sum(repo.get("total_python_lines", 0) for repo in repo_data["repo_stats"])
+
+    # Aggregate all file extensions across repositories
+    all_file_extensions = defaultdict(int)
+    for repo in repo_data["repo_stats"]:
+        for ext, count in repo.get("file_extensions", {}).items():
+            all_file_extensions[ext] += count
+
+    print(f"\n📊 FINAL SUMMARY:")
+    print(f"   Total repositories: {len(repo_data['repo_stats'])}")
+    print(f"   Total Python files: {total_python_files}")
+    print(f"   Total Python lines: {total_python_lines}")
+    print(f"   Average lines per file: {total_python_lines / total_python_files if total_python_files > 0 else 0:.1f}")
+    print(f"   All file types found: {dict(all_file_extensions)}")
+
+def scrape_account(user, output_path, repo_data=None, shard=None):
+    """Scrape every repository of user (a user or organization) into output_path.
+
+    With shard=(k, n) only repositories hashing to shard k are scraped. Repositories go most
+    recently pushed first and the run stops at the [Schedule] budget.
+    """
+    if repo_data is None:
+        repo_data = load_existing(output_path)
+    name_to_index = {r.get("repo_name"): idx for idx, r in enumerate(repo_data["repo_stats"])}
+    processed_count = 0
+    schedule = Scheduler(repo_data["repo_stats"])
+    checkpoint = Checkpoint(checkpoint_path(output_path))
+
+    # ===== Iterate repos, most recently pushed first =====
+    repo_iter = pushed_order(safe_github_call(user.get_repos))
+    for i, repo in enumerate(repo_iter):
+        if DEBUG and i >= STEP_COUNT:
+            print(f"🔍 Debug mode: stopping after {STEP_COUNT} repositories")
+            break
+
+        if not in_shard(repo.name, shard):
+            continue
+        if should_skip_repo(repo, user, name_to_index, checkpoint.in_progress()):
+            continue
+        if checkpoint.completed_unchanged(repo.name, pushed_stamp(repo)):
+            print(f"↩️  Skipping {repo.name}, already scraped by the interrupted run")
+            continue
+
+        if not schedule.fits(repo.name):
+            schedule.defer([r.name for r in repo_iter[i:]
+                            if in_shard(r.name, shard) and not r.archived and r.name not in IGNORED
+                            and not checkpoint.completed_unchanged(r.name, pushed_stamp(r))])
+            break
+        previous_info = repo_data["repo_stats"][name_to_index[repo.name]] if repo.name in name_to_index else None
+        with metrics.stage("repo", repo=repo.name):
+            result = process_repo(repo, user, previous_info, checkpoint)
+        if result is None:
+            checkpoint.finish(repo.name)
+            continue
+        repo_info, recent_commits = result
+        merge_repo_result(repo_data, name_to_index, repo_info, recent_commits)
+
+        # Checkpoint after each repo (atomic)
+        atomic_save(output_path, repo_data)
+        if get_memo():
+            get_memo().commit()
+        checkpoint.finish(repo.name, pushed_stamp(repo), completed=True)
+        processed_count += 1
+        print(f"💾 Saved progress after {repo.name} ({processed_count} repos this run)")
+        print_repo_summary(repo_info)
+
+    schedule.report()
+    checkpoint.close()
+
+    # Age out window counts for repos that were not re-scraped this run
+    cutoff = recent_cutoff()
+    for r in repo_data["repo_stats"]:
+        if r.get("word_index"):
+            expire_window(r["word_index"], cutoff)
+    atomic_save(output_path, repo_data)
+    # A shard only holds part of the account; its snapshot is taken when the shards are merged
+    if shard is None:
+        history.record_snapshot(repo_data, os.path.join(os.path.dirname(output_path), history.HISTORY_PATH))
+
+    print(f"✅ Done. Final data saved to {output_path}")
+
+    # Print final summary
+    print_final_summary(repo_data)
+    return repo_data
+
+# ===== Dry run =====
+
+def recent_commit_count(repo_data, name):
+    cutoff = recent_cutoff()
+    return len({c["sha"] for c in repo_data["recent_commits"]
+                if c.get("repo_name") == name and datetime.fromisoformat(c["date"]) >= cutoff})
+
+def dry_run(user, repo_data, name_to_index):
+    """Estimate API calls, bytes and time for a real run using listing calls and existing state."""
+    report = BudgetReport()
+    report.overhead_calls = 2  # user lookup + rate limit check
+    seen_blobs = set()  # a sha fetched for one repo is reused for the rest of the run
+    memo = get_memo()  # blobs already analyzed (or stored) on disk cost nothing
+    repo_iter = safe_github_call(user.get_repos)
+    for i, repo in enumerate(repo_iter):
+        if i % 100 == 0:
+            report.overhead_calls += 1  # one listing page per 100 repos
+        if DEBUG and i >= STEP_COUNT:
+            break
+
+        reason = should_skip_repo(repo, user, name_to_index)
+        if reason:
+            report.skip(repo.name, reason)
+            continue
 
-# Print final summary
-total_python_files = sum(repo.get("total_python_files", 0) for repo in repo_data["repo_stats"])
-total_python_lines = sum(repo.get("total_python_lines", 0) for repo in repo_data["repo_stats"])
+        previous = repo_data["repo_stats"][name_to_index[repo.name]] if repo.name in name_to_index else None
+        try:
+            if previous and previous.get("scraped_at"):
+                # Known repo: reuse stored counts, probing only for commits pushed since the last scrape
+                total = previous.get("total_commits", 0)
+                recent = recent_commit_count(repo_data, repo.name)
+                scraped_at = datetime.fromisoformat(previous["scraped_at"])
+                if repo.pushed_at and repo.pushed_at.replace(tzinfo=timezone.utc) > scraped_at:
+                    new = safe_github_call(repo.get_commits, since=scraped_at).totalCount
+                    total += new
+                    recent += new
+            else:
+                total = safe_github_call(repo.get_commits).totalCount
+                recent = safe_github_call(repo.get_commits, since=recent_cutoff()).totalCount
+            files = list_repo_all_files_via_tree(repo)
+        except GithubException as e:
+            report.skip(repo.name, f"error {e.status}")
+            continue
+
+        sizes = []
+        for path, sha, size, extension in files:
+            classes = analyzers_for(path)
+            if size is not None and size > MAX_BYTES:
+                classes = [cls for cls in classes if cls.streaming]
+            if classes and sha not in seen_blobs and not (memo and memo.has(sha, classes)):
+                seen_blobs.add(sha)
+                sizes.append(size)
+        report.add(repo.name, estimate_repo(total, recent, sizes, punch_card=COMMIT_ACTIVITY == "stats",
+                                            tree_calls=tree_calls.get(repo.full_name, 1)))
+
+    remaining, limit = g.rate_limiting
+    return report.print(remaining, limit, g.rate_limiting_resettime, metrics.current.api_calls())
+
+# ===== Main =====
+
+def main():
+    global g
+    parser = argparse.ArgumentParser(description="Scrape GitHub repositories into repo_data.json")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="estimate API calls, bytes and time for a real run without scraping")
+    parser.add_argument("--shard", type=parse_shard, metavar="K/N",
+                        help="only scrape repositories in shard K of N and write repo_data.shard-K-of-N.json")
+    parser.add_argument("--merge", nargs="+", metavar="SHARD_FILE",
+                        help="merge shard files into repo_data.json and exit (no API calls)")
+    args = parser.parse_args()
+
+    if args.merge:
+        merge_shard_files(args.merge)
+        return
+
+    metrics.begin("data_scrape_dry_run" if args.dry_run else "data_scrape")
+    print(USER)
+
+    # ===== Init GitHub =====
+    if not ACCESS_TOKEN:
+        raise RuntimeError("TOKEN env var is empty. Authenticated requests are required to avoid 60/hr limit.")
+
+    g = Github(ACCESS_TOKEN, base_url=API_URL, per_page=100)
+    wait_for_rate_limit(g)
+    user = safe_github_call(g.get_user, USER)
+
+    # ===== Load prior progress (resume-safe) =====
+    repo_data = load_existing(OUTPUT_PATH)
+
+    # Map of repo_name -> index in repo_stats (for fast replace if overwriting)
+    name_to_index = {r.get("repo_name"): idx for idx, r in enumerate(repo_data["repo_stats"])}
+
+    if args.dry_run:
+        dry_run(user, repo_data, name_to_index)
+        return
+
+    if args.shard:
+        scrape_account(user, shard_output_path(args.shard), shard_state(repo_data, args.shard), shard=args.shard)
+    else:
+        scrape_account(user, OUTPUT_PATH, repo_data)
 
-# Aggregate all file extensions across repositories
-all_file_extensions = defaultdict(int)
-for repo in repo_data["repo_stats"]:
-    for ext, count in repo.get("file_extensions", {}).items():
-        all_file_extensions[ext] += count
 
-print(f"\n📊 FINAL SUMMARY:")
-print(f"   Total repositories: {len(repo_data['repo_stats'])}")
-print(f"   Total Python files: {total_python_files}")
-print(f"   Total Python lines: {total_python_lines}")
-print(f"   Average lines per file: {total_python_lines / total_python_files if total_python_files > 0 else 0:.1f}")
-print(f"   All file types found: {dict(all_file_extensions)}")
+if __name__ == "__main__":
+    main()
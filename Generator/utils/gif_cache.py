@@ -0,0 +1,156 @@
+import os
+import io
+import json
+import hashlib
+import struct
+
+# Bump when the way segments are rendered changes so old cache entries are ignored
+SEGMENT_VERSION = 1
+
+GIF_HEADER = b"GIF89a"
+GIF_TRAILER = b"\x3b"
+
+
+def file_digest(path):
+    """sha256 of a file's bytes, used to key cached segments by source image."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def segment_key(kind, **params):
+    """Stable cache key for a segment from its kind and render parameters."""
+    payload = json.dumps({"kind": kind, "version": SEGMENT_VERSION, **params}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def _read_sub_blocks(data, pos):
+    """Return the end position of a run of GIF data sub-blocks starting at pos."""
+    while True:
+        size = data[pos]
+        pos += 1
+        if size == 0:
+            return pos
+        pos += size
+
+
+def extract_frame_blocks(gif_bytes):
+    """Turn an encoded GIF into self-contained frame blocks.
+
+    Every frame gets a local color table (the global one is copied in where a
+    frame relied on it) so the returned bytes can be concatenated with frames
+    from other GIFs behind a single header.
+    """
+    data = memoryview(gif_bytes)
+    if bytes(data[:6]) not in (b"GIF87a", b"GIF89a"):
+        raise ValueError("not a GIF stream")
+    packed = data[10]
+    pos = 13
+    global_table = b""
+    global_size_bits = 0
+    if packed & 0x80:
+        global_size_bits = packed & 0x07
+        table_len = 3 * (2 ** (global_size_bits + 1))
+        global_table = bytes(data[pos:pos + table_len])
+        pos += table_len
+
+    out = bytearray()
+    pending_gce = b""
+    while pos < len(data):
+        block = data[pos]
+        if block == 0x3B:  # trailer
+            break
+        if block == 0x21:  # extension
+            label = data[pos + 1]
+            end = _read_sub_blocks(data, pos + 2)
+            if label == 0xF9:  # graphic control extension belongs to the next image
+                pending_gce = bytes(data[pos:end])
+            pos = end
+            continue
+        if block == 0x2C:  # image descriptor
+            descriptor = bytearray(data[pos:pos + 10])
+            pos += 10
+            image_packed = descriptor[9]
+            if image_packed & 0x80:
+                table_len = 3 * (2 ** ((image_packed & 0x07) + 1))
+                color_table = bytes(data[pos:pos + table_len])
+                pos += table_len
+            else:
+                if not global_table:
+                    raise ValueError("frame without any color table")
+                descriptor[9] = (image_packed & 0x40) | 0x80 | global_size_bits
+                color_table = global_table
+            start = pos
+            pos = _read_sub_blocks(data, pos + 1)  # skip LZW minimum code size
+            out += pending_gce + bytes(descriptor) + color_table + bytes(data[start:pos])
+            pending_gce = b""
+            continue
+        raise ValueError(f"unexpected GIF block 0x{block:02x} at {pos}")
+    return bytes(out)
+
+
+def encode_segment(frames, durations):
+    """Encode PIL frames with per-frame durations (ms) into reusable frame blocks."""
+    buf = io.BytesIO()
+    frames[0].save(
+        buf,
+        format="GIF",
+        save_all=True,
+        append_images=frames[1:],
+        duration=list(durations) if len(frames) > 1 else durations[0],
+        loop=0,
+    )
+    return extract_frame_blocks(buf.getvalue())
+
+
+def assemble_gif(size, segments, loop=0):
+    """Concatenate pre-encoded frame blocks behind one header into a looping GIF."""
+    width, height = size
+    out = bytearray(GIF_HEADER)
+    out += struct.pack("<HHBBB", width, height, 0, 0, 0)
+    out += b"\x21\xff\x0bNETSCAPE2.0\x03\x01" + struct.pack("<H", loop) + b"\x00"
+    for segment in segments:
+        out += segment
+    out += GIF_TRAILER
+    return bytes(out)
+
+
+class SegmentCache:
+    """On-disk store of encoded GIF segments, one file per segment key."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.used = set()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.seg")
+
+    def get_or_render(self, key, render):
+        """Return cached bytes for key, calling render() to build them on a miss."""
+        self.used.add(key)
+        path = self._path(key)
+        if os.path.exists(path):
+            self.hits += 1
+            with open(path, "rb") as f:
+                return f.read()
+        self.misses += 1
+        data = render()
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        return data
+
+    def prune(self):
+        """Delete segments that the current build did not use."""
+        removed = 0
+        for name in os.listdir(self.directory):
+            if name.endswith(".seg") and name[:-4] not in self.used:
+                os.remove(os.path.join(self.directory, name))
+                removed += 1
+        return removed
@@ -1,10 +1,14 @@
 import os
-import imageio
 from PIL import Image, ImageDraw, ImageFont
-import numpy as np
 from config_helper import config
+from gif_cache import SegmentCache, file_digest, segment_key, encode_segment, assemble_gif
+import metrics
+import publish
+
+metrics.begin("gifmaker")
 
 GIF_FRAME_DURATION = int(config.get("Settings", "gif_frame_duration", fallback="5000"))
+CACHE_DIR = config.get("Cache", "cache_dir", fallback=".cache")
 
 directory = "DataVisuals"
 directory = os.path.join(os.getcwd(), directory)
@@ -34,34 +38,70 @@ common_size = (1200, 800)
 duration_per_frame = GIF_FRAME_DURATION
 fade_duration = 1000
 fade_steps = int(fade_duration / 100)
+step_duration = fade_duration // fade_steps
 
 bg_color = (34, 39, 46)
 
-images = [Image.open(img_path).convert("RGB") for img_path in ordered_image_paths]
-resized_images = [img.resize(common_size, Image.LANCZOS) for img in images]
 background_image = Image.new("RGB", common_size, bg_color)
 
-all_frames = []
+# Slides are only opened and resized when one of their segments has to be rendered
+_loaded = {}
+
+
+def load_slide(path):
+    if path not in _loaded:
+        _loaded[path] = Image.open(path).convert("RGB").resize(common_size, Image.LANCZOS)
+    return _loaded[path]
 
-for i in range(len(resized_images)):
-    current_image = resized_images[i]
-    next_image = resized_images[(i + 1) % len(resized_images)]
 
-    for second in range(duration_per_frame // 1000, 0, -1):
-        frame = add_timer(current_image.copy(), second)
-        all_frames.extend([np.array(frame)] * 10)
+def render_slide(path):
+    # One frame per countdown second; the GIF frame delay carries the hold time
+    current_image = load_slide(path)
+    frames = [add_timer(current_image.copy(), second) for second in range(duration_per_frame // 1000, 0, -1)]
+    return encode_segment(frames, [1000] * len(frames))
 
+
+def render_transition(path, next_path):
+    current_image = load_slide(path)
+    next_image = load_slide(next_path)
+    frames = []
     for step in range(1, fade_steps + 1):
         alpha = step / fade_steps
-        blended_image = blend_images(current_image, background_image, alpha)
-        all_frames.append(np.array(blended_image))
-
+        frames.append(blend_images(current_image, background_image, alpha))
     for step in range(1, fade_steps + 1):
         alpha = step / fade_steps
-        blended_image = blend_images(background_image, next_image, alpha)
-        all_frames.append(np.array(blended_image))
+        frames.append(blend_images(background_image, next_image, alpha))
+    return encode_segment(frames, [step_duration] * len(frames))
+
+
+cache = SegmentCache(os.path.join(CACHE_DIR, "gif"))
+digests = {path: file_digest(path) for path in ordered_image_paths}
+render_settings = {"size": list(common_size), "bg": list(bg_color)}
+
+segments = []
+with metrics.stage("segments"):
+    for i, path in enumerate(ordered_image_paths):
+        next_path = ordered_image_paths[(i + 1) % len(ordered_image_paths)]
+
+        slide_key = segment_key("slide", source=digests[path], duration=duration_per_frame, **render_settings)
+        segments.append(cache.get_or_render(slide_key, lambda: render_slide(path)))
+
+        transition_key = segment_key(
+            "transition",
+            source=digests[path],
+            target=digests[next_path],
+            fade_duration=fade_duration,
+            fade_steps=fade_steps,
+            **render_settings,
+        )
+        segments.append(cache.get_or_render(transition_key, lambda: render_transition(path, next_path)))
+
+pruned = cache.prune()
+metrics.cache("gif_segments", True, cache.hits)
+metrics.cache("gif_segments", False, cache.misses)
 
 output_gif = os.path.join(directory, "data.gif")
-imageio.mimsave(output_gif, all_frames, duration=100, loop=0)
+written = publish.publish_bytes(output_gif, assemble_gif(common_size, segments))
 
-print(f"Animated GIF created: {output_gif}")
+print(f"Reused {cache.hits} cached segments, rendered {cache.misses}, pruned {pruned}")
+print(f"Animated GIF {'created' if written else 'unchanged'}: {output_gif}")
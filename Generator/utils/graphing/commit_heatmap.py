@@ -1,12 +1,16 @@
-import json
 import pandas as pd
 import plotly.express as px
 import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import metrics
+import models
+import publish
 
+metrics.begin("commit_heatmap")
 
 
-with open("repo_data.json", "r") as file:
-    data = json.load(file)
+data = models.load_repo_data()
 
 # Flatten the commit_counts structure from the JSON
 commit_data = []
@@ -57,5 +61,6 @@ fig.update_layout(
 
 # Save the figure
 os.makedirs("DataVisuals", exist_ok=True)
-fig.write_image("DataVisuals/commit_heatmap.png", width=1200, height=800)
+with metrics.stage("render"):
+    publish.write_image(fig, "DataVisuals/commit_heatmap.png", width=1200, height=800)
 print("Commit heatmap generated successfully.")
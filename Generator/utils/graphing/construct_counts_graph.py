@@ -1,17 +1,19 @@
-import json
-import plotly.graph_objects as go
-import pandas as pd
 from collections import defaultdict
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from config_helper import config
+import metrics
+import models
+import publish
+import svg_charts
+
+metrics.begin("construct_counts_graph")
 
 GENERATE = config.getboolean("Settings", "generate_construct_bar_chart")
 
 # Load repo data from JSON
-with open("repo_data.json", "r") as json_file:
-    repo_data = json.load(json_file)
+repo_data = models.load_repo_data()
 
 # Aggregate construct counts across all repositories
 aggregate_construct_count = defaultdict(int)
@@ -21,11 +23,10 @@ for repo in repo_data["repo_stats"]:
     for construct, count in construct_counts.items():
         aggregate_construct_count[construct] += count
 
-# Convert aggregate_construct_count to a DataFrame
-df = pd.DataFrame(list(aggregate_construct_count.items()), columns=["Construct", "Count"])
-
 # Get top 15 constructs
-df = df.sort_values(by="Count", ascending=False).head(15)
+top_constructs = sorted(aggregate_construct_count.items(), key=lambda item: item[1], reverse=True)[:15]
+constructs = [construct for construct, _ in top_constructs]
+counts = [count for _, count in top_constructs]
 
 # Define colors for bar chart
 colors = [
@@ -46,33 +47,49 @@ colors = [
     "#ff4757",
 ]
 
-# Create figure for construct counts
-fig = go.Figure(
-    data=[
-        go.Bar(
-            x=df["Construct"],
-            y=df["Count"],
-            text=df["Count"],
-            textposition="auto",
-            marker_color=colors[: len(df)],
-            textfont=dict(size=14, weight="bold"),
-        )
-    ]
-)
 
-fig.update_layout(
-    title="Python Construct Counts",
-    yaxis_title="Count",
-    xaxis_tickangle=-45,
-    font=dict(family="Arial, sans-serif", size=14, color="rgb(255, 255, 255)"),
-    plot_bgcolor="#22272E",
-    paper_bgcolor="#22272E",
-    margin=dict(l=40, r=40, t=60, b=100),
-    yaxis=dict(showticklabels=False, ticks="", showgrid=False, zeroline=False),
-)
+def png_figure():
+    # Plotly and pandas are only imported when a PNG is wanted; the SVG path starts instantly
+    import pandas as pd
+    import plotly.graph_objects as go
+
+    df = pd.DataFrame({"Construct": constructs, "Count": counts})
+
+    # Create figure for construct counts
+    fig = go.Figure(
+        data=[
+            go.Bar(
+                x=df["Construct"],
+                y=df["Count"],
+                text=df["Count"],
+                textposition="auto",
+                marker_color=colors[: len(df)],
+                textfont=dict(size=14, weight="bold"),
+            )
+        ]
+    )
+
+    fig.update_layout(
+        title="Python Construct Counts",
+        yaxis_title="Count",
+        xaxis_tickangle=-45,
+        font=dict(family="Arial, sans-serif", size=14, color="rgb(255, 255, 255)"),
+        plot_bgcolor="#22272E",
+        paper_bgcolor="#22272E",
+        margin=dict(l=40, r=40, t=60, b=100),
+        yaxis=dict(showticklabels=False, ticks="", showgrid=False, zeroline=False),
+    )
+    return fig
+
 
 if GENERATE:
-    fig.write_image("DataVisuals/construct_counts.png", width=1200, height=800)
+    if svg_charts.WANT_SVG:
+        with metrics.stage("render_svg"):
+            svg = svg_charts.bar_chart(constructs, counts, "Python Construct Counts")
+            publish.publish_text("DataVisuals/construct_counts.svg", svg)
+    if svg_charts.WANT_PNG:
+        with metrics.stage("render"):
+            publish.write_image(png_figure(), "DataVisuals/construct_counts.png", width=1200, height=800)
     print("Construct counts graph generated successfully.")
 else:
     print("Construct counts graph not generated.")
\ No newline at end of file
@@ -1,18 +1,20 @@
-import json
-import plotly.graph_objects as go
-import pandas as pd
 from collections import defaultdict
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from config_helper import config
+import metrics
+import models
+import publish
+import svg_charts
+
+metrics.begin("file_types_bar_graph")
 
 GENERATE = config.getboolean("Settings", "generate_file_types_bar_chart")
 EXCLUDED_FILE_TYPES = config.get("ExcludedFileTypes", "excluded_file_types")
 
 # Load repo data from JSON
-with open("repo_data.json", "r") as json_file:
-    repo_data = json.load(json_file)
+repo_data = models.load_repo_data()
 
 # Parse excluded file types for comparison
 excluded_file_types_list = []
@@ -40,14 +42,13 @@ for repo in repo_data["repo_stats"]:
 # Check if we have any file types to display
 if not aggregate_file_extension_count:
     print("⚠️ No file types found to display. Check if file_extensions are populated in repo_data.json")
-    # Create a placeholder DataFrame
-    df = pd.DataFrame({"File Type": ["No data"], "Count": [0]})
+    # Placeholder bar
+    file_types, counts = ["No data"], [0]
 else:
-    # Convert aggregate_file_extension_count to a DataFrame
-    df = pd.DataFrame(list(aggregate_file_extension_count.items()), columns=["File Type", "Count"])
-    
     # Sort by count and get top 15 file types
-    df = df.sort_values(by="Count", ascending=False).head(15)
+    top_file_types = sorted(aggregate_file_extension_count.items(), key=lambda item: item[1], reverse=True)[:15]
+    file_types = [file_type for file_type, _ in top_file_types]
+    counts = [count for _, count in top_file_types]
 
 # Define colors for bar chart
 colors = [
@@ -68,38 +69,55 @@ colors = [
     "#ff4757",
 ]
 
-# Create figure for file types counts
-fig = go.Figure(
-    data=[
-        go.Bar(
-            x=df["File Type"],
-            y=df["Count"],
-            text=df["Count"],
-            textposition="auto",
-            marker_color=colors[: len(df)],
-            textfont=dict(size=14, weight="bold"),
-        )
-    ]
-)
-
 # Create title with excluded file types info
 title_text = "File Types Counts"
 if excluded_file_types_list:
     title_text += f"<br><sub>Excluded: {', '.join(excluded_file_types_list)}</sub>"
 
-fig.update_layout(
-    title=title_text,
-    yaxis_title="Count",
-    xaxis_tickangle=-45,
-    font=dict(family="Arial, sans-serif", size=14, color="rgb(255, 255, 255)"),
-    plot_bgcolor="#22272E",
-    paper_bgcolor="#22272E",
-    margin=dict(l=40, r=40, t=80, b=100),  # Increased top margin for longer title
-    yaxis=dict(showticklabels=False, ticks="", showgrid=False, zeroline=False),
-)
+
+def png_figure():
+    # Plotly and pandas are only imported when a PNG is wanted; the SVG path starts instantly
+    import pandas as pd
+    import plotly.graph_objects as go
+
+    df = pd.DataFrame({"File Type": file_types, "Count": counts})
+
+    # Create figure for file types counts
+    fig = go.Figure(
+        data=[
+            go.Bar(
+                x=df["File Type"],
+                y=df["Count"],
+                text=df["Count"],
+                textposition="auto",
+                marker_color=colors[: len(df)],
+                textfont=dict(size=14, weight="bold"),
+            )
+        ]
+    )
+
+    fig.update_layout(
+        title=title_text,
+        yaxis_title="Count",
+        xaxis_tickangle=-45,
+        font=dict(family="Arial, sans-serif", size=14, color="rgb(255, 255, 255)"),
+        plot_bgcolor="#22272E",
+        paper_bgcolor="#22272E",
+        margin=dict(l=40, r=40, t=80, b=100),  # Increased top margin for longer title
+        yaxis=dict(showticklabels=False, ticks="", showgrid=False, zeroline=False),
+    )
+    return fig
+
 
 if GENERATE:
-    fig.write_image("DataVisuals/file_types_counts.png", width=1200, height=800)
+    if svg_charts.WANT_SVG:
+        with metrics.stage("render_svg"):
+            subtitle = f"Excluded: {', '.join(excluded_file_types_list)}" if excluded_file_types_list else None
+            svg = svg_charts.bar_chart(file_types, counts, "File Types Counts", subtitle)
+            publish.publish_text("DataVisuals/file_types_counts.svg", svg)
+    if svg_charts.WANT_PNG:
+        with metrics.stage("render"):
+            publish.write_image(png_figure(), "DataVisuals/file_types_counts.png", width=1200, height=800)
     print("File types counts graph generated successfully.")
 else:
     print("File types counts graph not generated.")
@@ -0,0 +1,61 @@
+from datetime import datetime, timezone
+import json
+import plotly.express as px
+import pandas as pd
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from config_helper import config
+import history
+import metrics
+import publish
+
+metrics.begin("libraries_history_graph")
+
+GENERATE = config.getboolean("Settings", "generate_libraries_history_chart", fallback=True)
+# A JSON list such as ["time", "random"], matched by exact library name
+EXCLUDED_LIBS = set(json.loads(config.get("ExcludedLibs", "excluded_libraries", fallback="[]") or "[]"))
+
+# Drawn from the snapshot history alone; repo_data.json is not needed
+times, libraries = history.timeline(history.load_history(), "libraries")
+dates = [datetime.fromtimestamp(t, tz=timezone.utc) for t in times]
+
+# The 8 libraries used by the most repositories today
+top = sorted((name for name in libraries if name not in EXCLUDED_LIBS),
+             key=lambda n: libraries[n][-1], reverse=True)[:8]
+
+df = pd.DataFrame(
+    [{"Date": date, "Library": name, "Repositories": libraries[name][i]}
+     for name in top for i, date in enumerate(dates)],
+    columns=["Date", "Library", "Repositories"],
+)
+
+fig = px.line(
+    df,
+    x="Date",
+    y="Repositories",
+    color="Library",
+    line_shape="hv",  # counts hold until the next snapshot
+    markers=True,
+    template="plotly_dark",
+)
+
+fig.update_layout(
+    title="Top Libraries Over Time<br><sub>Number of repositories importing each library</sub>",
+    xaxis_title="",
+    yaxis_title="Repositories",
+    font=dict(family="Arial, sans-serif", size=14, color="rgb(255, 255, 255)"),
+    xaxis=dict(showgrid=False),
+    yaxis=dict(showgrid=False, zeroline=False, showline=True, rangemode="tozero"),
+    plot_bgcolor="#22272E",
+    paper_bgcolor="#22272E",
+    margin=dict(l=40, r=40, t=100, b=40),
+)
+
+
+if GENERATE and top:
+    with metrics.stage("render"):
+        publish.write_image(fig, "DataVisuals/libraries_history.png", width=1200, height=800)
+    print("Libraries history chart generated successfully.")
+else:
+    print("Libraries history chart not generated.")
@@ -1,16 +1,19 @@
-import json
 import plotly.express as px
 import pandas as pd
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from config_helper import config
+import metrics
+import models
+import publish
+
+metrics.begin("line_prs_graph")
 
 GENERATE = config.getboolean("Settings", "generate_lines_of_code_pr_scatter_chart")
 
 
-with open("repo_data.json", "r") as json_file:
-    repo_data = json.load(json_file)
+repo_data = models.load_repo_data()
 
 sorted_repos = sorted(repo_data["repo_stats"], key=lambda x: x["total_python_lines"], reverse=True)
 
@@ -62,7 +65,8 @@ fig.update_layout(
 )
 
 if GENERATE:
-    fig.write_image("DataVisuals/top_lines_prs.png", width=1200, height=800)
+    with metrics.stage("render"):
+        publish.write_image(fig, "DataVisuals/top_lines_prs.png", width=1200, height=800)
     print("Lines of code and total commits scatter plot generated successfully.")
 else:
     print("Lines of code and total commits scatter plot not generated.")
@@ -1,15 +1,17 @@
-import json
-import plotly.express as px
-import pandas as pd
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from config_helper import config
+import metrics
+import models
+import publish
+import svg_charts
+
+metrics.begin("lines_graph")
 
 GENERATE = config.getboolean("Settings", "generate_lines_of_code_line_chart")
 
-with open("repo_data.json", "r") as json_file:
-    repo_data = json.load(json_file)
+repo_data = models.load_repo_data()
 
 # Sort repositories by lines of code
 sorted_repos = sorted(repo_data["repo_stats"], key=lambda x: x["total_python_lines"], reverse=True)
@@ -20,53 +22,66 @@ repo_names = [repo["repo_name"] for repo in top_repos]
 lines_of_code = [repo["total_python_lines"] for repo in top_repos]
 total_commits = [repo["total_commits"] for repo in top_repos]
 
-# Create DataFrame
-df = pd.DataFrame(
-    {"Repository Name": repo_names, "Lines of Python Code": lines_of_code, "Total Commits": total_commits}
-)
 
-# Create line chart
-fig = px.line(
-    df,
-    x="Repository Name",
-    y="Lines of Python Code",
-    line_shape="linear",  # Use linear line shape
-    text="Lines of Python Code",
-    labels={"Lines of Python Code": "Lines of Code"},  # Update y-axis label
-    template="plotly_dark",  # Use dark theme template
-)
+def png_figure():
+    # Plotly and pandas are only imported when a PNG is wanted; the SVG path starts instantly
+    import pandas as pd
+    import plotly.express as px
+
+    # Create DataFrame
+    df = pd.DataFrame(
+        {"Repository Name": repo_names, "Lines of Python Code": lines_of_code, "Total Commits": total_commits}
+    )
+
+    # Create line chart
+    fig = px.line(
+        df,
+        x="Repository Name",
+        y="Lines of Python Code",
+        line_shape="linear",  # Use linear line shape
+        text="Lines of Python Code",
+        labels={"Lines of Python Code": "Lines of Code"},  # Update y-axis label
+        template="plotly_dark",  # Use dark theme template
+    )
 
-fig.update_traces(
-    texttemplate="%{y}",
-    textposition="top center",
-)
+    fig.update_traces(
+        texttemplate="%{y}",
+        textposition="top center",
+    )
 
-fig.update_layout(
-    title="Repos by Lines of Python Code",
-    xaxis_title="Repository Name",
-    yaxis_title="Lines of Code",
-    font=dict(family="Arial, sans-serif", size=14, color="rgb(255, 255, 255)"),
-    xaxis=dict(
-        showgrid=False,
-        showticklabels=True,  # Show tick labels on x-axis
-        tickangle=-45,  # Rotate x-axis labels for better readability
-    ),
-    yaxis=dict(
-        showgrid=False,
-        showticklabels=True,  # Show tick labels on y-axis
-        zeroline=False,
-        visible=True,
-        showline=True,
-        range=[0, df["Lines of Python Code"].max() + 500],  # Increased to accommodate text labels
-    ),
-    plot_bgcolor="#22272E",
-    paper_bgcolor="#22272E",
-    margin=dict(l=40, r=40, t=100, b=0),  # Increased top margin for text labels
-)
+    fig.update_layout(
+        title="Repos by Lines of Python Code",
+        xaxis_title="Repository Name",
+        yaxis_title="Lines of Code",
+        font=dict(family="Arial, sans-serif", size=14, color="rgb(255, 255, 255)"),
+        xaxis=dict(
+            showgrid=False,
+            showticklabels=True,  # Show tick labels on x-axis
+            tickangle=-45,  # Rotate x-axis labels for better readability
+        ),
+        yaxis=dict(
+            showgrid=False,
+            showticklabels=True,  # Show tick labels on y-axis
+            zeroline=False,
+            visible=True,
+            showline=True,
+            range=[0, df["Lines of Python Code"].max() + 500],  # Increased to accommodate text labels
+        ),
+        plot_bgcolor="#22272E",
+        paper_bgcolor="#22272E",
+        margin=dict(l=40, r=40, t=100, b=0),  # Increased top margin for text labels
+    )
+    return fig
 
 
 if GENERATE:
-    fig.write_image("DataVisuals/top_lines.png", width=1200, height=800)
+    if svg_charts.WANT_SVG:
+        with metrics.stage("render_svg"):
+            svg = svg_charts.line_chart(repo_names, lines_of_code, "Repos by Lines of Python Code", y_title="Lines of Code")
+            publish.publish_text("DataVisuals/top_lines.svg", svg)
+    if svg_charts.WANT_PNG:
+        with metrics.stage("render"):
+            publish.write_image(png_figure(), "DataVisuals/top_lines.png", width=1200, height=800)
     print("Lines of code line chart generated successfully.")
 else:
     print("Lines of code line chart not generated.")
@@ -0,0 +1,59 @@
+from datetime import datetime, timezone
+import plotly.express as px
+import pandas as pd
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from config_helper import config
+import history
+import metrics
+import publish
+
+metrics.begin("lines_history_graph")
+
+GENERATE = config.getboolean("Settings", "generate_lines_history_chart", fallback=True)
+
+# Drawn from the snapshot history alone; repo_data.json is not needed
+times, lines = history.timeline(history.load_history(), "lines")
+dates = [datetime.fromtimestamp(t, tz=timezone.utc) for t in times]
+
+# Total plus the 6 repositories with the most lines today
+series = {"All repositories": [sum(values) for values in zip(*lines.values())] or [0] * len(dates)}
+for name in sorted(lines, key=lambda n: lines[n][-1], reverse=True)[:6]:
+    series[name] = lines[name]
+
+df = pd.DataFrame(
+    [{"Date": date, "Repository": name, "Lines of Python Code": values[i]}
+     for name, values in series.items() for i, date in enumerate(dates)],
+    columns=["Date", "Repository", "Lines of Python Code"],
+)
+
+fig = px.line(
+    df,
+    x="Date",
+    y="Lines of Python Code",
+    color="Repository",
+    line_shape="hv",  # totals hold until the next snapshot
+    markers=True,
+    template="plotly_dark",
+)
+
+fig.update_layout(
+    title="Lines of Python Code Over Time",
+    xaxis_title="",
+    yaxis_title="Lines of Code",
+    font=dict(family="Arial, sans-serif", size=14, color="rgb(255, 255, 255)"),
+    xaxis=dict(showgrid=False),
+    yaxis=dict(showgrid=False, zeroline=False, showline=True, rangemode="tozero"),
+    plot_bgcolor="#22272E",
+    paper_bgcolor="#22272E",
+    margin=dict(l=40, r=40, t=100, b=40),
+)
+
+
+if GENERATE and dates:
+    with metrics.stage("render"):
+        publish.write_image(fig, "DataVisuals/lines_history.png", width=1200, height=800)
+    print("Lines of code history chart generated successfully.")
+else:
+    print("Lines of code history chart not generated.")
@@ -1,10 +1,14 @@
-import json
 import plotly.express as px
 import pandas as pd
 import sys, os, math
 from datetime import datetime
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from config_helper import config  # user's config.ini
+import metrics
+import models
+import publish
+
+metrics.begin("merged_prs_stars_graph")
 
 GENERATE = config.getboolean("Settings", "generate_merged_prs", fallback=True)
 
@@ -37,8 +41,7 @@ def safe_int(x):
 
 # --- load ---
 try:
-    with open("repo_data.json", "r", encoding="utf-8") as f:
-        repo_data = json.load(f)
+    repo_data = models.load_repo_data()
 except FileNotFoundError:
     print("❌ repo_data.json not found. Run mergedprs.py first.")
     raise SystemExit(0)
@@ -133,7 +136,8 @@ fig.update_layout(
 
 if GENERATE:
     os.makedirs("DataVisuals", exist_ok=True)
-    fig.write_image("DataVisuals/merged_prs_stars.png", width=1400, height=800)
+    with metrics.stage("render"):
+        publish.write_image(fig, "DataVisuals/merged_prs_stars.png", width=1400, height=800)
     print("✅ Merged PRs stars chart generated successfully!")
     top = df.iloc[0]
     print(f"📊 Chart shows top {len(df)} PRs by repository stars")
@@ -1,17 +1,20 @@
-import json
 from collections import Counter
-import plotly.graph_objects as go
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from config_helper import config
+import metrics
+import models
+import publish
+import svg_charts
+
+metrics.begin("top_libraries_graph")
 
 GENERATE = config.getboolean("Settings", "generate_libs_used_bar_chart")
 EXCLUDED_LIBS = config.get("ExcludedLibs", "excluded_libraries")
 
 # Load repo data from JSON
-with open("repo_data.json", "r") as json_file:
-    repo_data = json.load(json_file)
+repo_data = models.load_repo_data()
 
 # Count libraries used
 library_counts = Counter()
@@ -57,40 +60,52 @@ colors = [
     "#ff4757",
 ]
 
-# Create figure for top 15 libraries
-fig = go.Figure(
-    data=[
-        go.Bar(
-            x=libraries,
-            y=counts,
-            text=counts,
-            textposition="auto",
-            marker_color=colors,
-            textfont=dict(size=18, weight="bold"),
-        )
-    ]
-)
-
 # Create title with excluded libraries info
 title_text = "Top 15 Libraries Used Across Repositories"
 if excluded_libs_list:
     title_text += f"<br><sub>Excluded: {', '.join(excluded_libs_list)}</sub>"
 
-fig.update_layout(
-    title=title_text,
-    yaxis_title="Count",
-    xaxis_tickangle=-45,
-    font=dict(family="Arial, sans-serif", size=14, color="rgb(255, 255, 255)"),
-    plot_bgcolor="#22272E",
-    paper_bgcolor="#22272E",
-    margin=dict(l=40, r=40, t=80, b=100),  # Increased top margin for longer title
-    hovermode="x unified",
-    yaxis=dict(showticklabels=False, ticks="", showgrid=False, zeroline=False),
-)
+def png_figure():
+    # Plotly is only imported when a PNG is wanted; the SVG path needs no browser
+    import plotly.graph_objects as go
+
+    # Create figure for top 15 libraries
+    fig = go.Figure(
+        data=[
+            go.Bar(
+                x=libraries,
+                y=counts,
+                text=counts,
+                textposition="auto",
+                marker_color=colors,
+                textfont=dict(size=18, weight="bold"),
+            )
+        ]
+    )
+
+    fig.update_layout(
+        title=title_text,
+        yaxis_title="Count",
+        xaxis_tickangle=-45,
+        font=dict(family="Arial, sans-serif", size=14, color="rgb(255, 255, 255)"),
+        plot_bgcolor="#22272E",
+        paper_bgcolor="#22272E",
+        margin=dict(l=40, r=40, t=80, b=100),  # Increased top margin for longer title
+        hovermode="x unified",
+        yaxis=dict(showticklabels=False, ticks="", showgrid=False, zeroline=False),
+    )
+    return fig
 
 
 if GENERATE:
-    fig.write_image("DataVisuals/top_libraries.png", width=1200, height=800)
+    if svg_charts.WANT_SVG:
+        with metrics.stage("render_svg"):
+            subtitle = f"Excluded: {', '.join(excluded_libs_list)}" if excluded_libs_list else None
+            svg = svg_charts.bar_chart(libraries, counts, "Top 15 Libraries Used Across Repositories", subtitle)
+            publish.publish_text("DataVisuals/top_libraries.svg", svg)
+    if svg_charts.WANT_PNG:
+        with metrics.stage("render"):
+            publish.write_image(png_figure(), "DataVisuals/top_libraries.png", width=1200, height=800)
     print("Top libraries graph generated successfully.")
 else:
     print("Top libraries graph not generated.")
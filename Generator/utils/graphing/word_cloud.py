@@ -1,14 +1,22 @@
-import json, re, ast, configparser
+import json, ast, configparser, hashlib
 from collections import Counter
-import plotly.express as px
 from wordcloud import WordCloud
-import numpy as np
-from PIL import Image, ImageDraw
+from PIL import Image, ImageDraw, ImageFont
 from pathlib import Path
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from config_helper import config
+import metrics
+import models
+import publish
+from word_index import tokenize, combined_counts
+
+metrics.begin("word_cloud")
+
+HISTORY = config.get("WordCloud", "history", fallback="recent").strip().lower()
+SEED = config.getint("WordCloud", "seed", fallback=42)
+CACHE_DIR = config.get("Cache", "cache_dir", fallback=".cache")
 
 # -------- config helpers --------
 def load_ignored_words_from_config():
@@ -34,40 +42,34 @@ def load_ignored_words_from_config():
     return base | extra
 
 # -------- load repo_data --------
-with open("repo_data.json", "r", encoding="utf-8") as f:
-    repo_data = json.load(f)
+repo_data = models.load_repo_data()
 
 if not repo_data.get("repo_stats"):
     print("❌ No repository data found. Please run data_scrape.py first.")
     raise SystemExit(0)  # don't fail the job—just skip
 
-# Prefer recent_commits → fallback to per-repo commit_messages
-if repo_data.get("recent_commits"):
-    all_commit_messages = " ".join(commit.get("message", "") for commit in repo_data["recent_commits"])
-else:
-    all_commit_messages = " ".join(
-        msg for repo in repo_data["repo_stats"] for msg in repo.get("commit_messages", [])
+# Prefer the scraper's precomputed per-repo word index → fallback to recent_commits
+all_word_counts = combined_counts(repo_data["repo_stats"], HISTORY)
+if not any(repo.get("word_index") for repo in repo_data["repo_stats"]):
+    all_word_counts = Counter(
+        w for commit in repo_data.get("recent_commits", []) for w in tokenize(commit.get("message", ""))
     )
 
-if not all_commit_messages.strip():
+if not all_word_counts:
     print("⚠ No commit messages found. Writing placeholder word cloud.")
     img = Image.new("RGB", (1200, 800), color="#22272E")
     ImageDraw.Draw(img).text((40, 40), "No commit messages found", fill=(255, 255, 255))
-    Path("DataVisuals").mkdir(parents=True, exist_ok=True)
-    img.save("DataVisuals/wordcloud.png")
+    publish.publish_image("DataVisuals/wordcloud.png", img)
     raise SystemExit(0)
 
-print(f"📝 Found {len(all_commit_messages.split())} raw words")
+print(f"📝 Found {sum(all_word_counts.values())} words ({HISTORY} history)")
 
 # -------- processing --------
-processed_text = re.sub(r"[^a-zA-Z\s]", " ", all_commit_messages).lower()
-tokens = [t for t in processed_text.split() if t]
-
 # Start with config-driven ignore list
 ignored = load_ignored_words_from_config()
 
 def count_words(ignored_set):
-    return Counter(w for w in tokens if w not in ignored_set and len(w) > 1)
+    return Counter({w: c for w, c in all_word_counts.items() if w not in ignored_set})
 
 word_counts = count_words(ignored)
 
@@ -82,31 +84,57 @@ if not word_counts:
     print("⚠ No words after filtering; writing placeholder.")
     img = Image.new("RGB", (1200, 800), color="#22272E")
     ImageDraw.Draw(img).text((40, 40), "Not enough meaningful words for a word cloud", fill=(255, 255, 255))
-    Path("DataVisuals").mkdir(parents=True, exist_ok=True)
-    img.save("DataVisuals/wordcloud.png")
+    publish.publish_image("DataVisuals/wordcloud.png", img)
     raise SystemExit(0)
 
 top_60 = dict(word_counts.most_common(60))
 print(f"🔤 Using {len(top_60)} words. Top: '{max(word_counts, key=word_counts.get)}'")
 
 # -------- word cloud --------
+WIDTH, HEIGHT, TITLE_HEIGHT = 1200, 800, 60
+BG = "#22272E"
+OUTPUT = Path("DataVisuals/wordcloud.png")
+LAYOUT_VERSION = 1  # bump when the rendering below changes
+
 pastel_colors = ["#f8d7da","#d4edda","#d1ecf1","#fff3cd","#f8d7da","#e2e0eb"]
-def color_func(word, **kwargs): return np.random.choice(pastel_colors)
-
-wc = WordCloud(
-    width=800, height=400, background_color="#22272E", color_func=color_func
-).generate_from_frequencies(top_60)
-
-img_arr = np.array(wc)
-fig = px.imshow(img_arr)
-fig.update_layout(
-    font=dict(family="Arial, sans-serif", size=14, color="rgb(255,255,255)"),
-    title="Top Words in Commit Messages",
-    xaxis={"visible": False}, yaxis={"visible": False},
-    margin=dict(l=0, r=0, t=30, b=0),
-    plot_bgcolor="#22272E", paper_bgcolor="#22272E",
-)
-
-Path("DataVisuals").mkdir(parents=True, exist_ok=True)
-fig.write_image("DataVisuals/wordcloud.png", width=1200, height=800)
+def color_func(word, random_state=None, **kwargs):
+    # WordCloud hands us its seeded Random, so colors are as repeatable as the layout
+    return random_state.choice(pastel_colors)
+
+# Same frequency table + settings -> same image, so reuse the previous render
+layout_key = hashlib.sha256(json.dumps({
+    "words": sorted(top_60.items()),
+    "size": [WIDTH, HEIGHT, TITLE_HEIGHT],
+    "colors": pastel_colors,
+    "seed": SEED,
+    "version": LAYOUT_VERSION,
+}).encode("utf-8")).hexdigest()[:32]
+cache_dir = Path(CACHE_DIR) / "wordcloud"
+cached = cache_dir / f"{layout_key}.png"
+
+metrics.cache("wordcloud_layout", cached.exists())
+if cached.exists():
+    publish.publish_bytes(str(OUTPUT), cached.read_bytes(), compare="pixels")
+    print("✅ Word cloud unchanged; reused cached image.")
+    raise SystemExit(0)
+
+# Lay the cloud out at its final resolution and composite the title with PIL
+with metrics.stage("render"):
+    wc = WordCloud(
+        width=WIDTH, height=HEIGHT - TITLE_HEIGHT, background_color=BG,
+        color_func=color_func, random_state=SEED,
+    ).generate_from_frequencies(top_60)
+
+    img = Image.new("RGB", (WIDTH, HEIGHT), color=BG)
+    img.paste(wc.to_image(), (0, TITLE_HEIGHT))
+    ImageDraw.Draw(img).text(
+        (20, TITLE_HEIGHT // 2), "Top Words in Commit Messages",
+        font=ImageFont.load_default(size=24), fill=(255, 255, 255), anchor="lm",
+    )
+    publish.publish_image(str(OUTPUT), img)
+
+cache_dir.mkdir(parents=True, exist_ok=True)
+for old in cache_dir.glob("*.png"):
+    old.unlink()
+img.save(cached)
 print("✅ Word cloud image created.")
@@ -0,0 +1,105 @@
+"""Append-only history of per-repository totals, for trend charts.
+
+Every full scrape adds a snapshot of each repository's Python lines, files
+and commits, how many repositories use each library, and the construct
+totals. The file is columnar: snapshot times are stored as deltas from the
+previous snapshot, and every series only keeps [snapshot index, change]
+pairs for the snapshots where its value changed. A snapshot is only added
+when something changed, so years of runs stay in the kilobytes and the
+trend charts can be drawn from this file alone.
+"""
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(__file__))
+from config_helper import config
+import publish
+
+HISTORY_PATH = config.get("History", "history_file", fallback="history.json")
+FORMAT_VERSION = 1
+GROUPS = ("lines", "files", "commits", "libraries", "constructs")
+
+
+def empty_history():
+    return {"version": FORMAT_VERSION, "times": [], "series": {group: {} for group in GROUPS}}
+
+
+def load_history(path=HISTORY_PATH):
+    if not os.path.exists(path):
+        return empty_history()
+    with open(path, "r", encoding="utf-8") as f:
+        history = json.load(f)
+    for group in GROUPS:
+        history["series"].setdefault(group, {})
+    return history
+
+
+def aggregates(repo_data):
+    """{group: {name: value}} for the current totals in repo_data."""
+    current = {group: {} for group in GROUPS}
+    for repo in repo_data["repo_stats"]:
+        name = repo["repo_name"]
+        current["lines"][name] = repo.get("total_python_lines", 0)
+        current["files"][name] = repo.get("total_python_files", 0)
+        current["commits"][name] = repo.get("total_commits", 0)
+        for library in repo.get("libraries", []):
+            current["libraries"][library] = current["libraries"].get(library, 0) + 1
+        for construct, count in (repo.get("construct_counts") or {}).items():
+            current["constructs"][construct] = current["constructs"].get(construct, 0) + count
+    return current
+
+
+def latest(column):
+    return sum(delta for _, delta in column)
+
+
+def record_snapshot(repo_data, path=HISTORY_PATH, now=None):
+    """Append repo_data's totals to the history at path if any of them changed. Returns True if written."""
+    history = load_history(path)
+    index = len(history["times"])
+    changes = []
+    for group, values in aggregates(repo_data).items():
+        series = history["series"][group]
+        # Series that disappeared (repo deleted, library dropped) fall back to zero
+        for name in set(series) | set(values):
+            delta = values.get(name, 0) - latest(series.get(name, []))
+            if delta:
+                changes.append((group, name, delta))
+    if not changes and history["times"]:
+        return False
+
+    now = int(now if now is not None else time.time())
+    history["times"].append(now - sum(history["times"]))
+    for group, name, delta in changes:
+        history["series"][group].setdefault(name, []).append([index, delta])
+    data = json.dumps(history, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return publish.publish_bytes(path, data)
+
+
+def snapshot_times(history):
+    """Absolute unix times of every snapshot."""
+    times, total = [], 0
+    for delta in history["times"]:
+        total += delta
+        times.append(total)
+    return times
+
+
+def expand(column, count):
+    """Value of a series at each of count snapshots."""
+    values, value, changes = [], 0, iter(column)
+    pending = next(changes, None)
+    for index in range(count):
+        while pending is not None and pending[0] == index:
+            value += pending[1]
+            pending = next(changes, None)
+        values.append(value)
+    return values
+
+
+def timeline(history, group):
+    """(snapshot times, {name: values per snapshot}) for one group of series."""
+    times = snapshot_times(history)
+    return times, {name: expand(column, len(times)) for name, column in history["series"][group].items()}
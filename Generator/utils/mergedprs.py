@@ -1,106 +1,280 @@
 import requests
 import json
 import configparser
+import os
+import time
+from dotenv import load_dotenv
 
 from config_helper import config
+import metrics
+import models
+
+load_dotenv()
+metrics.begin("mergedprs")
 
 USERNAME = config.get("Settings", "github_user_name")
+ACCESS_TOKEN = os.getenv("TOKEN")
+API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
+GRAPHQL_URL = os.getenv("GITHUB_GRAPHQL_URL", f"{API_URL}/graphql")
+CACHE_DIR = config.get("Cache", "cache_dir", fallback=".cache")
+INDEX_PATH = os.path.join(CACHE_DIR, "merged_prs.json")
+STAR_TTL_SECONDS = config.getint("MergedPRs", "star_ttl_hours", fallback=24) * 3600
+FETCHER = config.get("MergedPRs", "fetcher", fallback="graphql").strip().lower()
 
+MERGED_PRS_QUERY = """
+query($q: String!, $cursor: String) {
+  search(query: $q, type: ISSUE, first: 100, after: $cursor) {
+    pageInfo { hasNextPage endCursor }
+    nodes {
+      ... on PullRequest {
+        number
+        title
+        url
+        createdAt
+        closedAt
+        author { login }
+        repository { name owner { login } nameWithOwner url stargazerCount }
+      }
+    }
+  }
+}
+"""
 
-def fetch_merged_prs():
-    url = "https://api.github.com/search/issues"
 
-    # Parameters for the search query - get recent merged PRs
-    params = {
-        "q": f"is:merged state:closed author:{USERNAME} type:pr",
-        "sort": "updated",  # Sort by most recently updated
-        "order": "desc",    # Descending order
-        "per_page": 100     # Get more PRs to work with
+def api_headers():
+    headers = {
+        'User-Agent': 'GitHub-Stats-Collector',
+        'Accept': 'application/vnd.github.v3+json'
     }
+    if ACCESS_TOKEN:
+        headers['Authorization'] = f'Bearer {ACCESS_TOKEN}'
+    return headers
 
-    response = requests.get(url, params=params)
 
-    merged_prs = []
+def pr_from_search_item(item):
+    repo_url = item["html_url"].split("/pull")[0]  # URL of the repository without the pull request part
+    repo_name = repo_url.split("/")[-1]  # Extract repo name from URL
+    owner_name = repo_url.split("/")[-2]  # Extract owner name from URL
+    return {
+        "number": item["number"],
+        "title": item["title"],
+        "repository": repo_name,
+        "owner": owner_name,
+        "repo_url": repo_url,
+        "url": item["html_url"],
+        "created_at": item["created_at"],
+        "closed_at": item["closed_at"],
+        "author": item["user"]["login"],
+        "stars": 0,  # Will be populated later
+        "full_repo_name": f"{owner_name}/{repo_name}"
+    }
+
+
+def fetch_merged_prs(since=None):
+    """Page through every merged PR by USERNAME, optionally only those closed on/after `since` (YYYY-MM-DD).
+
+    Returns (merged_prs, complete); complete is False when a page failed and the listing stopped short.
+    """
+    url = f"{API_URL}/search/issues"
+
+    query = f"is:merged state:closed author:{USERNAME} type:pr"
+    if since:
+        query += f" closed:>={since}"
 
-    if response.status_code == 200:
-        data = response.json()
-        items = data["items"]
-
-        for item in items:
-            repo_url = item["html_url"].split("/pull")[0]  # URL of the repository without the pull request part
-            if USERNAME not in repo_url:
-                repo_name = repo_url.split("/")[-1]  # Extract repo name from URL
-                owner_name = repo_url.split("/")[-2]  # Extract owner name from URL
-
-                pr_info = {
-                    "number": item["number"],
-                    "title": item["title"],
-                    "repository": repo_name,
-                    "owner": owner_name,
-                    "repo_url": repo_url,
-                    "url": item["html_url"],
-                    "created_at": item["created_at"],
-                    "closed_at": item["closed_at"],
-                    "author": item["user"]["login"],
-                    "stars": 0,  # Will be populated later
-                    "full_repo_name": f"{owner_name}/{repo_name}"
-                }
+    # Parameters for the search query
+    params = {
+        "q": query,
+        "sort": "created",
+        "order": "asc",
+        "per_page": 100
+    }
+
+    merged_prs = []
+    while url:
+        response = requests.get(url, params=params, headers=api_headers())
+        if response.status_code != 200:
+            print(f"Request failed with status code {response.status_code}")
+            return merged_prs, False
 
+        for item in response.json()["items"]:
+            pr_info = pr_from_search_item(item)
+            if USERNAME not in pr_info["repo_url"]:
                 merged_prs.append(pr_info)
-    else:
-        print(f"Request failed with status code {response.status_code}")
 
-    return merged_prs
+        # The next link already carries the query, so drop params after the first page
+        url = response.links.get("next", {}).get("url")
+        params = None
+
+    return merged_prs, True
+
+
+def fetch_merged_prs_graphql(since=None):
+    """Merged PRs together with their repository's star count, 100 per GraphQL round trip.
+
+    Returns (merged_prs, stars, complete) where stars maps full_repo_name -> stargazer count
+    and complete is False when a request or page failed part way through.
+    """
+    query = f"is:merged is:pr author:{USERNAME}"
+    if since:
+        query += f" closed:>={since}"
+
+    merged_prs, stars = [], {}
+    cursor = None
+    while True:
+        response = requests.post(
+            GRAPHQL_URL,
+            json={"query": MERGED_PRS_QUERY, "variables": {"q": query, "cursor": cursor}},
+            headers=api_headers(),
+        )
+        payload = response.json() if response.status_code == 200 else {}
+        if response.status_code != 200 or payload.get("errors"):
+            print(f"GraphQL request failed with status code {response.status_code}: {payload.get('errors')}")
+            return merged_prs, stars, False
+
+        search = payload["data"]["search"]
+        for node in search["nodes"]:
+            if not node:
+                continue
+            repository = node["repository"]
+            full_name = repository["nameWithOwner"]
+            stars[full_name] = repository["stargazerCount"]
+            if USERNAME in repository["url"]:
+                continue
+            merged_prs.append({
+                "number": node["number"],
+                "title": node["title"],
+                "repository": repository["name"],
+                "owner": repository["owner"]["login"],
+                "repo_url": repository["url"],
+                "url": node["url"],
+                "created_at": node["createdAt"],
+                "closed_at": node["closedAt"],
+                "author": (node.get("author") or {}).get("login"),
+                "stars": repository["stargazerCount"],
+                "full_repo_name": full_name,
+            })
+
+        if not search["pageInfo"]["hasNextPage"]:
+            break
+        cursor = search["pageInfo"]["endCursor"]
+
+    return merged_prs, stars, True
 
 
 def fetch_star_count(repo_url):
-    repo_api_url = f'https://api.github.com/repos/{"/".join(repo_url.split("/")[-2:])}'
-    
-    # Add headers to avoid rate limiting issues
-    headers = {
-        'User-Agent': 'GitHub-Stats-Collector',
-        'Accept': 'application/vnd.github.v3+json'
-    }
-    
+    """Return the repo's stargazer count, or None if it could not be fetched."""
+    repo_api_url = f'{API_URL}/repos/{"/".join(repo_url.split("/")[-2:])}'
+
     try:
-        response = requests.get(repo_api_url, headers=headers)
+        response = requests.get(repo_api_url, headers=api_headers())
         if response.status_code == 200:
             repo_data = response.json()
             return repo_data.get("stargazers_count", 0)
         elif response.status_code == 403:
             print(f"⚠️ Rate limited while fetching stars for {repo_url}")
-            return 0
+            return None
         else:
             print(f"⚠️ Failed to fetch star count for {repo_url} with status code {response.status_code}")
-            return 0
+            return None
     except Exception as e:
         print(f"⚠️ Error fetching stars for {repo_url}: {e}")
-        return 0
+        return None
+
+
+def load_pr_index(path=INDEX_PATH):
+    """Persistent PR index: every merged PR seen so far plus per-repo star counts with fetch times."""
+    index = {"last_closed_at": None, "prs": {}, "stars": {}}
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                index.update(json.load(f))
+        except json.JSONDecodeError:
+            print("⚠️ Merged PR index is corrupted, rebuilding it")
+    return index
+
+
+def save_pr_index(index, path=INDEX_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+    os.replace(tmp, path)
+
+
+def refresh_star_counts(index, prs):
+    """Look each repository up at most once, and only when its cached count is older than the TTL."""
+    now = time.time()
+    repos = {pr["full_repo_name"]: pr["repo_url"] for pr in prs}
+    fetched = 0
+    for full_name, repo_url in repos.items():
+        cached = index["stars"].get(full_name)
+        fresh = bool(cached) and now - cached["fetched_at"] < STAR_TTL_SECONDS
+        metrics.cache("star_counts", fresh)
+        if fresh:
+            continue
+        stars = fetch_star_count(repo_url)
+        fetched += 1
+        if stars is None:
+            continue  # keep the stale count rather than overwriting it with 0
+        index["stars"][full_name] = {"stars": stars, "fetched_at": now}
+        print(f"  {full_name} - {stars} stars")
+    print(f"⭐ Refreshed stars for {fetched} of {len(repos)} repositories")
 
 
 def update_repo_data_with_merged_prs():
     print("🔍 Fetching recently merged pull requests...")
-    
-    with open("repo_data.json", "r") as f:
-        repo_data = json.load(f)
-
-    merged_prs = fetch_merged_prs()
-    print(f"📊 Found {len(merged_prs)} merged PRs")
-
-    # Fetch star count for each repository
-    print("⭐ Fetching star counts for repositories...")
-    for i, pr in enumerate(merged_prs, 1):
-        repo_url = pr.get("repo_url")
-        if repo_url:
-            stars = fetch_star_count(repo_url)
-            pr["stars"] = stars
-            print(f"  {i}/{len(merged_prs)}: {pr['full_repo_name']} - {stars} stars")
-        else:
-            pr["stars"] = 0
+
+    repo_data = models.load_repo_data()
+
+    index = load_pr_index()
+    since = index["last_closed_at"][:10] if index["last_closed_at"] else None
+
+    use_graphql = FETCHER == "graphql" and ACCESS_TOKEN
+    if FETCHER == "graphql" and not ACCESS_TOKEN:
+        print("ℹ GraphQL needs TOKEN; falling back to the REST search API")
+
+    if use_graphql:
+        # Star counts come back with the PRs, so when any cached count is stale it is
+        # cheaper to re-list everything (one call per 100 PRs) than to look repos up one by one
+        now = time.time()
+        if any(now - index["stars"].get(pr["full_repo_name"], {"fetched_at": 0})["fetched_at"] >= STAR_TTL_SECONDS
+               for pr in index["prs"].values()):
+            since = None
+        with metrics.stage("graphql_search"):
+            new_prs, stars, complete = fetch_merged_prs_graphql(since)
+        # A partial listing (search order is best match, so the gap can be anywhere) must not
+        # mark star counts fresh either, or the full re-list that would repair it never happens
+        if complete:
+            for full_name, count in stars.items():
+                index["stars"][full_name] = {"stars": count, "fetched_at": now}
+    else:
+        with metrics.stage("rest_search"):
+            new_prs, complete = fetch_merged_prs(since)
+    print(f"📊 Found {len(new_prs)} merged PRs" + (f" closed since {since}" if since else ""))
+
+    # Re-fetching the boundary day is harmless: PRs are keyed by URL
+    for pr in new_prs:
+        index["prs"][pr["url"]] = pr
+    # Results are not ordered by close date, so an unfetched page may hold PRs closed before any
+    # fetched one; the watermark only moves after a complete listing
+    if complete:
+        for pr in new_prs:
+            if not index["last_closed_at"] or pr["closed_at"] > index["last_closed_at"]:
+                index["last_closed_at"] = pr["closed_at"]
+    else:
+        print("⚠️ Merged PR listing was incomplete; the next run searches the same range again")
+
+    merged_prs = list(index["prs"].values())
+    with metrics.stage("stars"):
+        refresh_star_counts(index, merged_prs)
+    save_pr_index(index)
+
+    for pr in merged_prs:
+        pr["stars"] = index["stars"].get(pr["full_repo_name"], {}).get("stars", 0)
 
     # Sort by stars (highest first) and then by recency
     merged_prs.sort(key=lambda x: (x["stars"], x["closed_at"]), reverse=True)
-    
+
     print(f"🏆 Top 5 PRs by stars:")
     for i, pr in enumerate(merged_prs[:5], 1):
         print(f"  {i}. {pr['full_repo_name']} - {pr['stars']} stars - {pr['title'][:50]}...")
@@ -108,9 +282,8 @@ def update_repo_data_with_merged_prs():
     # Append merged PRs to repo_data dictionary
     repo_data["merged_prs"] = merged_prs
 
-    with open("repo_data.json", "w") as f:
-        json.dump(repo_data, f, indent=4)
-    
+    models.save_repo_data("repo_data.json", repo_data)
+
     print(f"💾 Saved {len(merged_prs)} merged PRs to repo_data.json")
 
 
@@ -0,0 +1,251 @@
+import atexit
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from config_helper import config
+
+ENABLED = config.getboolean("Metrics", "enabled", fallback=True)
+METRICS_PATH = config.get("Metrics", "metrics_file", fallback="run_metrics.json")
+TRACE_PATH = config.get("Metrics", "trace_file", fallback="").strip()  # Chrome trace (chrome://tracing, Perfetto)
+LOG_LEVEL = config.get("Debug", "log_level", fallback="info").strip().lower()
+RUN_ID = os.getenv("GITHUB_RUN_ID") or "local"
+
+# Collapse concrete API paths into endpoint templates so calls group sensibly
+ENDPOINT_PATTERNS = [
+    (re.compile(r"^/repos/[^/]+/[^/]+/git/blobs/[^/]+$"), "/repos/{owner}/{repo}/git/blobs/{sha}"),
+    (re.compile(r"^/repos/[^/]+/[^/]+/git/trees/[^/]+$"), "/repos/{owner}/{repo}/git/trees/{ref}"),
+    (re.compile(r"^/repos/[^/]+/[^/]+/commits/[^/]+$"), "/repos/{owner}/{repo}/commits/{sha}"),
+    (re.compile(r"^/repos/[^/]+/[^/]+/stats/([^/]+)$"), "/repos/{owner}/{repo}/stats/\\1"),
+    (re.compile(r"^/repos/[^/]+/[^/]+/([^/]+)$"), "/repos/{owner}/{repo}/\\1"),
+    (re.compile(r"^/repos/[^/]+/[^/]+$"), "/repos/{owner}/{repo}"),
+    (re.compile(r"^/(users|orgs)/[^/]+/([^/]+)$"), "/\\1/{login}/\\2"),
+    (re.compile(r"^/(users|orgs)/[^/]+$"), "/\\1/{login}"),
+]
+
+
+def is_verbose():
+    return LOG_LEVEL in ("verbose", "debug")
+
+
+def verbose(*args):
+    """print() that only shows with [Debug] log_level = verbose."""
+    if is_verbose():
+        print(*args)
+
+
+def endpoint_for(path):
+    if path.startswith("/api/v3/"):  # GitHub Enterprise prefix
+        path = path[len("/api/v3"):]
+    for pattern, template in ENDPOINT_PATTERNS:
+        if pattern.match(path):
+            return pattern.sub(template, path)
+    return path
+
+
+def bucket_for(path):
+    if "/search/" in path:
+        return "search"
+    if path.endswith("/graphql"):
+        return "graphql"
+    return "core"
+
+
+class RunMetrics:
+    """Counters and timings for one script invocation, merged into the run's metrics file on exit."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.script = None
+        self.started = time.time()
+        self.api = {}  # endpoint -> {"calls", "bytes", "seconds", "errors", "bucket"}
+        self.counters = {}
+        self.caches = {}  # name -> {"hits", "misses"}
+        self.stages = {}  # name -> {"count", "seconds"}
+        self.rate_limit_waits = {"count": 0, "seconds": 0.0}
+        self.trace = []
+
+    def api_call(self, method, path, status, nbytes, seconds, bucket=None):
+        endpoint = f"{method} {endpoint_for(path)}"
+        with self.lock:
+            entry = self.api.setdefault(endpoint, {"calls": 0, "bytes": 0, "seconds": 0.0, "errors": 0,
+                                                   "bucket": bucket or bucket_for(path)})
+            entry["calls"] += 1
+            entry["bytes"] += nbytes
+            entry["seconds"] += seconds
+            if status >= 400:
+                entry["errors"] += 1
+
+    def count(self, name, n=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def cache(self, name, hit, n=1):
+        with self.lock:
+            entry = self.caches.setdefault(name, {"hits": 0, "misses": 0})
+            entry["hits" if hit else "misses"] += n
+
+    def rate_limit_wait(self, seconds):
+        with self.lock:
+            self.rate_limit_waits["count"] += 1
+            self.rate_limit_waits["seconds"] += seconds
+
+    def add_stage(self, name, start, seconds, args=None):
+        with self.lock:
+            entry = self.stages.setdefault(name, {"count": 0, "seconds": 0.0})
+            entry["count"] += 1
+            entry["seconds"] += seconds
+            if TRACE_PATH:
+                event = {"name": name, "ph": "X", "ts": int(start * 1e6), "dur": int(seconds * 1e6),
+                         "pid": os.getpid(), "tid": threading.get_ident() % 100000, "cat": self.script}
+                if args:
+                    event["args"] = args
+                self.trace.append(event)
+
+    def api_calls(self):
+        with self.lock:
+            return sum(e["calls"] for e in self.api.values())
+
+    def summary(self):
+        elapsed = time.time() - self.started
+        calls = sum(e["calls"] for e in self.api.values())
+        by_bucket = {}
+        for entry in self.api.values():
+            by_bucket[entry["bucket"]] = by_bucket.get(entry["bucket"], 0) + entry["calls"]
+        caches = {
+            name: dict(c, hit_ratio=round(c["hits"] / (c["hits"] + c["misses"]), 3) if c["hits"] + c["misses"] else None)
+            for name, c in self.caches.items()
+        }
+        files = self.counters.get("files_analyzed", 0)
+        return {
+            "seconds": round(elapsed, 3),
+            "api_calls": calls,
+            "api_calls_by_bucket": by_bucket,
+            "bytes_downloaded": sum(e["bytes"] for e in self.api.values()),
+            "api": {k: dict(v, seconds=round(v["seconds"], 3)) for k, v in sorted(self.api.items())},
+            "rate_limit_waits": dict(self.rate_limit_waits, seconds=round(self.rate_limit_waits["seconds"], 1)),
+            "caches": caches,
+            "counters": self.counters,
+            "files_analyzed_per_second": round(files / elapsed, 2) if files and elapsed else None,
+            "stages": {k: dict(v, seconds=round(v["seconds"], 3)) for k, v in self.stages.items()},
+        }
+
+
+current = RunMetrics()
+_requests_patched = False
+
+
+def _instrument_requests():
+    """Wrap requests.Session.send so every HTTP call (ours and PyGithub's) is counted."""
+    global _requests_patched
+    if _requests_patched:
+        return
+    import requests
+    from urllib.parse import urlparse
+
+    original_send = requests.Session.send
+
+    def send(self, request, **kwargs):
+        start = time.perf_counter()
+        response = original_send(self, request, **kwargs)
+        length = response.headers.get("Content-Length")
+        if length is not None:
+            nbytes = int(length)
+        elif not kwargs.get("stream"):
+            nbytes = len(response.content)
+        else:
+            nbytes = 0  # streamed bodies report their own bytes
+        current.api_call(request.method, urlparse(request.url).path, response.status_code, nbytes,
+                         time.perf_counter() - start, response.headers.get("X-RateLimit-Resource"))
+        return response
+
+    requests.Session.send = send
+    _requests_patched = True
+
+
+def begin(script):
+    """Start collecting for this script; results are written when the process exits.
+
+    API calls are counted even when metrics are disabled: the scrape scheduler's
+    max_api_calls budget and the stored scrape costs are based on them.
+    """
+    current.script = script
+    current.started = time.time()
+    _instrument_requests()
+    if not ENABLED:
+        return
+    atexit.register(flush)
+
+
+@contextmanager
+def stage(name, **args):
+    start = time.time()
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        if ENABLED:
+            current.add_stage(name, start, time.perf_counter() - t0, args or None)
+
+
+def count(name, n=1):
+    if ENABLED:
+        current.count(name, n)
+
+
+def cache(name, hit, n=1):
+    if ENABLED:
+        current.cache(name, hit, n)
+
+
+def rate_limit_wait(seconds):
+    if ENABLED:
+        current.rate_limit_wait(seconds)
+
+
+def _read_json(path, default):
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError):
+            pass
+    return default
+
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+def flush():
+    """Merge this script's numbers into the metrics file (and trace), starting over for a new run id."""
+    if not ENABLED or not current.script:
+        return
+    data = _read_json(METRICS_PATH, {})
+    if data.get("run_id") != RUN_ID:
+        data = {"run_id": RUN_ID, "scripts": {}}
+    data["scripts"][current.script] = current.summary()
+    data["totals"] = {
+        "api_calls": sum(s["api_calls"] for s in data["scripts"].values()),
+        "bytes_downloaded": sum(s["bytes_downloaded"] for s in data["scripts"].values()),
+        "seconds": round(sum(s["seconds"] for s in data["scripts"].values()), 3),
+    }
+    _write_json(METRICS_PATH, data)
+
+    if TRACE_PATH:
+        trace = _read_json(TRACE_PATH, {})
+        if trace.get("run_id") != RUN_ID:
+            trace = {"run_id": RUN_ID, "traceEvents": []}
+        trace["traceEvents"].append({"name": "process_name", "ph": "M", "pid": os.getpid(),
+                                     "args": {"name": current.script}})
+        total = time.time() - current.started
+        trace["traceEvents"].append({"name": current.script, "ph": "X", "ts": int(current.started * 1e6),
+                                     "dur": int(total * 1e6), "pid": os.getpid(), "tid": 0})
+        trace["traceEvents"].extend(current.trace)
+        _write_json(TRACE_PATH, trace)
@@ -0,0 +1,273 @@
+"""Typed schema for repo_data.json.
+
+RepoData holds the per-repository stats, recent commits and merged PRs that
+every script reads. The dataclasses declare the schema; files are checked
+against it as plain dicts, in place, so loading costs one validation pass
+and no conversion. Saving is strict, so a writer that drifts from the
+schema fails where it saves instead of in a chart later on; loading only
+warns about (and drops) fields it doesn't know. Older files are migrated
+when loaded.
+orjson is used for reading and writing when it is installed.
+"""
+import copy
+import functools
+import hashlib
+import json
+import types
+from dataclasses import MISSING, dataclass, field, fields
+from typing import get_args, get_origin
+
+try:
+    import orjson
+except ImportError:  # optional; the standard library is only slower
+    orjson = None
+
+SCHEMA_VERSION = 2
+OUTPUT_PATH = "repo_data.json"
+# RepoStats fields that change on every scrape; a save that differs only in these is no reason to commit
+VOLATILE_FIELDS = ("scraped_at", "scrape_cost")
+
+
+class SchemaError(ValueError):
+    pass
+
+
+def _allowed(annotation):
+    """Types accepted for a field annotated with annotation (int, list, str | None, ...)."""
+    if isinstance(annotation, types.UnionType):
+        return tuple(t for arg in get_args(annotation) for t in _allowed(arg))
+    if annotation is type(None):
+        return (type(None),)
+    if annotation is float:
+        return (int, float)
+    return (get_origin(annotation) or annotation,)
+
+
+class Record:
+    """Mixin turning a slotted dataclass into a schema for plain dicts.
+
+    check() validates a dict in place; from_dict()/to_dict() convert to and
+    from the dataclass for code that wants typed records.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def check(cls, raw, where=None, ignored=None):
+        """Validate raw against the schema in place, filling in defaults for missing fields, and return it.
+
+        Unknown fields raise SchemaError, unless ignored is a set: then they are
+        dropped and their "Class.field" names added to it.
+        """
+        where = where or cls.__name__
+        if not isinstance(raw, dict):
+            raise SchemaError(f"{where}: expected an object, got {type(raw).__name__}")
+        schema = _schema(cls)
+        unknown = raw.keys() - schema.keys()
+        if unknown:
+            if ignored is None:
+                raise SchemaError(f"{where}: unknown field(s) {', '.join(sorted(unknown))}")
+            for name in unknown:
+                del raw[name]
+                ignored.add(f"{cls.__name__}.{name}")
+        for name, (annotation, allowed, default, nested) in schema.items():
+            if name not in raw:
+                if default is None:
+                    raise SchemaError(f"{where}: missing field {name}")
+                raw[name] = default()
+                continue
+            value = raw[name]
+            if nested and isinstance(value, list):
+                for i, item in enumerate(value):
+                    nested.check(item, f"{where}.{name}[{i}]", ignored)
+            elif not isinstance(value, allowed) or (isinstance(value, bool) and annotation is int):
+                raise SchemaError(f"{where}.{name}: expected {annotation}, got {type(value).__name__}")
+        return raw
+
+    @classmethod
+    def from_dict(cls, raw, where=None):
+        checked = cls.check(dict(raw) if isinstance(raw, dict) else raw, where)
+        values = {}
+        for name, (_annotation, _allowed, _default, nested) in _schema(cls).items():
+            value = checked[name]
+            if nested and isinstance(value, list):
+                value = [nested.from_dict(item) for item in value]
+            values[name] = value
+        return cls(**values)
+
+    def to_dict(self):
+        out = {}
+        for f in fields(self):
+            value = getattr(self, f.name)
+            if (type(self), f.name) in NESTED and value is not None:
+                value = [item.to_dict() for item in value]
+            out[f.name] = value
+        return out
+
+
+@functools.cache
+def _schema(cls):
+    """{field name: (annotation, allowed types, default factory or None, nested record type)}."""
+    schema = {}
+    for f in fields(cls):
+        if f.default is not MISSING:
+            default = functools.partial(copy.copy, f.default)
+        elif f.default_factory is not MISSING:
+            default = f.default_factory
+        else:
+            default = None
+        schema[f.name] = (f.type, _allowed(f.type), default, NESTED.get((cls, f.name)))
+    return schema
+
+
+@dataclass(slots=True)
+class RepoStats(Record):
+    repo_name: str
+    total_commits: int
+    python_files: list = field(default_factory=list)
+    libraries: list = field(default_factory=list)
+    total_python_files: int = 0
+    total_python_lines: int = 0
+    file_extensions: dict = field(default_factory=dict)
+    scraped_at: str | None = None
+    commit_times: list = field(default_factory=list)  # [weekday, hour] per commit
+    commit_time_counts: list = field(default_factory=list)  # [weekday, hour, count] from the punch card
+    word_index: dict | None = None
+    analysis: dict = field(default_factory=dict)
+    construct_counts: dict = field(default_factory=dict)
+    scrape_cost: dict | None = None  # {"seconds", "api_calls"} the last scrape took (see scheduler.py)
+
+
+@dataclass(slots=True)
+class RecentCommit(Record):
+    repo_name: str
+    repo_url: str
+    sha: str
+    message: str
+    author: str | None
+    date: str
+    additions: int | None = None
+    deletions: int | None = None
+    total_changes: int | None = None
+
+
+@dataclass(slots=True)
+class MergedPR(Record):
+    number: int
+    title: str
+    repository: str
+    owner: str
+    repo_url: str
+    url: str
+    created_at: str
+    closed_at: str
+    author: str | None
+    stars: int
+    full_repo_name: str
+
+
+@dataclass(slots=True)
+class RepoData(Record):
+    schema_version: int = SCHEMA_VERSION
+    repo_stats: list = field(default_factory=list)
+    commit_counts: dict = field(default_factory=dict)  # weekday name -> {hour: count}
+    construct_counts: list = field(default_factory=list)  # unused; kept for older readers
+    recent_commits: list = field(default_factory=list)
+    merged_prs: list | None = None  # added by mergedprs.py
+
+
+# (class, field) -> record type of the list's items
+NESTED = {
+    (RepoData, "repo_stats"): RepoStats,
+    (RepoData, "recent_commits"): RecentCommit,
+    (RepoData, "merged_prs"): MergedPR,
+}
+
+
+# ===== Migrations =====
+
+def _migrate_0(raw):
+    """Layout before schema_version: drop the never-filled commit_messages, sort libraries."""
+    for repo in raw.get("repo_stats", []):
+        repo.pop("commit_messages", None)
+        repo["libraries"] = sorted(set(repo.get("libraries", [])))
+    return raw
+
+
+def _migrate_1(raw):
+    """Drop recent_commits repeated by older scrapes that re-added a repository's commits."""
+    seen = set()
+    commits = []
+    for commit in raw.get("recent_commits", []):
+        key = (commit.get("repo_name"), commit.get("sha"))
+        if key not in seen:
+            seen.add(key)
+            commits.append(commit)
+    raw["recent_commits"] = commits
+    return raw
+
+
+# schema_version -> function upgrading a file of that version to the next one
+MIGRATIONS = {0: _migrate_0, 1: _migrate_1}
+
+
+def migrate(raw):
+    version = raw.get("schema_version", 0)
+    if version > SCHEMA_VERSION:
+        raise SchemaError(f"repo_data schema_version {version} is newer than this generator ({SCHEMA_VERSION})")
+    while version < SCHEMA_VERSION:
+        raw = MIGRATIONS[version](raw)
+        version += 1
+    raw["schema_version"] = SCHEMA_VERSION
+    return raw
+
+
+# ===== Encoding =====
+
+def decode(data):
+    """Checked repo_data dict from the bytes of a repo_data.json of any schema version."""
+    raw = orjson.loads(data) if orjson else json.loads(data)
+    if not isinstance(raw, dict):
+        raise SchemaError("repo_data: expected an object")
+    ignored = set()
+    RepoData.check(migrate(raw), ignored=ignored)
+    if ignored:
+        print(f"⚠️ repo_data: ignoring unknown field(s) {', '.join(sorted(ignored))}")
+    return raw
+
+
+def encode(repo_data):
+    if orjson:
+        return orjson.dumps(repo_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(repo_data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def stable_digest(repo_data):
+    """Hash of repo_data without VOLATILE_FIELDS."""
+    stable = dict(repo_data, repo_stats=[{k: v for k, v in repo.items() if k not in VOLATILE_FIELDS}
+                                         for repo in repo_data["repo_stats"]])
+    return hashlib.sha256(encode(stable)).hexdigest()
+
+
+def load_repo_data(path=OUTPUT_PATH):
+    """repo_data.json as plain dicts, checked against the schema and migrated to the current version."""
+    with open(path, "rb") as f:
+        return decode(f.read())
+
+
+def save_repo_data(path, repo_data):
+    """Check repo_data (a dict) against the schema and write it atomically.
+
+    The write is recorded in the publish report, as a change only when more
+    than VOLATILE_FIELDS differ from the file this run started with.
+    """
+    import publish  # Pillow is only needed here, not by the readers
+
+    def baseline():
+        try:
+            return stable_digest(load_repo_data(path))
+        except (ValueError, OSError):  # unreadable (JSONDecodeError and SchemaError are ValueErrors): a change
+            return None
+
+    checked = RepoData.check(dict(repo_data, schema_version=SCHEMA_VERSION))
+    publish.publish_state(path, encode(checked), stable_digest(checked), baseline)
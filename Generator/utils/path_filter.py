@@ -0,0 +1,95 @@
+"""gitignore-style path matching, compiled into a single regular expression.
+
+Patterns follow .gitignore: "name/" only matches directories, a pattern with
+a slash before its end is anchored to the repository root, "*" and "?" stay
+within one path segment, "**" crosses segments and "!pattern" re-includes.
+As in git, the last pattern that matches a path decides.
+"""
+import re
+
+# linguist attributes that keep a path out of GitHub's language statistics
+LINGUIST_ATTRIBUTES = ("linguist-vendored", "linguist-generated")
+
+
+def glob_to_regex(glob):
+    out, i = [], 0
+    while i < len(glob):
+        if glob.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif glob.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif glob[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif glob[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif glob[i] == "[" and "]" in glob[i + 2:]:
+            end = glob.index("]", i + 2)
+            body = glob[i + 1:end]
+            out.append("[" + ("^" + body[1:] if body[0] == "!" else body).replace("\\", "\\\\") + "]")
+            i = end + 1
+        else:
+            out.append(re.escape(glob[i]))
+            i += 1
+    return "".join(out)
+
+
+def pattern_to_regex(pattern):
+    """Regex for one (non-negated) pattern, matched against "file/path" or "dir/path/"."""
+    directory_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+    anchored = "/" in pattern
+    body = glob_to_regex(pattern.lstrip("/"))
+    prefix = "" if anchored else "(?:.*/)?"
+    # A match on a directory covers everything below it
+    return prefix + body + ("/.*" if directory_only else "(?:/.*)?")
+
+
+class PathMatcher:
+    """Decides whether repository paths are excluded by an ordered list of gitignore-style patterns."""
+
+    def __init__(self, patterns=()):
+        self.patterns = [p.strip() for p in patterns if p.strip() and not p.strip().startswith("#")]
+        alternatives = []
+        # Alternation tries left to right, so listing the patterns in reverse lets the last match win
+        for index in reversed(range(len(self.patterns))):
+            pattern = self.patterns[index]
+            negated = pattern.startswith("!")
+            group = f"{'keep' if negated else 'skip'}{index}"
+            alternatives.append(f"(?P<{group}>{pattern_to_regex(pattern[1:] if negated else pattern)})")
+        self.regex = re.compile("|".join(alternatives)) if alternatives else None
+
+    def extend(self, patterns):
+        return PathMatcher(self.patterns + list(patterns))
+
+    def excluded(self, path):
+        if self.regex is None:
+            return False
+        match = self.regex.fullmatch(path.replace("\\", "/").lstrip("/"))
+        return bool(match) and match.lastgroup.startswith("skip")
+
+    def dir_excluded(self, path):
+        return self.excluded(path.replace("\\", "/").rstrip("/") + "/")
+
+
+def gitattributes_patterns(text):
+    """Exclusion patterns for the paths a .gitattributes file marks vendored or generated.
+
+    "-linguist-vendored" and "linguist-vendored=false" turn into re-includes.
+    """
+    patterns = []
+    for line in text.splitlines():
+        fields = line.split()
+        if not fields or fields[0].startswith("#"):
+            continue
+        path, attributes = fields[0], fields[1:]
+        for attribute in attributes:
+            name, _, value = attribute.lstrip("-!").partition("=")
+            if name not in LINGUIST_ATTRIBUTES:
+                continue
+            unset = attribute.startswith(("-", "!")) or value.lower() == "false"
+            patterns.append(("!" if unset else "") + path)
+    return patterns
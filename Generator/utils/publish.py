@@ -0,0 +1,177 @@
+"""Write generated artifacts only when they actually changed.
+
+Charts, the GIF and the README section are compared with what is already on
+disk: PNGs by decoded pixels (so encoder metadata doesn't count), other files
+by hash, and the README with the "Data last generated on" line ignored. An
+unchanged artifact is left untouched, so git sees no diff for it.
+
+State that later runs build on (repo_data.json) is always written, but
+only counts as a change when it differs from how the run found it beyond
+fields that change on every scrape.
+
+Every publish is recorded in the run's report file. Running this module
+prints the report and, inside GitHub Actions, sets the step output
+changed=true/false so the commit step can be skipped:
+
+    python Generator/utils/publish.py
+"""
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import time
+from contextlib import contextmanager
+
+from PIL import Image
+
+sys.path.append(os.path.dirname(__file__))
+from config_helper import config
+from metrics import RUN_ID
+
+REPORT_PATH = config.get("Publish", "report_file", fallback="publish_report.json")
+# Local runs all share the run id "local"; a local report left alone this long belongs to an earlier run
+LOCAL_RUN_GAP_SECONDS = config.getfloat("Publish", "local_run_gap_minutes", fallback=30) * 60
+README_VOLATILE = re.compile(r"^### Data last generated on:")
+
+# Folder the report lives in and recorded paths are relative to (the profile repo, or one batch account)
+_root = "."
+
+
+@contextmanager
+def reporting_to(directory):
+    """Record publishes in directory's report, as that directory's own scripts would (batch accounts)."""
+    global _root
+    previous, _root = _root, directory
+    try:
+        yield
+    finally:
+        _root = previous
+
+
+def _report_path():
+    return os.path.join(_root, REPORT_PATH)
+
+
+def _read_report():
+    report_path = _report_path()
+    if os.path.exists(report_path):
+        try:
+            with open(report_path, "r", encoding="utf-8") as f:
+                report = json.load(f)
+            stale = RUN_ID == "local" and time.time() - report.get("updated_at", 0) > LOCAL_RUN_GAP_SECONDS
+            if report.get("run_id") == RUN_ID and not stale:
+                return report
+        except (json.JSONDecodeError, OSError):
+            pass
+    return {"run_id": RUN_ID, "written": [], "unchanged": [], "baselines": {}}
+
+
+def _write_report(report):
+    report["updated_at"] = time.time()
+    report_path = _report_path()
+    tmp = report_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    os.replace(tmp, report_path)
+
+
+def _record(path, written, report=None):
+    path = os.path.relpath(path, _root)
+    report = report or _read_report()
+    for key in ("written", "unchanged"):
+        if path in report[key]:
+            report[key].remove(path)
+    report["written" if written else "unchanged"].append(path)
+    _write_report(report)
+
+
+def _same_pixels(path, data):
+    try:
+        with Image.open(path) as old, Image.open(io.BytesIO(data)) as new:
+            return old.size == new.size and old.convert("RGBA").tobytes() == new.convert("RGBA").tobytes()
+    except OSError:
+        return False
+
+
+def _same_hash(path, data):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).digest() == hashlib.sha256(data).digest()
+
+
+def publish_bytes(path, data, compare="hash"):
+    """Write data to path unless the existing file is equivalent. Returns True if written."""
+    if os.path.exists(path):
+        same = _same_pixels(path, data) if compare == "pixels" else _same_hash(path, data)
+        if same:
+            _record(path, False)
+            return False
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    _record(path, True)
+    return True
+
+
+def publish_state(path, data, digest, baseline):
+    """Write data to path every time; report it as changed only if digest differs from the run's start.
+
+    digest identifies the content that matters (volatile fields left out), and
+    baseline() computes the same for the file as it was, the first time this
+    run saves it.
+    """
+    report = _read_report()
+    baselines = report.setdefault("baselines", {})
+    key = os.path.relpath(path, _root)
+    if key not in baselines:
+        baselines[key] = baseline() if os.path.exists(path) else None
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    _record(path, digest != baselines[key], report)
+    return True
+
+
+def publish_image(path, image):
+    """Publish a PIL image as PNG, compared by pixels."""
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return publish_bytes(path, buffer.getvalue(), compare="pixels")
+
+
+def write_image(fig, path, **kwargs):
+    """Drop-in for fig.write_image(path, ...) that only touches the file when the chart looks different."""
+    return publish_bytes(path, fig.to_image(format="png", **kwargs), compare="pixels")
+
+
+def publish_text(path, text, volatile=None):
+    """Write text unless it only differs from the current file on lines matching volatile."""
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            old = f.read()
+        strip = (lambda s: [line for line in s.splitlines() if not volatile.match(line)]) if volatile else str.splitlines
+        if strip(old) == strip(text):
+            _record(path, False)
+            return False
+    return publish_bytes(path, text.encode("utf-8"))
+
+
+def main():
+    report = _read_report()
+    changed = bool(report["written"])
+    for path in report["written"]:
+        print(f"✏️  {path}")
+    print(f"{len(report['written'])} artifact(s) changed, {len(report['unchanged'])} unchanged")
+    if not changed:
+        print("Nothing to publish; no commit needed.")
+    if os.getenv("GITHUB_OUTPUT"):
+        with open(os.environ["GITHUB_OUTPUT"], "a", encoding="utf-8") as f:
+            f.write(f"changed={'true' if changed else 'false'}\n")
+
+
+if __name__ == "__main__":
+    main()
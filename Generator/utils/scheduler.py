@@ -0,0 +1,79 @@
+"""Orders a scrape by recent activity and stops it before its budget runs out.
+
+Repositories are scraped most recently pushed first. Each one's cost is
+estimated from what its last scrape took (scrape_cost in repo_data.json);
+when the next repository would not fit in what is left of [Schedule]
+max_minutes or max_api_calls, the run stops there and the remaining
+repositories keep their last known data until a later run reaches them.
+"""
+import statistics
+import time
+from datetime import datetime, timezone
+from config_helper import config
+import metrics
+
+# 0 means no limit; both count from the start of the script
+MAX_MINUTES = config.getfloat("Schedule", "max_minutes", fallback=0)
+MAX_API_CALLS = config.getint("Schedule", "max_api_calls", fallback=0)
+
+NEVER_PUSHED = datetime.min.replace(tzinfo=timezone.utc)
+
+
+def pushed_order(repos):
+    """Most recently pushed first; ties keep the API's order."""
+    def pushed(repo):
+        return repo.pushed_at.replace(tzinfo=timezone.utc) if repo.pushed_at else NEVER_PUSHED
+    return sorted(repos, key=pushed, reverse=True)
+
+
+class Scheduler:
+    """Decides, repository by repository, whether the next scrape still fits in the budget."""
+
+    def __init__(self, repo_stats, max_minutes=MAX_MINUTES, max_api_calls=MAX_API_CALLS):
+        self.max_seconds = max_minutes * 60
+        self.max_api_calls = max_api_calls
+        self.costs = {r["repo_name"]: r["scrape_cost"] for r in repo_stats if r.get("scrape_cost")}
+        # Repositories never scraped before are assumed to cost what a typical one does
+        known = list(self.costs.values())
+        self.typical = {
+            "seconds": statistics.median(c["seconds"] for c in known) if known else 0.0,
+            "api_calls": statistics.median(c["api_calls"] for c in known) if known else 0,
+        }
+        self.stopped = None  # reason the run stopped early
+        self.deferred = []
+
+    def estimate(self, name):
+        return self.costs.get(name, self.typical)
+
+    def fits(self, name):
+        """True if scraping name now stays within the budget, otherwise records why the run stops."""
+        cost = self.estimate(name)
+        elapsed = time.time() - metrics.current.started
+        calls = metrics.current.api_calls()
+        if self.max_seconds and elapsed + cost["seconds"] > self.max_seconds:
+            self.stopped = f"{elapsed / 60:.1f} of {self.max_seconds / 60:g} minutes used"
+        elif self.max_api_calls and calls + cost["api_calls"] > self.max_api_calls:
+            self.stopped = f"{calls} of {self.max_api_calls} API calls used"
+        return self.stopped is None
+
+    def defer(self, names):
+        self.deferred.extend(names)
+
+    def report(self):
+        if not self.deferred:
+            return
+        metrics.count("repos_deferred", len(self.deferred))
+        print(f"⏳ Budget reached ({self.stopped}); {len(self.deferred)} less recently pushed repos "
+              f"keep their last data: {', '.join(self.deferred)}")
+
+
+def scrape_cost(started, calls_before, spent=None):
+    """What one repository's scrape took, stored with it for the next run's estimates.
+
+    spent is what earlier, interrupted runs already put into the same scrape.
+    """
+    spent = spent or {"seconds": 0, "api_calls": 0}
+    return {
+        "seconds": round(spent["seconds"] + time.time() - started, 2),
+        "api_calls": spent["api_calls"] + metrics.current.api_calls() - calls_before,
+    }
@@ -0,0 +1,104 @@
+"""Bar and line charts written directly as SVG.
+
+The simple charts don't need Plotly and a headless browser: these functions
+emit the same dark theme as small, crisp SVG text in a few milliseconds.
+[Settings] chart_format picks png (Plotly/Kaleido), svg or both, and
+[Readme] visuals = svg embeds the SVGs in the README instead of the GIF.
+"""
+import math
+import os
+import sys
+from xml.sax.saxutils import escape
+
+sys.path.append(os.path.dirname(__file__))
+from config_helper import config
+
+CHART_FORMAT = config.get("Settings", "chart_format", fallback="png").strip().lower()
+WANT_PNG = CHART_FORMAT in ("png", "both")
+WANT_SVG = CHART_FORMAT in ("svg", "both")
+
+BACKGROUND = "#22272E"
+TEXT = "#ffffff"
+FONT = "Arial, sans-serif"
+COLORS = [
+    "#ff6f61", "#a4e4b1", "#ffb347", "#4ecdc4", "#d1ccc0", "#ff6b6b", "#6ab04c", "#d6a2e8",
+    "#ff9ff3", "#7bed9f", "#feca57", "#1abc9c", "#ff6348", "#686de0", "#ff4757",
+]
+LINE_COLOR = "#636efa"  # Plotly's first trace color, as used by the PNG line chart
+
+
+def _text(x, y, content, size=14, anchor="middle", weight=None, rotate=None, fill=TEXT):
+    attrs = f'x="{x:.1f}" y="{y:.1f}" font-size="{size}" text-anchor="{anchor}" fill="{fill}"'
+    if weight:
+        attrs += f' font-weight="{weight}"'
+    if rotate:
+        attrs += f' transform="rotate({rotate} {x:.1f} {y:.1f})"'
+    return f"<text {attrs}>{escape(str(content))}</text>"
+
+
+def _document(width, height, title, subtitle, body):
+    head = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" font-family="{FONT}">',
+        f'<rect width="{width}" height="{height}" fill="{BACKGROUND}"/>',
+        _text(40, 40, title, size=20, anchor="start"),
+    ]
+    if subtitle:
+        head.append(_text(40, 64, subtitle, size=13, anchor="start"))
+    return "\n".join(head + body + ["</svg>", ""])
+
+
+def _nice_step(span, ticks=5):
+    raw = span / ticks
+    magnitude = 10 ** math.floor(math.log10(raw)) if raw > 0 else 1
+    return next(m * magnitude for m in (1, 2, 2.5, 5, 10) if m * magnitude >= raw)
+
+
+def bar_chart(labels, values, title, subtitle=None, y_title="Count", colors=COLORS, width=1200, height=800):
+    """Vertical bars with the value on each bar and labels rotated under the axis."""
+    left, right, top, bottom = 60, 40, 100 if subtitle else 80, 140
+    plot_w, plot_h = width - left - right, height - top - bottom
+    peak = max(values, default=0) or 1
+    slot = plot_w / max(len(values), 1)
+    body = [_text(24, top + plot_h / 2, y_title, rotate=-90)]
+    for i, (label, value) in enumerate(zip(labels, values)):
+        bar_h = plot_h * value / peak
+        x = left + i * slot + slot * 0.1
+        y = top + plot_h - bar_h
+        center = x + slot * 0.4
+        body.append(f'<rect x="{x:.1f}" y="{y:.1f}" width="{slot * 0.8:.1f}" height="{bar_h:.1f}" '
+                    f'fill="{colors[i % len(colors)]}"/>')
+        # Inside the bar when it is tall enough, otherwise just above it
+        inside = bar_h > 28
+        body.append(_text(center, y + 20 if inside else y - 6, value, weight="bold",
+                          fill="#22272E" if inside else TEXT))
+        body.append(_text(center, top + plot_h + 16, label, anchor="end", rotate=-45))
+    return _document(width, height, title, subtitle, body)
+
+
+def line_chart(labels, values, title, subtitle=None, y_title="", width=1200, height=800, headroom=500):
+    """Categorical line chart with markers, the value above each point and a labelled y axis."""
+    left, right, top, bottom = 90, 40, 100, 160
+    plot_w, plot_h = width - left - right, height - top - bottom
+    ceiling = max(values, default=0) + headroom
+    step = _nice_step(ceiling)
+    slot = plot_w / max(len(values), 1)
+    points = [(left + slot * (i + 0.5), top + plot_h * (1 - value / ceiling)) for i, value in enumerate(values)]
+
+    body = [
+        _text(24, top + plot_h / 2, y_title, rotate=-90),
+        f'<line x1="{left}" y1="{top}" x2="{left}" y2="{top + plot_h}" stroke="{TEXT}" stroke-width="1"/>',
+    ]
+    tick = 0
+    while tick <= ceiling:
+        y = top + plot_h * (1 - tick / ceiling)
+        body.append(_text(left - 8, y + 5, f"{tick:g}", size=12, anchor="end"))
+        tick += step
+    if points:
+        path = " ".join(f"{x:.1f},{y:.1f}" for x, y in points)
+        body.append(f'<polyline points="{path}" fill="none" stroke="{LINE_COLOR}" stroke-width="2"/>')
+    for (x, y), label, value in zip(points, labels, values):
+        body.append(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="4" fill="{LINE_COLOR}"/>')
+        body.append(_text(x, y - 10, value))
+        body.append(_text(x, top + plot_h + 16, label, anchor="end", rotate=-45))
+    return _document(width, height, title, subtitle, body)
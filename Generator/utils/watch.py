@@ -0,0 +1,277 @@
+"""Keep a profile up to date from push events instead of full rebuilds.
+
+    WEBHOOK_SECRET=... TOKEN=... python PyProfileDataGen/Generator/utils/watch.py --port 8080
+
+Run it from the profile repo (like the workflow does). It accepts GitHub
+push webhooks on POST /webhook (signed with WEBHOOK_SECRET) and manual
+triggers on POST /refresh with {"repository": "name"}. Events arriving
+close together are coalesced; then only the pushed repositories are
+re-scraped into repo_data.json, and only the charts whose inputs changed
+are re-rendered, followed by the GIF and README. With --commit the changed
+artifacts are committed and pushed.
+
+It listens on 127.0.0.1 unless told otherwise ([Watch] host or --host), and
+refuses to start without WEBHOOK_SECRET unless --allow-unsigned is given.
+"""
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from github import Github
+from github.GithubException import GithubException
+
+sys.path.append(os.path.dirname(__file__))
+from config_helper import config
+import data_scrape
+import history
+import metrics
+
+UTILS = os.path.dirname(os.path.abspath(__file__))
+GENERATOR = os.path.dirname(UTILS)
+
+HOST = config.get("Watch", "host", fallback="127.0.0.1")
+PORT = config.getint("Watch", "port", fallback=8080)
+QUIET_SECONDS = config.getfloat("Watch", "quiet_seconds", fallback=10)
+MAX_WAIT_SECONDS = config.getfloat("Watch", "max_wait_seconds", fallback=60)
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET", "")
+PUBLISH_REPORT = config.get("Publish", "report_file", fallback="publish_report.json")
+
+# Fields history.aggregates() snapshots; a change in any of them adds a point to every history chart
+HISTORY_INPUTS = ("total_python_lines", "total_python_files", "total_commits", "libraries", "construct_counts")
+
+# Chart script -> repo_info fields it is drawn from
+CHART_INPUTS = {
+    # commit_counts is rebuilt from per-commit times, or the punch card rows in stats mode
+    "commit_heatmap.py": ("commit_times", "commit_time_counts"),
+    "word_cloud.py": ("word_index",),
+    "lines_graph.py": ("total_python_lines",),
+    "line_prs_graph.py": ("total_python_lines", "total_commits"),
+    "construct_counts_graph.py": ("construct_counts",),
+    "top_libraries_graph.py": ("libraries",),
+    "file_types_bar_graph.py": ("file_extensions",),
+    "lines_history_graph.py": HISTORY_INPUTS,
+    "libraries_history_graph.py": HISTORY_INPUTS,
+}
+
+
+class Coalescer:
+    """Collects repository names and hands them over once events stop arriving for quiet seconds
+    (or max_wait seconds after the first one), so a burst of pushes becomes one refresh."""
+
+    def __init__(self, quiet, max_wait):
+        self.quiet = quiet
+        self.max_wait = max_wait
+        self.cond = threading.Condition()
+        self.pending = set()
+        self.first_at = None
+        self.last_at = None
+
+    def add(self, name):
+        with self.cond:
+            now = time.monotonic()
+            self.pending.add(name)
+            self.first_at = self.first_at or now
+            self.last_at = now
+            self.cond.notify()
+
+    def take(self):
+        """Block until a batch is due and return it."""
+        with self.cond:
+            while True:
+                if self.pending:
+                    now = time.monotonic()
+                    due = min(self.last_at + self.quiet, self.first_at + self.max_wait)
+                    if now >= due:
+                        batch, self.pending = self.pending, set()
+                        self.first_at = self.last_at = None
+                        return batch
+                    self.cond.wait(due - now)
+                else:
+                    self.cond.wait()
+
+
+def verify_signature(body, header):
+    if not WEBHOOK_SECRET:
+        return True
+    expected = "sha256=" + hmac.new(WEBHOOK_SECRET.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, header or "")
+
+
+def make_handler(coalescer, owner):
+    class Handler(BaseHTTPRequestHandler):
+        def reply(self, status, message):
+            payload = json.dumps({"message": message}).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            if not verify_signature(body, self.headers.get("X-Hub-Signature-256")):
+                return self.reply(401, "bad signature")
+            try:
+                payload = json.loads(body or b"{}")
+            except json.JSONDecodeError:
+                return self.reply(400, "invalid JSON")
+
+            if self.path == "/refresh":
+                name = payload.get("repository")
+                if not name:
+                    return self.reply(400, "repository is required")
+                coalescer.add(name)
+                return self.reply(202, f"queued {name}")
+
+            if self.path != "/webhook":
+                return self.reply(404, "not found")
+            event = self.headers.get("X-GitHub-Event", "push")
+            if event == "ping":
+                return self.reply(200, "pong")
+            if event != "push":
+                return self.reply(202, f"ignored {event} event")
+            repository = payload.get("repository") or {}
+            if (repository.get("owner") or {}).get("login", owner) != owner:
+                return self.reply(202, "ignored: not owned by the profile user")
+            if payload.get("ref") != f"refs/heads/{repository.get('default_branch', 'main')}":
+                return self.reply(202, "ignored: not the default branch")
+            coalescer.add(repository["name"])
+            return self.reply(202, f"queued {repository['name']}")
+
+        def log_message(self, fmt, *args):
+            metrics.verbose(fmt % args)
+
+    return Handler
+
+
+def charts_to_render(before, after):
+    """Chart scripts whose inputs differ between two repo_info dicts (None = repo added or removed)."""
+    if before is None or after is None:
+        return set(CHART_INPUTS)
+    return {script for script, fields in CHART_INPUTS.items()
+            if any(before.get(field) != after.get(field) for field in fields)}
+
+
+def refresh(names, user):
+    """Re-scrape names into repo_data.json; return the chart scripts that need re-rendering."""
+    repo_data = data_scrape.load_existing(data_scrape.OUTPUT_PATH)
+    name_to_index = {r.get("repo_name"): idx for idx, r in enumerate(repo_data["repo_stats"])}
+    charts = set()
+    for name in sorted(names):
+        try:
+            repo = data_scrape.safe_github_call(data_scrape.g.get_repo, f"{user.login}/{name}")
+        except GithubException as e:
+            print(f"⚠️ Could not load {name}: {e}")
+            continue
+        # A push means the stored data is stale, so overwrite_existing doesn't apply here
+        if data_scrape.should_skip_repo(repo, user, {}):
+            continue
+        before = repo_data["repo_stats"][name_to_index[name]] if name in name_to_index else None
+        # Round-trip through JSON so the comparison sees what is stored (tuples vs lists, etc.)
+        before = json.loads(json.dumps(before)) if before else None
+        with metrics.stage("repo", repo=name):
+            result = data_scrape.process_repo(repo, user, before)
+        if result is None:
+            continue
+        repo_info, recent_commits = result
+        data_scrape.merge_repo_result(repo_data, name_to_index, repo_info, recent_commits)
+        data_scrape.atomic_save(data_scrape.OUTPUT_PATH, repo_data)
+        charts |= charts_to_render(before, json.loads(json.dumps(repo_info)))
+        print(f"🔄 Refreshed {name}")
+    history.record_snapshot(repo_data)
+    if data_scrape.get_memo():
+        data_scrape.get_memo().commit()
+    return charts
+
+
+def render(charts, run_id):
+    """Run the impacted chart scripts, then the GIF and README; return the artifacts that were rewritten."""
+    env = dict(os.environ, GITHUB_RUN_ID=run_id)
+    scripts = [os.path.join(UTILS, "graphing", script) for script in sorted(charts)]
+    scripts += [os.path.join(UTILS, "gifmaker.py"), os.path.join(GENERATOR, "readme.py")]
+    for script in scripts:
+        result = subprocess.run([sys.executable, script], env=env, stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT, text=True)
+        if result.returncode != 0:
+            print(f"❌ {os.path.basename(script)} failed\n{result.stdout}")
+    try:
+        with open(PUBLISH_REPORT, "r", encoding="utf-8") as f:
+            report = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return []
+    return report["written"] if report.get("run_id") == run_id else []
+
+
+def commit_and_push(written):
+    subprocess.run(["git", "add", "--", *written, data_scrape.OUTPUT_PATH], check=True)
+    if subprocess.run(["git", "diff", "--cached", "--quiet"]).returncode == 0:
+        return
+    subprocess.run(["git", "commit", "-m", "Updated Python data"], check=True)
+    # The scheduled workflow pushes to the same branch
+    if subprocess.run(["git", "pull", "--rebase"]).returncode != 0:
+        subprocess.run(["git", "rebase", "--abort"])
+        raise RuntimeError("git pull --rebase failed; the commit stays local until the next push")
+    subprocess.run(["git", "push"], check=True)
+
+
+def update(names, user, commit):
+    """One batch: re-scrape, re-render and optionally commit."""
+    started = time.time()
+    run_id = f"watch-{int(started)}"
+    print(f"\n📥 {len(names)} repository(ies) changed: {', '.join(sorted(names))}")
+    charts = refresh(names, user)
+    written = render(charts, run_id)
+    print(f"✅ Updated in {time.time() - started:.1f}s; re-rendered {len(charts)} chart(s), "
+          f"{len(written)} artifact(s) changed")
+    if commit:
+        commit_and_push(written)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--commit", action="store_true", help="git commit and push whenever artifacts change")
+    parser.add_argument("--allow-unsigned", action="store_true",
+                        help="run without WEBHOOK_SECRET, accepting requests from anyone who can reach the port")
+    args = parser.parse_args()
+
+    if not data_scrape.ACCESS_TOKEN:
+        raise RuntimeError("TOKEN env var is empty. Authenticated requests are required to avoid 60/hr limit.")
+    if not WEBHOOK_SECRET:
+        if not args.allow_unsigned:
+            raise RuntimeError("WEBHOOK_SECRET env var is empty. Set it, or pass --allow-unsigned to accept "
+                               "unsigned requests.")
+        print("⚠️ WEBHOOK_SECRET is not set; webhook signatures are not checked")
+
+    metrics.begin("watch")
+    data_scrape.g = Github(data_scrape.ACCESS_TOKEN, base_url=data_scrape.API_URL, per_page=100)
+    user = data_scrape.safe_github_call(data_scrape.g.get_user, data_scrape.USER)
+
+    coalescer = Coalescer(QUIET_SECONDS, MAX_WAIT_SECONDS)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(coalescer, user.login))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"👀 Watching for pushes on http://{args.host}:{args.port}/webhook")
+
+    try:
+        while True:
+            names = coalescer.take()
+            # A network error or failed push must not take the service down; the next push retries
+            try:
+                update(names, user, args.commit)
+            except Exception:
+                print(f"❌ Update of {', '.join(sorted(names))} failed\n{traceback.format_exc()}")
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+import re
+from collections import Counter
+from datetime import datetime
+
+# Same cleanup the word cloud always applied: letters only, lowercased, no 1-char tokens
+NON_LETTERS = re.compile(r"[^a-zA-Z\s]")
+
+
+def tokenize(message: str):
+    return [t for t in NON_LETTERS.sub(" ", message or "").lower().split() if len(t) > 1]
+
+
+def new_index():
+    """Per-repo word frequency index stored in repo_stats[...]["word_index"].
+
+    head            sha of the newest commit already counted
+    head_date       its date, so a listing that should have reached it can tell it was rewritten
+    all_time        word -> count over every indexed commit
+    window          word -> count over commits inside the recent window
+    window_commits  [date_iso, {word: count}] per windowed commit, so they can be
+                    subtracted again once they age out
+    """
+    return {"head": None, "head_date": None, "all_time": {}, "window": {}, "window_commits": []}
+
+
+class WordIndexUpdate:
+    """Collects commits newer than an existing index while the scraper pages history.
+
+    Commits arrive newest first. Once the previous head is seen every later commit
+    is already counted, so only new commits are tokenized. If the head never shows
+    up (history was rewritten) the collected counts cover the whole history and
+    replace the old index instead of being added to it.
+
+    With since set only commits from then on are listed (the scraper's stats
+    mode), and since should reach back to the previous head's date so nothing
+    between it and the listing is skipped. A missing head older than since
+    (only possible for indexes without head_date) fell outside the listing, so
+    the new counts are added to the previous index. A missing head inside the
+    listed range was rewritten away: the previous counts for that range are
+    dropped and replaced by the listed commits.
+    """
+
+    def __init__(self, previous=None, since=None):
+        self.previous = previous or new_index()
+        self.since = since
+        self.caught_up = False
+        self.new_head = None
+        self.new_head_date = None
+        self.all_time = Counter()
+        self.window_commits = []
+
+    def add(self, sha, date, message, in_window):
+        if self.new_head is None:
+            self.new_head = sha
+            self.new_head_date = date.isoformat()
+        if self.caught_up:
+            return
+        if sha == self.previous["head"]:
+            self.caught_up = True
+            return
+        counts = Counter(tokenize(message))
+        self.all_time.update(counts)
+        if in_window:
+            self.window_commits.append([date.isoformat(), dict(counts)])
+
+    def state(self):
+        """What has been collected so far, as plain JSON for a scrape checkpoint."""
+        return {"since": self.since.isoformat() if self.since else None,
+                "caught_up": self.caught_up, "new_head": self.new_head, "new_head_date": self.new_head_date,
+                "all_time": dict(self.all_time), "window_commits": self.window_commits}
+
+    @classmethod
+    def restore(cls, previous, state):
+        since = state.get("since")  # checkpoints written before since was stored
+        update = cls(previous, datetime.fromisoformat(since) if since else None)
+        update.caught_up = state["caught_up"]
+        update.new_head = state["new_head"]
+        update.new_head_date = state.get("new_head_date")
+        update.all_time = Counter(state["all_time"])
+        update.window_commits = state["window_commits"]
+        return update
+
+    def head_rewritten(self):
+        """True when the previous head should have been listed but wasn't."""
+        head_date = self.previous.get("head_date")  # missing in indexes built before it was stored
+        return (self.since is not None and not self.caught_up and self.previous["head"] is not None
+                and head_date is not None and datetime.fromisoformat(head_date) >= self.since)
+
+    def finish(self, cutoff):
+        if self.head_rewritten():
+            # Keep what lies before the listed range; the range itself is counted again below
+            index = {
+                "head": None,
+                "head_date": None,
+                "all_time": dict(self.previous["all_time"]),
+                "window": dict(self.previous["window"]),
+                "window_commits": [],
+            }
+            for entry in self.previous["window_commits"]:
+                if datetime.fromisoformat(entry[0]) >= self.since:
+                    _subtract_from(index["all_time"], entry[1])
+                    _subtract_from(index["window"], entry[1])
+                else:
+                    index["window_commits"].append(entry)
+        elif self.caught_up or (self.since is not None and self.previous["head"]):
+            index = {
+                "head": self.previous["head"],
+                "head_date": self.previous.get("head_date"),
+                "all_time": dict(self.previous["all_time"]),
+                "window": dict(self.previous["window"]),
+                "window_commits": list(self.previous["window_commits"]),
+            }
+        else:
+            index = new_index()
+        if self.new_head is not None:
+            index["head"] = self.new_head
+            index["head_date"] = self.new_head_date
+        _add_into(index["all_time"], self.all_time)
+        for entry in self.window_commits:
+            _add_into(index["window"], entry[1])
+        # keep window_commits ordered newest first, same as the commit listing
+        index["window_commits"] = self.window_commits + index["window_commits"]
+        expire_window(index, cutoff)
+        return index
+
+
+def _add_into(target, counts):
+    for word, count in counts.items():
+        target[word] = target.get(word, 0) + count
+
+
+def _subtract_from(target, counts):
+    for word, count in counts.items():
+        remaining = target.get(word, 0) - count
+        if remaining > 0:
+            target[word] = remaining
+        else:
+            target.pop(word, None)
+
+
+def expire_window(index, cutoff):
+    """Subtract commits older than cutoff from the window counter."""
+    kept = []
+    for entry in index["window_commits"]:
+        if datetime.fromisoformat(entry[0]) >= cutoff:
+            kept.append(entry)
+            continue
+        _subtract_from(index["window"], entry[1])
+    index["window_commits"] = kept
+    return index
+
+
+def combined_counts(repo_stats, history="recent"):
+    """Sum the per-repo counters; history is "recent" (window) or "all"."""
+    key = "all_time" if history == "all" else "window"
+    total = Counter()
+    for repo in repo_stats:
+        index = repo.get("word_index")
+        if index:
+            total.update(index.get(key, {}))
+    return total
@@ -0,0 +1,640 @@
+"""Local stand-in for the parts of the GitHub API the generator uses.
+
+Serves an account from a fixture so data_scrape.py and mergedprs.py can be
+load-tested offline and reproducibly:
+
+    python benchmarks/fake_github.py --fixture account.json
+    python benchmarks/fake_github.py --generate 1000 --rate-limit 5000
+    python benchmarks/fake_github.py --generate 50 --fault "/git/blobs/=403x3" --fault "repo-0003/commits=409"
+
+then point the generator at it:
+
+    GITHUB_API_URL=http://127.0.0.1:8787 TOKEN=anything python Generator/utils/data_scrape.py
+
+Record/replay against the real API:
+
+    python benchmarks/fake_github.py --record session.json     # proxies to api.github.com with $TOKEN
+    python benchmarks/fake_github.py --replay session.json
+
+Fixture layout (JSON):
+
+    {"login": "alice",
+     "repos": [{"name": "tool", "fork": false, "archived": false, "pushed_at": "2024-05-01T00:00:00Z",
+                "commits": [{"message": "Fix", "date": "2024-05-01T10:00:00Z", "additions": 3, "deletions": 1}],
+                "files": [{"path": "tool/main.py", "content": "import os\\n"}]}],
+     "merged_prs": [{"owner": "psf", "repo": "requests", "number": 1, "title": "Fix", "stars": 50000,
+                     "created_at": "2024-01-01T00:00:00Z", "closed_at": "2024-01-02T00:00:00Z"}],
+     "faults": [{"path": "regex", "status": 409, "message": "Git Repository is empty.", "times": 1}]}
+
+or {"generate": {"login": "bench", "repos": 1000, ...}} for a procedurally generated account,
+whose blob contents are derived from their sha so nothing large is held in memory.
+"""
+import argparse
+import base64
+import functools
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, urlencode
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import synthetic
+
+UPSTREAM = "https://api.github.com"
+
+
+def git_blob_sha(data: bytes) -> str:
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def iso(dt):
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+# ===== Accounts =====
+
+class FixtureAccount:
+    """Account described explicitly in a fixture file."""
+
+    def __init__(self, fixture):
+        self.login = fixture["login"]
+        self.merged_prs = fixture.get("merged_prs", [])
+        self.repos = []
+        self._details = {}
+        self._blobs = {}
+        for repo in fixture.get("repos", []):
+            commits = []
+            for i, c in enumerate(repo.get("commits", [])):
+                sha = c.get("sha") or hashlib.sha1(f"{repo['name']}:{i}:{c['message']}".encode()).hexdigest()
+                commits.append(dict(c, sha=sha))
+            commits.sort(key=lambda c: c["date"], reverse=True)
+            files = []
+            for f in repo.get("files", []):
+                data = f["content"].encode("utf-8")
+                sha = git_blob_sha(data)
+                self._blobs[sha] = data
+                files.append((f["path"], sha, len(data)))
+            meta = {k: v for k, v in repo.items() if k not in ("commits", "files")}
+            meta.setdefault("pushed_at", commits[0]["date"] if commits else "2020-01-01T00:00:00Z")
+            self.repos.append(meta)
+            self._details[repo["name"]] = {"commits": commits, "files": files}
+
+    def detail(self, name):
+        return self._details.get(name)
+
+    def blob(self, sha):
+        return self._blobs.get(sha)
+
+
+class GeneratedAccount:
+    """Procedurally generated account of any size; repos are built on demand."""
+
+    def __init__(self, login="bench", repos=100, seed=0, commits_per_repo=150, files_per_repo=20,
+                 lines_per_file=200, shared_files=3, merged_prs=60, **_):
+        self.login = login
+        self.seed = seed
+        self.commits_per_repo = commits_per_repo
+        self.files_per_repo = files_per_repo
+        self.lines_per_file = lines_per_file
+        self.shared_files = shared_files
+        rng = random.Random(seed)
+        now = datetime.now(timezone.utc)
+        self.now = now
+        self.repos = [
+            {"name": f"repo-{i:04d}", "fork": False, "archived": False,
+             "pushed_at": iso(now - timedelta(hours=rng.randint(1, 24 * 365 * 3))),
+             "stargazers_count": rng.randint(0, 50)}
+            for i in range(repos)
+        ]
+        self.merged_prs = synthetic.repo_data(0, merged_prs=merged_prs, seed=seed)["merged_prs"]
+        for pr in self.merged_prs:
+            pr["repo"] = pr.pop("repository")
+
+    @functools.lru_cache(maxsize=64)
+    def detail(self, name):
+        if not any(r["name"] == name for r in self.repos):
+            return None
+        rng = random.Random(f"{self.seed}:{name}")
+        commits = []
+        for i in range(self.commits_per_repo):
+            date = self.now - timedelta(hours=rng.randint(0, 24 * 365 * 3))
+            changes = rng.randint(1, 400)
+            commits.append({"sha": hashlib.sha1(f"{name}:{i}".encode()).hexdigest(),
+                            "message": synthetic.commit_message(rng), "date": iso(date),
+                            "additions": changes // 2, "deletions": changes - changes // 2})
+        commits.sort(key=lambda c: c["date"], reverse=True)
+        files = []
+        # "vendored" files shared by every repo get the same sha everywhere
+        for i in range(self.shared_files):
+            sha = hashlib.sha1(f"{self.seed}:shared:{i}".encode()).hexdigest()
+            files.append((f"vendor/shared_{i}.py", sha, len(self.blob(sha))))
+        for i in range(self.files_per_repo):
+            sha = hashlib.sha1(f"{self.seed}:{name}:{i}".encode()).hexdigest()
+            files.append((f"pkg/module_{i}.py", sha, len(self.blob(sha))))
+        files += [("README.md", hashlib.sha1(f"{name}:readme".encode()).hexdigest(), 120),
+                  ("node_modules/dep/index.js", hashlib.sha1(f"{name}:nm".encode()).hexdigest(), 300)]
+        return {"commits": commits, "files": files}
+
+    @functools.lru_cache(maxsize=4096)
+    def blob(self, sha):
+        return synthetic.python_source(random.Random(sha), self.lines_per_file).encode("utf-8")
+
+
+# ===== Rate limiting & faults =====
+
+class RateLimiter:
+    def __init__(self, limit, window):
+        self.limit = limit
+        self.window = window
+        self.lock = threading.Lock()
+        self.remaining = {}
+        self.reset = {}
+
+    def take(self, bucket):
+        """Consume one call; return (allowed, remaining, reset_epoch)."""
+        with self.lock:
+            now = time.time()
+            if now >= self.reset.get(bucket, 0):
+                self.reset[bucket] = now + self.window
+                self.remaining[bucket] = self.limit
+            if self.remaining[bucket] <= 0:
+                return False, 0, int(self.reset[bucket])
+            self.remaining[bucket] -= 1
+            return True, self.remaining[bucket], int(self.reset[bucket])
+
+    def snapshot(self, bucket):
+        with self.lock:
+            if time.time() >= self.reset.get(bucket, 0):
+                return self.limit, int(time.time() + self.window)
+            return self.remaining[bucket], int(self.reset[bucket])
+
+
+class Faults:
+    """Injected error responses: regex on path -> status, for a limited number of hits."""
+
+    def __init__(self, rules):
+        self.lock = threading.Lock()
+        self.rules = [dict(rule, pattern=re.compile(rule["path"])) for rule in rules]
+
+    def match(self, path):
+        with self.lock:
+            for rule in self.rules:
+                if rule.get("times", -1) == 0 or not rule["pattern"].search(path):
+                    continue
+                if rule.get("times", -1) > 0:
+                    rule["times"] -= 1
+                return rule
+        return None
+
+
+def parse_fault(spec):
+    """'PATTERN=STATUS[xTIMES][:MESSAGE]' -> fault rule."""
+    pattern, _, rest = spec.rpartition("=")
+    rest, _, message = rest.partition(":")
+    status, _, times = rest.partition("x")
+    default = {403: "API rate limit exceeded", 404: "Not Found", 409: "Git Repository is empty."}
+    return {"path": pattern, "status": int(status), "times": int(times) if times else -1,
+            "message": message or default.get(int(status), "Injected failure")}
+
+
+# ===== Server =====
+
+def bucket_for(path):
+    if path.startswith("/search/"):
+        return "search"
+    if path == "/graphql":
+        return "graphql"
+    return "core"
+
+
+class FakeGitHub:
+    """Routes API paths to JSON built from an account."""
+
+    def __init__(self, account, base_url, per_page=100, tree_limit=100_000):
+        self.account = account
+        self.base = base_url.rstrip("/")
+        self.per_page = per_page
+        self.tree_limit = tree_limit
+        self.routes = [
+            (re.compile(r"^/rate_limit$"), self.rate_limit),
+            (re.compile(r"^/users/([^/]+)$"), self.user),
+            (re.compile(r"^/users/([^/]+)/repos$"), self.user_repos),
+            (re.compile(r"^/repos/([^/]+)/([^/]+)$"), self.repo),
+            (re.compile(r"^/repos/([^/]+)/([^/]+)/commits$"), self.commits),
+            (re.compile(r"^/repos/([^/]+)/([^/]+)/commits/([0-9a-f]+)$"), self.commit),
+            (re.compile(r"^/repos/([^/]+)/([^/]+)/git/trees/([^/]+)$"), self.tree),
+            (re.compile(r"^/repos/([^/]+)/([^/]+)/git/blobs/([0-9a-f]+)$"), self.blob),
+            (re.compile(r"^/repos/([^/]+)/([^/]+)/stats/punch_card$"), self.punch_card),
+            (re.compile(r"^/search/issues$"), self.search_issues),
+        ]
+        self.limiter = None
+        self.stats_requested = set()  # like GitHub, the first stats request per repo answers 202
+
+    # --- JSON shapes ---
+
+    def owner_json(self, login):
+        return {"login": login, "id": zlib.crc32(login.encode()), "type": "User",
+                "url": f"{self.base}/users/{login}", "html_url": f"https://github.com/{login}"}
+
+    def repo_json(self, meta):
+        login, name = self.account.login, meta["name"]
+        return {
+            "id": zlib.crc32(name.encode()), "name": name, "full_name": f"{login}/{name}",
+            "owner": self.owner_json(login), "private": False, "fork": meta.get("fork", False),
+            "archived": meta.get("archived", False), "default_branch": meta.get("default_branch", "main"),
+            "pushed_at": meta["pushed_at"], "stargazers_count": meta.get("stargazers_count", 0),
+            "url": f"{self.base}/repos/{login}/{name}", "html_url": f"https://github.com/{login}/{name}",
+        }
+
+    def commit_json(self, owner, name, c, detail=False):
+        body = {
+            "sha": c["sha"],
+            "url": f"{self.base}/repos/{owner}/{name}/commits/{c['sha']}",
+            "html_url": f"https://github.com/{owner}/{name}/commit/{c['sha']}",
+            "commit": {"message": c["message"],
+                       "author": {"name": self.account.login, "email": "dev@example.com", "date": c["date"]},
+                       "committer": {"name": self.account.login, "email": "dev@example.com", "date": c["date"]}},
+        }
+        if detail:
+            body["stats"] = {"additions": c["additions"], "deletions": c["deletions"],
+                             "total": c["additions"] + c["deletions"]}
+            body["files"] = []
+        return body
+
+    def page(self, path, query, items):
+        """Slice items per page/per_page and build the Link header PyGithub follows."""
+        per_page = int(query.get("per_page", [self.per_page])[0])
+        page = int(query.get("page", ["1"])[0])
+        last = max(1, -(-len(items) // per_page))
+        links = []
+        for rel, number in (("next", page + 1), ("last", last)):
+            if rel == "next" and page >= last:
+                continue
+            params = {k: v[0] for k, v in query.items()}
+            params.update(page=number, per_page=per_page)
+            links.append(f'<{self.base}{path}?{urlencode(params)}>; rel="{rel}"')
+        headers = {"Link": ", ".join(links)} if links else {}
+        return items[(page - 1) * per_page: page * per_page], headers
+
+    def find_repo(self, owner, name):
+        if owner != self.account.login:
+            return None
+        return next((r for r in self.account.repos if r["name"] == name), None)
+
+    # --- handlers: return (status, body, headers) ---
+
+    def rate_limit(self, path, query):
+        resources = {}
+        for bucket in ("core", "search", "graphql"):
+            remaining, reset = self.limiter.snapshot(bucket)
+            resources[bucket] = {"limit": self.limiter.limit, "remaining": remaining, "reset": reset,
+                                 "used": self.limiter.limit - remaining}
+        return 200, {"resources": resources, "rate": resources["core"]}, {}
+
+    def user(self, path, query, login):
+        if login != self.account.login:
+            return 404, {"message": "Not Found"}, {}
+        return 200, dict(self.owner_json(login), repos_url=f"{self.base}/users/{login}/repos"), {}
+
+    def user_repos(self, path, query, login):
+        if login != self.account.login:
+            return 404, {"message": "Not Found"}, {}
+        items, headers = self.page(path, query, [self.repo_json(r) for r in self.account.repos])
+        return 200, items, headers
+
+    def repo(self, path, query, owner, name):
+        meta = self.find_repo(owner, name)
+        if not meta:
+            # upstream repositories the account sent PRs to, for star lookups
+            pr = next((p for p in self.account.merged_prs if (p["owner"], p["repo"]) == (owner, name)), None)
+            if not pr:
+                return 404, {"message": "Not Found"}, {}
+            return 200, {"name": name, "full_name": f"{owner}/{name}", "owner": self.owner_json(owner),
+                         "stargazers_count": pr.get("stars", 0), "url": f"{self.base}{path}"}, {}
+        return 200, self.repo_json(meta), {}
+
+    def commits(self, path, query, owner, name):
+        meta = self.find_repo(owner, name)
+        if not meta:
+            return 404, {"message": "Not Found"}, {}
+        commits = self.account.detail(name)["commits"]
+        if not commits:
+            return 409, {"message": "Git Repository is empty."}, {}
+        if "since" in query:
+            commits = [c for c in commits if c["date"] >= query["since"][0]]
+        items, headers = self.page(path, query, [self.commit_json(owner, name, c) for c in commits])
+        return 200, items, headers
+
+    def commit(self, path, query, owner, name, sha):
+        meta = self.find_repo(owner, name)
+        match = meta and next((c for c in self.account.detail(name)["commits"] if c["sha"] == sha), None)
+        if not match:
+            return 404, {"message": "Not Found"}, {}
+        return 200, self.commit_json(owner, name, match, detail=True), {}
+
+    def tree_sha(self, owner, name, directory):
+        return hashlib.sha1(f"{owner}/{name}:tree:{directory}".encode()).hexdigest()
+
+    def tree(self, path, query, owner, name, ref):
+        """Recursive or one-level listing of the root (by branch name) or of any subtree (by sha).
+
+        Like GitHub, a recursive listing longer than tree_limit entries is cut
+        off and marked truncated; one-level listings are always complete.
+        """
+        meta = self.find_repo(owner, name)
+        if not meta:
+            return 404, {"message": "Not Found"}, {}
+        files = self.account.detail(name)["files"]
+        directories = {""}
+        for p, _, _ in files:
+            parts = p.split("/")[:-1]
+            directories.update("/".join(parts[:i]) for i in range(1, len(parts) + 1))
+        by_sha = {self.tree_sha(owner, name, d): d for d in directories}
+        if ref in by_sha:
+            root = by_sha[ref]
+        elif ref == meta.get("default_branch", "main"):
+            root = ""
+        else:
+            return 404, {"message": "Not Found"}, {}
+        prefix = root + "/" if root else ""
+        recursive = "recursive" in query
+
+        entries = []
+        for d in sorted(directories):
+            rel = d[len(prefix):]
+            if d == root or not d.startswith(prefix) or (not recursive and "/" in rel):
+                continue
+            entries.append({"path": rel, "mode": "040000", "type": "tree", "sha": self.tree_sha(owner, name, d),
+                            "url": f"{self.base}/repos/{owner}/{name}/git/trees/{self.tree_sha(owner, name, d)}"})
+        for p, sha, size in files:
+            rel = p[len(prefix):]
+            if not p.startswith(prefix) or (not recursive and "/" in rel):
+                continue
+            entries.append({"path": rel, "mode": "100644", "type": "blob", "sha": sha, "size": size,
+                            "url": f"{self.base}/repos/{owner}/{name}/git/blobs/{sha}"})
+        truncated = recursive and len(entries) > self.tree_limit
+        if truncated:
+            entries = entries[:self.tree_limit]
+        tree_sha = self.tree_sha(owner, name, root)
+        return 200, {"sha": tree_sha, "url": f"{self.base}{path}", "tree": entries, "truncated": truncated}, {}
+
+    def blob(self, path, query, owner, name, sha, raw=False):
+        data = self.account.blob(sha) if self.find_repo(owner, name) else None
+        if data is None:
+            return 404, {"message": "Not Found"}, {}
+        if raw:
+            return 200, data, {"Content-Type": "application/vnd.github.raw"}
+        return 200, {"sha": sha, "size": len(data), "url": f"{self.base}{path}", "encoding": "base64",
+                     "content": base64.encodebytes(data).decode("ascii")}, {}
+
+    def punch_card(self, path, query, owner, name):
+        meta = self.find_repo(owner, name)
+        if not meta:
+            return 404, {"message": "Not Found"}, {}
+        if name not in self.stats_requested:
+            self.stats_requested.add(name)
+            return 202, b"", {}
+        commits = self.account.detail(name)["commits"]
+        if not commits:
+            return 204, b"", {}
+        counts = {}
+        for c in commits:
+            date = datetime.strptime(c["date"], "%Y-%m-%dT%H:%M:%SZ")
+            key = ((date.weekday() + 1) % 7, date.hour)  # 0 = Sunday, each commit's own hour (all UTC here)
+            counts[key] = counts.get(key, 0) + 1
+        return 200, [[day, hour, counts.get((day, hour), 0)] for day in range(7) for hour in range(24)], {}
+
+    def search_issues(self, path, query):
+        q = query.get("q", [""])[0]
+        since = re.search(r"closed:>=?(\S+)", q)
+        prs = [pr for pr in self.account.merged_prs if not since or pr["closed_at"] >= since.group(1)]
+        items = [{
+            "number": pr["number"], "title": pr["title"],
+            "html_url": f"https://github.com/{pr['owner']}/{pr['repo']}/pull/{pr['number']}",
+            "created_at": pr["created_at"], "closed_at": pr["closed_at"],
+            "user": {"login": self.account.login},
+        } for pr in prs]
+        page, headers = self.page(path, query, items)
+        return 200, {"total_count": len(items), "incomplete_results": False, "items": page}, headers
+
+    def graphql(self, body):
+        variables = body.get("variables") or {}
+        since = re.search(r"closed:>=?(\S+)", variables.get("q", ""))
+        prs = [pr for pr in self.account.merged_prs if not since or pr["closed_at"] >= since.group(1)]
+        start = int(variables.get("cursor") or 0)
+        chunk = prs[start:start + 100]
+        nodes = [{
+            "number": pr["number"], "title": pr["title"],
+            "url": f"https://github.com/{pr['owner']}/{pr['repo']}/pull/{pr['number']}",
+            "createdAt": pr["created_at"], "closedAt": pr["closed_at"],
+            "author": {"login": self.account.login},
+            "repository": {"name": pr["repo"], "owner": {"login": pr["owner"]},
+                           "nameWithOwner": f"{pr['owner']}/{pr['repo']}",
+                           "url": f"https://github.com/{pr['owner']}/{pr['repo']}",
+                           "stargazerCount": pr.get("stars", 0)},
+        } for pr in chunk]
+        has_next = start + 100 < len(prs)
+        return 200, {"data": {"search": {"pageInfo": {"hasNextPage": has_next,
+                                                      "endCursor": str(start + 100) if has_next else None},
+                                         "nodes": nodes}}}, {}
+
+    def dispatch(self, method, path, query, body, accept):
+        if method == "POST" and path == "/graphql":
+            return self.graphql(body or {})
+        for pattern, handler in self.routes:
+            m = pattern.match(path)
+            if m:
+                if handler == self.blob and "raw" in accept:
+                    return handler(path, query, *m.groups(), raw=True)
+                return handler(path, query, *m.groups())
+        return 404, {"message": "Not Found", "documentation_url": "https://docs.github.com/rest"}, {}
+
+
+class Cassette:
+    """Recorded request -> response sequences; repeated requests replay in order, then stick on the last."""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.cursor = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    @staticmethod
+    def key(method, path_qs, body):
+        digest = hashlib.sha1(body).hexdigest()[:12] if body else ""
+        return f"{method} {path_qs} {digest}".strip()
+
+    def add(self, key, response):
+        with self.lock:
+            self.entries.setdefault(key, []).append(response)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f)
+            os.replace(tmp, self.path)
+
+    def next(self, key):
+        with self.lock:
+            responses = self.entries.get(key)
+            if not responses:
+                return None
+            i = self.cursor.get(key, 0)
+            self.cursor[key] = i + 1
+            return responses[min(i, len(responses) - 1)]
+
+
+def make_handler(api, limiter, faults, mode="serve", cassette=None, upstream=UPSTREAM, quiet=False):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, fmt, *args):
+            if not quiet:
+                super().log_message(fmt, *args)
+
+        def send(self, status, body, headers):
+            if isinstance(body, (bytes, bytearray)):
+                payload = bytes(body)
+            else:
+                payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            headers = dict(headers)
+            headers.setdefault("Content-Type", "application/json; charset=utf-8")
+            for k, v in headers.items():
+                self.send_header(k, v)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def read_body(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            return self.rfile.read(length) if length else b""
+
+        def handle_any(self, method):
+            raw_body = self.read_body()
+            parsed = urlparse(self.path)
+            path, query = parsed.path, parse_qs(parsed.query)
+
+            if mode == "record":
+                return self.proxy(method, raw_body)
+            if mode == "replay":
+                recorded = cassette.next(Cassette.key(method, self.path, raw_body))
+                if recorded is None:
+                    return self.send(404, {"message": f"Not recorded: {method} {self.path}"}, {})
+                body = recorded["body"].replace(upstream, api.base).encode("utf-8")
+                headers = {k: v.replace(upstream, api.base) for k, v in recorded["headers"].items()}
+                return self.send(recorded["status"], body, headers)
+
+            bucket = bucket_for(path)
+            allowed, remaining, reset = limiter.take(bucket) if path != "/rate_limit" else (True, *limiter.snapshot(bucket))
+            rate_headers = {"X-RateLimit-Limit": str(limiter.limit), "X-RateLimit-Remaining": str(remaining),
+                            "X-RateLimit-Reset": str(reset), "X-RateLimit-Resource": bucket}
+            if not allowed:
+                return self.send(403, {"message": "API rate limit exceeded for 127.0.0.1."}, rate_headers)
+
+            fault = faults.match(path)
+            if fault:
+                return self.send(fault["status"], {"message": fault["message"]}, rate_headers)
+
+            body = json.loads(raw_body) if raw_body else None
+            status, payload, headers = api.dispatch(method, path, query, body, self.headers.get("Accept", ""))
+            self.send(status, payload, {**rate_headers, **headers})
+
+        def proxy(self, method, raw_body):
+            headers = {k: v for k, v in self.headers.items() if k.lower() not in ("host", "content-length", "accept-encoding")}
+            if "Authorization" not in headers and os.getenv("TOKEN"):
+                headers["Authorization"] = f"Bearer {os.getenv('TOKEN')}"
+            response = requests.request(method, upstream + self.path, headers=headers, data=raw_body or None)
+            keep = {k: v for k, v in response.headers.items()
+                    if k.lower() in ("content-type", "link", "etag", "last-modified") or k.lower().startswith("x-ratelimit")}
+            text = response.content.decode("utf-8", "replace")
+            cassette.add(Cassette.key(method, self.path, raw_body),
+                         {"status": response.status_code, "headers": keep, "body": text})
+            self.send(response.status_code, text.replace(upstream, api.base).encode("utf-8"),
+                      {k: v.replace(upstream, api.base) for k, v in keep.items()})
+
+        def do_GET(self):
+            self.handle_any("GET")
+
+        def do_POST(self):
+            self.handle_any("POST")
+
+    return Handler
+
+
+def serve(account, host="127.0.0.1", port=8787, rate_limit=5000, reset_seconds=3600, faults=(),
+          mode="serve", cassette_path=None, quiet=False, upstream=UPSTREAM, tree_limit=100_000):
+    """Start the stand-in in a background thread and return the server; call .shutdown() to stop."""
+    base = f"http://{host}:{port}"
+    api = FakeGitHub(account, base, tree_limit=tree_limit)
+    api.limiter = RateLimiter(rate_limit, reset_seconds)
+    cassette = Cassette(cassette_path) if cassette_path else None
+    server = ThreadingHTTPServer((host, port), make_handler(api, api.limiter, Faults(list(faults)), mode, cassette, upstream.rstrip("/"), quiet))
+    if port == 0:
+        api.base = f"http://{host}:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    server.base_url = api.base
+    return server
+
+
+def load_account(fixture_path=None, generate=None):
+    """Return (account, faults) from a fixture file or a generated repository count."""
+    if generate is not None:
+        return GeneratedAccount(repos=generate), []
+    with open(fixture_path, "r", encoding="utf-8") as f:
+        fixture = json.load(f)
+    if "generate" in fixture:
+        return GeneratedAccount(**fixture["generate"]), fixture.get("faults", [])
+    return FixtureAccount(fixture), fixture.get("faults", [])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--fixture", help="account fixture JSON")
+    source.add_argument("--generate", type=int, help="serve a generated account with this many repositories")
+    source.add_argument("--record", metavar="CASSETTE", help="proxy to the real API and record responses")
+    source.add_argument("--replay", metavar="CASSETTE", help="serve previously recorded responses")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--rate-limit", type=int, default=5000, help="calls per bucket per window")
+    parser.add_argument("--reset-seconds", type=int, default=3600, help="rate-limit window length")
+    parser.add_argument("--fault", action="append", default=[], help="PATTERN=STATUS[xTIMES][:MESSAGE]")
+    parser.add_argument("--upstream", default=UPSTREAM, help="API to proxy when recording, and whose URLs replay rewrites")
+    parser.add_argument("--quiet", action="store_true", help="don't log every request")
+    parser.add_argument("--tree-limit", type=int, default=100_000,
+                        help="entries after which recursive tree listings are truncated")
+    args = parser.parse_args()
+
+    faults = [parse_fault(spec) for spec in args.fault]
+    mode, cassette, account = "serve", None, GeneratedAccount(repos=0)
+    if args.fixture:
+        account, fixture_faults = load_account(args.fixture)
+        faults = fixture_faults + faults
+    elif args.generate is not None:
+        account, _ = load_account(generate=args.generate)
+    else:
+        mode, cassette = ("record", args.record) if args.record else ("replay", args.replay)
+
+    server = serve(account, args.host, args.port, args.rate_limit, args.reset_seconds, faults, mode, cassette, args.quiet, args.upstream,
+                   args.tree_limit)
+    print(f"🧪 Fake GitHub API ({mode}) on {server.base_url} — set GITHUB_API_URL={server.base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
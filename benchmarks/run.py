@@ -0,0 +1,201 @@
+"""End-to-end benchmark of the generator on synthetic accounts.
+
+    python benchmarks/run.py                          # scales 10,100,1000
+    python benchmarks/run.py --scales 10 --save-baseline
+    python benchmarks/run.py --compare --threshold 0.25
+
+Each stage runs in its own process inside a scratch workspace so wall time,
+peak RSS and output sizes are measured per stage. Function stages report the
+time spent in the function itself; script stages report the whole process.
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GENERATOR = os.path.join(ROOT, "Generator")
+UTILS = os.path.join(GENERATOR, "utils")
+BASELINE_DIR = os.path.join(ROOT, "benchmarks", "baselines")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import synthetic
+
+FUNCTION_STAGES = ["count_python_constructs", "rebuild_commit_counts_from_repo_stats", "atomic_save"]
+GRAPH_SCRIPTS = sorted(glob.glob(os.path.join(UTILS, "graphing", "*.py")))
+
+
+# ===== Workspace =====
+
+def make_workspace(scale):
+    """Scratch profile repo: config.ini, README.md with the --- marker and synthetic repo_data.json."""
+    workspace = tempfile.mkdtemp(prefix=f"pyprofile-bench-{scale}-")
+    shutil.copy(os.path.join(ROOT, "config.ini"), os.path.join(workspace, "config.ini"))
+    with open(os.path.join(workspace, "README.md"), "w", encoding="utf-8") as f:
+        f.write("# Benchmark profile\n\n---\n")
+    with open(os.path.join(workspace, "repo_data.json"), "w", encoding="utf-8") as f:
+        json.dump(synthetic.repo_data(scale), f)
+    os.makedirs(os.path.join(workspace, "DataVisuals"), exist_ok=True)
+    return workspace
+
+
+def output_size(workspace, patterns):
+    return sum(os.path.getsize(p) for pattern in patterns for p in glob.glob(os.path.join(workspace, pattern)))
+
+
+# ===== Stage execution =====
+
+def run_child(argv, workspace):
+    """Run argv in workspace; return (wall_seconds, peak_rss_mb, stdout)."""
+    env = dict(os.environ, CONFIG_PATH=os.path.join(workspace, "config.ini"), GITHUB_RUN_ID="benchmark")
+    start = time.perf_counter()
+    proc = subprocess.Popen(argv, cwd=workspace, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    stdout = proc.stdout.read().decode("utf-8", "replace")
+    _, status, usage = os.wait4(proc.pid, 0)
+    wall = time.perf_counter() - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{' '.join(argv)} failed with exit code {proc.returncode}:\n{stdout}")
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss_mb = usage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return wall, rss_mb, stdout
+
+
+def run_function_stage(name, scale):
+    """Child-process body for function stages; prints the measured seconds as JSON."""
+    sys.path.insert(0, UTILS)
+    import data_scrape
+
+    with open("repo_data.json", "r", encoding="utf-8") as f:
+        repo_data = json.load(f)
+
+    if name == "count_python_constructs":
+        corpus = synthetic.python_corpus(scale)
+        start = time.perf_counter()
+        for text in corpus:
+            data_scrape.count_python_constructs(text)
+    elif name == "rebuild_commit_counts_from_repo_stats":
+        start = time.perf_counter()
+        data_scrape.rebuild_commit_counts_from_repo_stats(repo_data["repo_stats"])
+    elif name == "atomic_save":
+        start = time.perf_counter()
+        data_scrape.atomic_save("repo_data.saved.json", repo_data)
+    else:
+        raise SystemExit(f"unknown stage {name}")
+    print(json.dumps({"seconds": time.perf_counter() - start}))
+
+
+def run_readme_stage():
+    sys.path.insert(0, GENERATOR)
+    import readme
+
+    start = time.perf_counter()
+    readme.update_readme()
+    print(json.dumps({"seconds": time.perf_counter() - start}))
+
+
+def bench_scale(scale):
+    workspace = make_workspace(scale)
+    results = {}
+    try:
+        def record(stage, argv, outputs, inner=False):
+            wall, rss, stdout = run_child(argv, workspace)
+            if inner:
+                wall = json.loads(stdout.strip().splitlines()[-1])["seconds"]
+            results[stage] = {"seconds": round(wall, 4), "peak_rss_mb": round(rss, 1),
+                              "output_bytes": output_size(workspace, outputs)}
+            print(f"  {stage:<40} {wall:8.3f}s {rss:8.1f} MB")
+
+        me = os.path.abspath(__file__)
+        for stage in FUNCTION_STAGES:
+            outputs = ["repo_data.saved.json"] if stage == "atomic_save" else []
+            record(stage, [sys.executable, me, "_stage", stage, str(scale)], outputs, inner=True)
+        for script in GRAPH_SCRIPTS:
+            stage = os.path.splitext(os.path.basename(script))[0]
+            before = set(glob.glob(os.path.join(workspace, "DataVisuals", "*")))
+            record(stage, [sys.executable, script], [])
+            made = set(glob.glob(os.path.join(workspace, "DataVisuals", "*"))) - before
+            results[stage]["output_bytes"] = sum(os.path.getsize(p) for p in made)
+        record("gifmaker", [sys.executable, os.path.join(UTILS, "gifmaker.py")], ["DataVisuals/data.gif"])
+        record("readme.update_readme", [sys.executable, me, "_stage", "readme", str(scale)], ["README.md"], inner=True)
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+    return results
+
+
+# ===== Baselines =====
+
+def baseline_path(name):
+    return os.path.join(BASELINE_DIR, f"{name}.json")
+
+
+def compare(report, baseline, threshold):
+    """Return a list of regression descriptions for stages slower than baseline by more than threshold."""
+    regressions = []
+    for scale, stages in report["scales"].items():
+        for stage, result in stages.items():
+            old = baseline["scales"].get(scale, {}).get(stage)
+            if not old:
+                continue
+            for metric in ("seconds", "peak_rss_mb"):
+                if old[metric] and result[metric] > old[metric] * (1 + threshold):
+                    regressions.append(
+                        f"{scale} repos / {stage}: {metric} {old[metric]} -> {result[metric]} "
+                        f"(+{(result[metric] / old[metric] - 1) * 100:.0f}%)"
+                    )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default="10,100,1000", help="comma-separated repository counts")
+    parser.add_argument("--name", default=platform.node() or "default", help="baseline name (defaults to hostname)")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--compare", action="store_true", help="fail if slower than the saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown before failing (0.25 = 25%%)")
+    parser.add_argument("--output", help="also write the report to this JSON file")
+    args = parser.parse_args()
+
+    report = {"python": platform.python_version(), "platform": platform.platform(), "scales": {}}
+    for scale in [int(s) for s in args.scales.split(",") if s.strip()]:
+        print(f"⏱ {scale} repositories")
+        report["scales"][str(scale)] = bench_scale(scale)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
+
+    if args.save_baseline:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        with open(baseline_path(args.name), "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
+        print(f"💾 Baseline saved to {baseline_path(args.name)}")
+
+    if args.compare:
+        if not os.path.exists(baseline_path(args.name)):
+            raise SystemExit(f"No baseline at {baseline_path(args.name)}; run with --save-baseline first")
+        with open(baseline_path(args.name), "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print("❌ Regressions beyond threshold:")
+            for line in regressions:
+                print(f"   {line}")
+            raise SystemExit(1)
+        print("✅ No regressions beyond threshold")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "_stage":
+        if sys.argv[2] == "readme":
+            run_readme_stage()
+        else:
+            run_function_stage(sys.argv[2], int(sys.argv[3]))
+    else:
+        main()
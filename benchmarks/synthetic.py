@@ -0,0 +1,127 @@
+"""Synthetic accounts for benchmarking: repo_data.json fixtures and Python sources.
+
+Everything is generated from a seeded Random so the same scale always produces
+the same workload.
+"""
+import random
+from datetime import datetime, timedelta, timezone
+
+LIBRARIES = [
+    "os", "sys", "json", "re", "time", "random", "asyncio", "typing", "pathlib", "requests",
+    "numpy", "pandas", "plotly", "flask", "django", "fastapi", "pydantic", "pytest", "click",
+    "collections", "itertools", "functools", "dataclasses", "logging", "subprocess", "sqlite3",
+]
+EXTENSIONS = [".py", ".md", ".txt", ".json", ".yml", ".toml", ".cfg", ".html", ".css", ".js", ".png", ".ini"]
+WORDS = [
+    "fix", "add", "update", "readme", "refactor", "tests", "cache", "graph", "scraper", "docs",
+    "bump", "version", "cleanup", "feature", "bug", "config", "workflow", "release", "typo", "merge",
+]
+CONSTRUCTS = [
+    "if statements", "while loops", "for loops", "regular functions created",
+    "async functions created", "classes created",
+]
+
+
+def python_source(rng, lines=200):
+    """A plausible Python module: an import header followed by mixed constructs."""
+    out = [f"import {lib}" for lib in rng.sample(LIBRARIES, rng.randint(2, 8))]
+    out.append("")
+    while len(out) < lines:
+        kind = rng.randrange(6)
+        name = rng.choice(WORDS)
+        if kind == 0:
+            out += [f"class {name.title()}Thing:", f"    def {name}(self, x):", "        return x", ""]
+        elif kind == 1:
+            out += [f"async def {name}_task(items):", "    for item in items:", "        await item", ""]
+        elif kind == 2:
+            out += [f"def {name}(value):", "    if value:", "        return value", "    return None", ""]
+        elif kind == 3:
+            out += ["while True:", "    if ready():", "        break"]
+        elif kind == 4:
+            out += [f"{name} = [x for x in range(10) if x % 2]"]
+        else:
+            out += [f"# {' '.join(rng.choices(WORDS, k=6))}"]
+    return "\n".join(out[:lines]) + "\n"
+
+
+def python_corpus(repo_count, files_per_repo=20, lines_per_file=200, seed=0):
+    """List of source strings sized like an account with repo_count Python repos."""
+    rng = random.Random(seed)
+    return [python_source(rng, lines_per_file) for _ in range(repo_count * files_per_repo)]
+
+
+def commit_message(rng):
+    return " ".join(rng.choices(WORDS, k=rng.randint(2, 7))).capitalize()
+
+
+def repo_data(repo_count, commits_per_repo=150, merged_prs=60, seed=0):
+    """A repo_data.json-shaped dict for an account with repo_count repositories."""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    repo_stats, recent_commits = [], []
+
+    for r in range(repo_count):
+        name = f"repo-{r:04d}"
+        py_files = rng.randint(1, 60)
+        window = {}
+        all_time = {}
+        commit_times = []
+        for c in range(commits_per_repo):
+            date = now - timedelta(hours=rng.randint(0, 24 * 365 * 3))
+            commit_times.append([date.weekday(), date.hour])
+            message = commit_message(rng)
+            for word in message.lower().split():
+                all_time[word] = all_time.get(word, 0) + 1
+            if now - date < timedelta(days=90):
+                for word in message.lower().split():
+                    window[word] = window.get(word, 0) + 1
+                changes = rng.randint(1, 400)
+                recent_commits.append({
+                    "repo_name": name,
+                    "repo_url": f"https://github.com/bench/{name}",
+                    "sha": f"{r:04x}{c:036x}",
+                    "message": message,
+                    "author": "bench",
+                    "date": date.isoformat(),
+                    "additions": changes // 2,
+                    "deletions": changes - changes // 2,
+                    "total_changes": changes,
+                })
+        repo_stats.append({
+            "repo_name": name,
+            "python_files": [f"pkg/module_{i}.py" for i in range(py_files)],
+            "libraries": rng.sample(LIBRARIES, rng.randint(3, 12)),
+            "total_python_files": py_files,
+            "total_python_lines": py_files * rng.randint(40, 400),
+            "file_extensions": {ext: rng.randint(1, 40) for ext in rng.sample(EXTENSIONS, rng.randint(2, 8))},
+            "total_commits": commits_per_repo,
+            "commit_times": commit_times,
+            "word_index": {"head": f"{r:04x}{0:036x}", "all_time": all_time, "window": window, "window_commits": []},
+            "construct_counts": {k: rng.randint(0, 500) for k in CONSTRUCTS},
+        })
+
+    prs = []
+    for n in range(merged_prs):
+        owner, repo = f"upstream{n % 17}", f"project{n % 23}"
+        closed = now - timedelta(days=rng.randint(1, 700))
+        prs.append({
+            "number": n + 1,
+            "title": commit_message(rng),
+            "repository": repo,
+            "owner": owner,
+            "repo_url": f"https://github.com/{owner}/{repo}",
+            "url": f"https://github.com/{owner}/{repo}/pull/{n + 1}",
+            "created_at": (closed - timedelta(days=2)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "closed_at": closed.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "author": "bench",
+            "stars": rng.randint(0, 20000),
+            "full_repo_name": f"{owner}/{repo}",
+        })
+
+    return {
+        "repo_stats": repo_stats,
+        "commit_counts": {},
+        "construct_counts": [],
+        "recent_commits": recent_commits,
+        "merged_prs": prs,
+    }